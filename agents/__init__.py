@@ -1,13 +1,10 @@
-"""Agent modules for the multi-agent content generation system."""
+"""Agent modules for the multi-agent content generation system.
 
-from .product_parser_agent import ProductParserAgent
-from .question_generator_agent import QuestionGeneratorAgent
-from .benefits_agent import BenefitsAgent
-from .usage_agent import UsageAgent
-from .safety_agent import SafetyAgent
-from .price_agent import PriceAgent
-from .comparison_agent import ComparisonAgent
-from .page_assembly_agent import PageAssemblyAgent
+Agent classes are imported lazily on first attribute access, so importing
+one agent module does not load the others.
+"""
+
+from .registry import AGENT_MODULES, AgentRegistry, load_agent_class
 
 __all__ = [
     'ProductParserAgent',
@@ -17,7 +14,13 @@ __all__ = [
     'SafetyAgent',
     'PriceAgent',
     'ComparisonAgent',
-    'PageAssemblyAgent'
+    'FAQAnswerAgent',
+    'PageAssemblyAgent',
+    'AgentRegistry'
 ]
 
 
+def __getattr__(name):
+    if name in AGENT_MODULES:
+        return load_agent_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
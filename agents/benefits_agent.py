@@ -2,11 +2,14 @@
 
 from typing import Dict, Any
 from models.product_model import ProductModel
+from templates.localization import MESSAGES, Message
 
 
 class BenefitsAgent:
     """Generates structured benefits content from product data."""
     
+    version = "1.0.0"
+    
     def __init__(self):
         """Initialize the benefits agent."""
         pass
@@ -21,36 +24,35 @@ class BenefitsAgent:
         Returns:
             Structured benefits content block
         """
+        features = product.features
         return {
             "primary_benefits": product.benefits,
             "benefit_details": {
-                benefit: self._get_benefit_description(benefit, product)
-                for benefit in product.benefits
+                benefit: self._get_benefit_description(benefit_lower, product)
+                for benefit, benefit_lower in zip(product.benefits, features.benefits)
             },
             "key_ingredients_contributing": {
-                ingredient: self._get_ingredient_benefit(ingredient)
-                for ingredient in product.key_ingredients
+                ingredient: self._get_ingredient_benefit(ingredient_lower)
+                for ingredient, ingredient_lower in zip(product.key_ingredients, features.ingredients)
             }
         }
     
-    def _get_benefit_description(self, benefit: str, product: ProductModel) -> str:
-        """Get description for a specific benefit."""
-        benefit_lower = benefit.lower()
+    def _get_benefit_description(self, benefit_lower: str, product: ProductModel) -> Message:
+        """Get description for a specific benefit, given lowercased."""
         if "brightening" in benefit_lower:
-            return f"{product.concentration} helps reduce dullness and improve skin radiance"
+            return Message("benefit.brightening", concentration=product.concentration)
         elif "dark spots" in benefit_lower or "fade" in benefit_lower:
-            return f"Regular use helps fade dark spots and hyperpigmentation"
+            return MESSAGES["benefit.fades_dark_spots"]
         else:
-            return f"Provides {benefit.lower()} benefits for the skin"
+            return Message("benefit.generic", benefit=benefit_lower)
     
-    def _get_ingredient_benefit(self, ingredient: str) -> str:
-        """Get benefit description for an ingredient."""
-        ingredient_lower = ingredient.lower()
+    def _get_ingredient_benefit(self, ingredient_lower: str) -> Message:
+        """Get benefit description for an ingredient, given lowercased."""
         if "vitamin c" in ingredient_lower:
-            return "Antioxidant protection and brightening"
+            return MESSAGES["ingredient.vitamin_c"]
         elif "hyaluronic acid" in ingredient_lower:
-            return "Hydration and moisture retention"
+            return MESSAGES["ingredient.hyaluronic_acid"]
         else:
-            return "Supports skin health"
+            return MESSAGES["ingredient.generic"]
 
 
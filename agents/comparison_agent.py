@@ -1,25 +1,25 @@
 """Agent responsible for comparing products."""
 
-from typing import Dict, Any
+from typing import AbstractSet, Dict, Any, Iterable
 from models.product_model import ProductModel
+from models.reference_data import get_reference_product
+from templates.localization import MESSAGES, Message, MessageList
+
+
+def _in_order(values: Iterable[str], other: AbstractSet[str], shared: bool) -> list:
+    """Distinct values that are (shared) or are not in ``other``, in their product's order."""
+    return [value for value in dict.fromkeys(values) if (value in other) is shared]
 
 
 class ComparisonAgent:
     """Generates structured product comparison content."""
     
+    version = "1.0.0"
+    
     def __init__(self):
         """Initialize the comparison agent."""
-        # Define fictional Product B internally
-        self.product_b = ProductModel(
-            product_name="RadiantGlow Vitamin C Serum",
-            concentration="15% Vitamin C",
-            skin_type=["Dry", "Normal"],
-            key_ingredients=["Vitamin C", "Niacinamide", "Vitamin E"],
-            benefits=["Anti-aging", "Even skin tone", "Hydration"],
-            how_to_use="Apply 3-4 drops in the evening after cleansing",
-            side_effects="May cause dryness in some users",
-            price=899
-        )
+        # Fictional Product B is shared reference data, built once per process
+        self.product_b = get_reference_product()
     
     def generate(self, product_a: ProductModel) -> Dict[str, Any]:
         """
@@ -31,6 +31,8 @@ class ComparisonAgent:
         Returns:
             Structured comparison content block
         """
+        features_a = product_a.features
+        features_b = self.product_b.features
         return {
             "product_a": {
                 "name": product_a.product_name,
@@ -70,79 +72,62 @@ class ComparisonAgent:
                 "skin_type_compatibility": {
                     "product_a": product_a.skin_type,
                     "product_b": self.product_b.skin_type,
-                    "overlap": list(set(product_a.skin_type) & set(self.product_b.skin_type)),
-                    "unique_to_a": list(set(product_a.skin_type) - set(self.product_b.skin_type)),
-                    "unique_to_b": list(set(self.product_b.skin_type) - set(product_a.skin_type))
+                    "overlap": _in_order(product_a.skin_type, features_b.skin_type_set, True),
+                    "unique_to_a": _in_order(product_a.skin_type, features_b.skin_type_set, False),
+                    "unique_to_b": _in_order(self.product_b.skin_type, features_a.skin_type_set, False)
                 },
                 "benefits": {
                     "product_a": product_a.benefits,
                     "product_b": self.product_b.benefits,
-                    "common_benefits": list(set(product_a.benefits) & set(self.product_b.benefits)),
-                    "unique_to_a": list(set(product_a.benefits) - set(self.product_b.benefits)),
-                    "unique_to_b": list(set(self.product_b.benefits) - set(product_a.benefits))
+                    "common_benefits": _in_order(product_a.benefits, features_b.benefit_set, True),
+                    "unique_to_a": _in_order(product_a.benefits, features_b.benefit_set, False),
+                    "unique_to_b": _in_order(self.product_b.benefits, features_a.benefit_set, False)
                 }
             },
             "recommendation": self._generate_recommendation(product_a, self.product_b)
         }
     
-    def _compare_concentration(self, product_a: ProductModel, product_b: ProductModel) -> str:
+    def _compare_concentration(self, product_a: ProductModel, product_b: ProductModel) -> Message:
         """Compare Vitamin C concentrations."""
-        conc_a = self._extract_percentage(product_a.concentration)
-        conc_b = self._extract_percentage(product_b.concentration)
+        conc_a = product_a.features.concentration_percent
+        conc_b = product_b.features.concentration_percent
         
         if conc_a and conc_b:
             if conc_a > conc_b:
-                return f"{product_a.product_name} has higher concentration ({conc_a}% vs {conc_b}%)"
+                return Message("comparison.concentration.higher", name=product_a.product_name, higher=conc_a, lower=conc_b)
             elif conc_b > conc_a:
-                return f"{product_b.product_name} has higher concentration ({conc_b}% vs {conc_a}%)"
+                return Message("comparison.concentration.higher", name=product_b.product_name, higher=conc_b, lower=conc_a)
             else:
-                return "Both products have similar concentration"
-        return "Concentration comparison requires detailed analysis"
-    
-    def _extract_percentage(self, concentration: str) -> float:
-        """Extract percentage value from concentration string."""
-        try:
-            import re
-            match = re.search(r'(\d+)%', concentration)
-            if match:
-                return float(match.group(1))
-        except:
-            pass
-        return None
+                return MESSAGES["comparison.concentration.similar"]
+        return MESSAGES["comparison.concentration.unknown"]
     
     def _find_common_ingredients(self, product_a: ProductModel, product_b: ProductModel) -> list:
         """Find common ingredients between products."""
-        ingredients_a = {i.lower() for i in product_a.key_ingredients}
-        ingredients_b = {i.lower() for i in product_b.key_ingredients}
-        common = ingredients_a & ingredients_b
-        return list(common)
+        return _in_order(product_a.features.ingredients, product_b.features.ingredient_set, True)
     
     def _find_unique_ingredients(self, product: ProductModel, other: ProductModel) -> list:
         """Find ingredients unique to first product."""
-        ingredients_product = {i.lower() for i in product.key_ingredients}
-        ingredients_other = {i.lower() for i in other.key_ingredients}
-        unique = ingredients_product - ingredients_other
-        return list(unique)
+        return _in_order(product.features.ingredients, other.features.ingredient_set, False)
     
-    def _generate_recommendation(self, product_a: ProductModel, product_b: ProductModel) -> str:
+    def _generate_recommendation(self, product_a: ProductModel, product_b: ProductModel) -> Message:
         """Generate comparison recommendation."""
         recommendations = []
         
         if product_a.price < product_b.price:
-            recommendations.append(f"{product_a.product_name} is more budget-friendly")
+            recommendations.append(Message("comparison.recommendation.cheaper", name=product_a.product_name))
         
         if len(product_b.key_ingredients) > len(product_a.key_ingredients):
-            recommendations.append(f"{product_b.product_name} offers more active ingredients")
+            recommendations.append(Message("comparison.recommendation.more_ingredients", name=product_b.product_name))
         
-        if "Oily" in product_a.skin_type and "Oily" not in product_b.skin_type:
-            recommendations.append(f"{product_a.product_name} is better suited for oily skin")
+        if "Oily" in product_a.features.skin_type_set and "Oily" not in product_b.features.skin_type_set:
+            recommendations.append(Message("comparison.recommendation.oily_skin", name=product_a.product_name))
         
-        if "Dry" in product_b.skin_type and "Dry" not in product_a.skin_type:
-            recommendations.append(f"{product_b.product_name} is better suited for dry skin")
+        if "Dry" in product_b.features.skin_type_set and "Dry" not in product_a.features.skin_type_set:
+            recommendations.append(Message("comparison.recommendation.dry_skin", name=product_b.product_name))
         
         if not recommendations:
-            return "Both products have their strengths; choose based on specific skin needs"
+            return MESSAGES["comparison.recommendation.balanced"]
         
-        return "; ".join(recommendations)
+        return MessageList(recommendations)
 
 
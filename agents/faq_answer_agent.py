@@ -0,0 +1,103 @@
+"""Agent responsible for answering FAQ questions from computed content blocks."""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from models.product_model import ProductModel
+from templates.question_templates import QuestionTemplateSet, TEMPLATE_FIELDS
+from agents.question_generator_agent import default_templates
+
+
+# First part of an answer source -> agent whose content block it reads;
+# "product" reads a field of the parsed ProductModel instead
+ANSWER_SOURCES = {
+    "product": None,
+    "benefits": "BenefitsAgent",
+    "usage": "UsageAgent",
+    "safety": "SafetyAgent",
+    "price": "PriceAgent"
+}
+
+
+class FAQAnswerAgent:
+    """
+    Answers FAQ questions with facts the content agents already computed.
+    
+    Nothing is derived from the product again: each answer is the value of
+    a content block field, e.g. the SafetyAgent's ``safety_level`` for "Is
+    it safe for sensitive skin?", taken from the blocks of the same run.
+    The product page and the FAQ page therefore reference the same values.
+    
+    The FAQ does not depend on those agents: answers whose block the run
+    has not computed, e.g. in a FAQ-only run, are left null.
+    """
+    
+    version = "1.0.0"
+    
+    def __init__(self, templates: Optional[QuestionTemplateSet] = None):
+        """
+        Initialize the FAQ answer agent.
+        
+        Args:
+            templates: Question templates whose ``answers`` name the source
+                of each answer; defaults to the set in
+                data/question_templates.json
+            
+        Raises:
+            ValueError: If an answer source is malformed
+        """
+        self.templates = templates or default_templates()
+        self._answer, self.source, self.agents = self._compile()
+    
+    def _compile(self) -> Tuple[Callable, str, Tuple[str, ...]]:
+        """Compile the answer sources into one function building the answers block."""
+        blocks: List[str] = []
+        categories = []
+        for category, sources in self.templates.answers.items():
+            entries = []
+            for source in sources:
+                if source is None:
+                    entries.append("None")
+                    continue
+                block, _, path = source.partition(".")
+                if block not in ANSWER_SOURCES or not path:
+                    raise ValueError(
+                        f"Answer source {source!r} must start with one of {', '.join(ANSWER_SOURCES)}"
+                    )
+                if block == "product":
+                    if path not in TEMPLATE_FIELDS:
+                        raise ValueError(f"Answer source {source!r} references unknown product field {path!r}")
+                    value = f"product.{path}"
+                else:
+                    if block not in blocks:
+                        blocks.append(block)
+                    # Keys such as a skin type may be absent for some products
+                    keys = path.split(".")
+                    value = f"{block}.get({keys[0]!r})"
+                    for key in keys[1:]:
+                        value = f"({value} or {{}}).get({key!r})"
+                entries.append(f"{{'source': {source!r}, 'answer': {value}}}")
+            categories.append(f"{category!r}: [{', '.join(entries)}]")
+        
+        source = "\n".join(
+            ["def answer(product, blocks):"]
+            + [f"    {block} = blocks.get({ANSWER_SOURCES[block]!r}) or {{}}" for block in blocks]
+            + [f"    return {{{', '.join(categories)}}}", ""]
+        )
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, "<faq answers>", "exec"), namespace)
+        return namespace["answer"], source, tuple(ANSWER_SOURCES[block] for block in blocks)
+    
+    def generate(self, product: ProductModel, blocks: Dict[str, Any]) -> Dict[str, List[Optional[Dict[str, Any]]]]:
+        """
+        Generate the answers block for the product's FAQ.
+        
+        Args:
+            product: ProductModel instance
+            blocks: Content blocks of the current run keyed by agent name;
+                answers from an agent in ``self.agents`` that is absent are None
+            
+        Returns:
+            For each category, one entry per question in order: None, or
+            the answer's ``source`` and its ``answer`` value, shared with
+            the content block it comes from
+        """
+        return self._answer(product, blocks)
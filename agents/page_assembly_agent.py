@@ -1,30 +1,102 @@
 """Agent responsible for assembling pages from templates and content blocks."""
 
-from typing import Dict, Any
+from typing import Container, Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 from templates.faq_template import FAQTemplate
 from templates.product_page_template import ProductPageTemplate
 from templates.comparison_page_template import ComparisonPageTemplate
 
 
+TEMPLATES = {
+    "faq": FAQTemplate,
+    "product_page": ProductPageTemplate,
+    "comparison_page": ComparisonPageTemplate
+}
+
+
 class PageAssemblyAgent:
     """Assembles final JSON pages from templates and content blocks."""
     
-    def __init__(self):
-        """Initialize the page assembly agent."""
+    def __init__(self, instrumentation: Optional[Any] = None, trusted_pages: Container[str] = ()):
+        """
+        Initialize the page assembly agent.
+        
+        Args:
+            instrumentation: Optional stage timing hooks used around
+                template validation
+            trusted_pages: Page types whose content agents' output is known
+                to be valid, so only the template's checks on the product
+                data itself are run; any container supporting ``in``
+        """
         self.version = "1.0.0"
+        self.instrumentation = instrumentation
+        self.trusted_pages = trusted_pages
+    
+    def _validate(self, template: Any, page_type: str, page: Dict[str, Any]) -> None:
+        """Validate a page against its template, timing it if instrumented."""
+        if page_type in self.trusted_pages:
+            # A few scalar checks; too cheap to be worth timing
+            template.validate_trusted(page)
+            return
+        if self.instrumentation is None:
+            template.validate(page)
+            return
+        with self.instrumentation.stage("validate", page_type):
+            template.validate(page)
+    
+    def validate_batch(
+        self,
+        pages: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Validate many pages in one pass without raising.
+        
+        Pages assembled with ``validate=False`` are checked here instead,
+        so a bad page costs an error entry rather than an exception and
+        does not stop the rest of the batch. Trusted page types get only
+        the checks on the product data itself.
+        
+        Args:
+            pages: (page_type, page) pairs
+            
+        Returns:
+            For each page, in order, its ``{"path", "code", "message"}``
+            errors; an empty list means the page is valid
+        """
+        if self.instrumentation is None:
+            return self._collect_errors(pages)
+        with self.instrumentation.stage("validate", "batch") as stage:
+            results = self._collect_errors(pages)
+            stage.set_attribute("pages", len(results))
+            stage.set_attribute("invalid", sum(1 for errors in results if errors))
+            return results
+    
+    def _collect_errors(self, pages: Iterable[Tuple[str, Dict[str, Any]]]) -> List[List[Dict[str, str]]]:
+        """Collect template errors for each page, reduced for trusted page types."""
+        trusted = self.trusted_pages
+        return [
+            TEMPLATES[page_type].collect_trusted_errors(page) if page_type in trusted
+            else TEMPLATES[page_type].collect_errors(page)
+            for page_type, page in pages
+        ]
     
     def assemble_faq_page(
         self,
         product_name: str,
-        questions: Dict[str, Any]
+        questions: Dict[str, Any],
+        answers: Optional[Dict[str, Any]] = None,
+        validate: bool = True
     ) -> Dict[str, Any]:
         """
-        Assemble FAQ page from questions.
+        Assemble FAQ page from questions and their answers.
         
         Args:
             product_name: Name of the product
             questions: Structured questions from QuestionGeneratorAgent
+            answers: Answers by category from FAQAnswerAgent, aligned with
+                the questions; omitted from the page when None
+            validate: Validate against the template; pass False when the
+                page is checked later with validate_batch
             
         Returns:
             Complete FAQ page JSON structure
@@ -37,9 +109,12 @@ class PageAssemblyAgent:
                 "version": self.version
             }
         }
+        if answers is not None:
+            page["answers"] = answers
         
         # Validate against template
-        FAQTemplate.validate(page)
+        if validate:
+            self._validate(FAQTemplate, "faq", page)
         
         return page
     
@@ -49,7 +124,8 @@ class PageAssemblyAgent:
         benefits: Dict[str, Any],
         usage: Dict[str, Any],
         safety: Dict[str, Any],
-        price: Dict[str, Any]
+        price: Dict[str, Any],
+        validate: bool = True
     ) -> Dict[str, Any]:
         """
         Assemble product page from content blocks.
@@ -60,6 +136,8 @@ class PageAssemblyAgent:
             usage: Usage content from UsageAgent
             safety: Safety content from SafetyAgent
             price: Price content from PriceAgent
+            validate: Validate against the template; pass False when the
+                page is checked later with validate_batch
             
         Returns:
             Complete product page JSON structure
@@ -77,19 +155,23 @@ class PageAssemblyAgent:
         }
         
         # Validate against template
-        ProductPageTemplate.validate(page)
+        if validate:
+            self._validate(ProductPageTemplate, "product_page", page)
         
         return page
     
     def assemble_comparison_page(
         self,
-        comparison_data: Dict[str, Any]
+        comparison_data: Dict[str, Any],
+        validate: bool = True
     ) -> Dict[str, Any]:
         """
         Assemble comparison page from comparison data.
         
         Args:
             comparison_data: Comparison content from ComparisonAgent
+            validate: Validate against the template; pass False when the
+                page is checked later with validate_batch
             
         Returns:
             Complete comparison page JSON structure
@@ -106,7 +188,8 @@ class PageAssemblyAgent:
         }
         
         # Validate against template
-        ComparisonPageTemplate.validate(page)
+        if validate:
+            self._validate(ComparisonPageTemplate, "comparison_page", page)
         
         return page
 
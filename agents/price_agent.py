@@ -1,15 +1,68 @@
 """Agent responsible for generating price-related content blocks."""
 
-from typing import Dict, Any
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 from models.product_model import ProductModel
+from models.currency import CurrencyTable, get_currency_table
+from templates.localization import MESSAGES, Message
+
+try:
+    import numpy as np
+except ImportError:  # The batch path falls back to one product at a time
+    np = None
+
+
+# Upper bounds of the absolute price categories, in the base currency;
+# a price equal to a bound falls in the next category
+CATEGORY_THRESHOLDS = (500.0, 1000.0, 2000.0)
+CATEGORY_CODES = ("price.category.budget", "price.category.mid_range", "price.category.premium", "price.category.luxury")
+
+NOTE_THRESHOLDS = (500.0, 1000.0)
+NOTE_CODES = ("price.note.budget", "price.note.mid_range", "price.note.premium")
+
+VALUE_CODES = ("price.value.good", "price.value.premium", "price.value.reasonable")
+
+# Upper bounds (inclusive) of the relative categories, as percentile ranks
+RELATIVE_THRESHOLDS = (25.0, 75.0)
+RELATIVE_CODES = ("price.relative.low", "price.relative.typical", "price.relative.high")
 
 
 class PriceAgent:
-    """Generates structured price information from product data."""
+    """
+    Generates structured price information from product data.
     
-    def __init__(self):
-        """Initialize the price agent."""
-        pass
+    Prices, category thresholds and catalog prices are in the base currency
+    of the currency table (INR); only the price shown in the block is
+    converted. With a catalog, each price also gets its percentile rank
+    among the catalog's prices and a relative category next to the
+    absolute one.
+    """
+    
+    version = "1.1.0"
+    
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        catalog_prices: Optional[Iterable[float]] = None,
+        rates: Optional[CurrencyTable] = None
+    ):
+        """
+        Initialize the price agent.
+        
+        Args:
+            currency: Currency to show prices in; defaults to the base currency
+            catalog_prices: Prices of the catalog that relative categories
+                are computed against; without them blocks have none
+            rates: Exchange rates; defaults to data/currency_rates.json
+            
+        Raises:
+            ValueError: If the currency is not in the rate table
+        """
+        self.rates = rates or get_currency_table()
+        self.currency = currency or self.rates.base
+        self._rate = self.rates.rate(self.currency)
+        self.catalog = sorted(float(price) for price in catalog_prices) if catalog_prices is not None else None
+        self._catalog_array = np.asarray(self.catalog, dtype=float) if np is not None and self.catalog else None
     
     def generate(self, product: ProductModel) -> Dict[str, Any]:
         """
@@ -21,46 +74,178 @@ class PriceAgent:
         Returns:
             Structured price content block
         """
-        return {
-            "price": product.price,
-            "currency": "INR",
-            "price_category": self._categorize_price(product.price),
-            "value_assessment": self._assess_value(product),
+        price = product.price
+        ingredient_count = len(product.key_ingredients)
+        benefit_count = len(product.benefits)
+        block = {
+            "price": self._display_price(price),
+            "currency": self.currency,
+            "price_category": self._categorize_price(price),
+            "value_assessment": self._assess_value(price, ingredient_count, benefit_count),
+            "value_score": round((ingredient_count + benefit_count) * 1000 / price, 2) if price > 0 else None,
             "price_per_ml": None,  # Would require volume information
-            "comparison_note": self._generate_comparison_note(product.price)
+            "comparison_note": self._generate_comparison_note(price)
         }
+        if self.catalog:
+            percentile = 100.0 * bisect_right(self.catalog, price) / len(self.catalog)
+            block["price_percentile"] = round(percentile, 1)
+            block["relative_category"] = MESSAGES[RELATIVE_CODES[bisect_left(RELATIVE_THRESHOLDS, percentile)]]
+        return block
     
-    def _categorize_price(self, price: float) -> str:
-        """Categorize price range."""
-        if price < 500:
-            return "Budget-friendly"
-        elif price < 1000:
-            return "Mid-range"
-        elif price < 2000:
-            return "Premium"
+    def generate_batch(self, products: Sequence[ProductModel]) -> List[Dict[str, Any]]:
+        """
+        Generate price content blocks for many products at once.
+        
+        Categories, scores and percentile ranks are computed over the price
+        column with analyze_prices(); the blocks equal those of generate().
+        Without NumPy the products are processed one at a time.
+        
+        Args:
+            products: ProductModel instances
+            
+        Returns:
+            One price content block per product, in order
+        """
+        if np is None:
+            return [self.generate(product) for product in products]
+        prices = np.array([product.price for product in products], dtype=float)
+        analysis = self.analyze_prices(
+            prices,
+            np.array([len(product.key_ingredients) for product in products]),
+            np.array([len(product.benefits) for product in products]),
+            reference=self._catalog_array
+        )
+        
+        currency = self.currency
+        converted = self.rates.base != currency
+        categories = [MESSAGES[code] for code in CATEGORY_CODES]
+        values = [MESSAGES[code] for code in VALUE_CODES]
+        notes = [MESSAGES[code] for code in NOTE_CODES]
+        blocks = [
+            {
+                "price": round(display, 2) if converted else product.price,
+                "currency": currency,
+                "price_category": categories[category],
+                "value_assessment": values[value],
+                "value_score": round(score, 2) if score == score else None,
+                "price_per_ml": None,
+                "comparison_note": notes[note]
+            }
+            for product, display, category, value, score, note in zip(
+                products,
+                analysis["price"].tolist(),
+                analysis["category"].tolist(),
+                analysis["value"].tolist(),
+                analysis["value_score"].tolist(),
+                analysis["note"].tolist()
+            )
+        ]
+        if self.catalog:
+            relative = [MESSAGES[code] for code in RELATIVE_CODES]
+            for block, percentile, category in zip(
+                blocks, analysis["percentile"].tolist(), analysis["relative_category"].tolist()
+            ):
+                block["price_percentile"] = round(percentile, 1)
+                block["relative_category"] = relative[category]
+        return blocks
+    
+    def analyze_prices(
+        self,
+        prices: Any,
+        ingredient_counts: Any = None,
+        benefit_counts: Any = None,
+        segments: Any = None,
+        reference: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze a column of prices in vectorized form.
+        
+        Percentile ranks are the share of prices at or below each price:
+        among the ``reference`` prices when given, otherwise within the
+        column itself, or within each price's segment of it.
+        
+        Args:
+            prices: Prices in the base currency, as a NumPy array or sequence
+            ingredient_counts: Key ingredient count per product; value
+                columns are omitted without these and ``benefit_counts``
+            benefit_counts: Benefit count per product
+            segments: Segment label per product, e.g. a product line
+            reference: Sorted prices to rank against instead of the column
+            
+        Returns:
+            NumPy columns aligned with ``prices``: ``price`` in the agent's
+            currency, ``percentile`` (0-100), and ``category``, ``note``,
+            ``relative_category`` and, with counts, ``value`` as indexes
+            into CATEGORY_CODES, NOTE_CODES, RELATIVE_CODES and VALUE_CODES,
+            plus ``value_score`` (NaN for a zero price)
+            
+        Raises:
+            RuntimeError: If NumPy is not installed
+            ValueError: If the columns differ in length, or both
+                ``segments`` and ``reference`` are given
+        """
+        if np is None:
+            raise RuntimeError("Vectorized price analysis requires NumPy (pip install numpy)")
+        prices = np.asarray(prices, dtype=float)
+        if segments is not None and reference is not None:
+            raise ValueError("Rank prices against either a reference or their segments, not both")
+        
+        if reference is not None and len(reference):
+            reference = np.asarray(reference, dtype=float)
+            percentile = 100.0 * np.searchsorted(reference, prices, side="right") / len(reference)
+        elif segments is None:
+            percentile = 100.0 * np.searchsorted(np.sort(prices), prices, side="right") / max(len(prices), 1)
         else:
-            return "Luxury"
+            segments = np.asarray(segments)
+            if len(segments) != len(prices):
+                raise ValueError("segments must have one label per price")
+            percentile = np.empty(len(prices))
+            for segment in np.unique(segments):
+                mask = segments == segment
+                group = prices[mask]
+                percentile[mask] = 100.0 * np.searchsorted(np.sort(group), group, side="right") / len(group)
+        
+        analysis = {
+            "price": prices * self._rate,
+            "category": np.searchsorted(CATEGORY_THRESHOLDS, prices, side="right"),
+            "note": np.searchsorted(NOTE_THRESHOLDS, prices, side="right"),
+            "percentile": percentile,
+            "relative_category": np.searchsorted(RELATIVE_THRESHOLDS, percentile, side="left")
+        }
+        if ingredient_counts is not None and benefit_counts is not None:
+            ingredient_counts = np.asarray(ingredient_counts)
+            benefit_counts = np.asarray(benefit_counts)
+            if not len(ingredient_counts) == len(benefit_counts) == len(prices):
+                raise ValueError("Count columns must have one entry per price")
+            analysis["value"] = np.where(
+                (prices < 1000) & (ingredient_counts >= 2) & (benefit_counts >= 2), 0,
+                np.where(prices >= 1000, 1, 2)
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                analysis["value_score"] = np.where(
+                    prices > 0, (ingredient_counts + benefit_counts) * 1000 / prices, np.nan
+                )
+        return analysis
+    
+    def _display_price(self, price: float) -> float:
+        """Price in the agent's currency, rounded to cents once converted."""
+        if self.rates.base == self.currency:
+            return price
+        return round(price * self._rate, 2)
+    
+    def _categorize_price(self, price: float) -> Message:
+        """Categorize price range."""
+        return MESSAGES[CATEGORY_CODES[bisect_right(CATEGORY_THRESHOLDS, price)]]
     
-    def _assess_value(self, product: ProductModel) -> str:
+    def _assess_value(self, price: float, ingredient_count: int, benefit_count: int) -> Message:
         """Assess value proposition."""
-        price = product.price
-        ingredient_count = len(product.key_ingredients)
-        benefit_count = len(product.benefits)
-        
         if price < 1000 and ingredient_count >= 2 and benefit_count >= 2:
-            return "Good value for money with multiple active ingredients"
+            return MESSAGES["price.value.good"]
         elif price >= 1000:
-            return "Premium pricing justified by quality ingredients"
+            return MESSAGES["price.value.premium"]
         else:
-            return "Reasonable pricing for the benefits offered"
+            return MESSAGES["price.value.reasonable"]
     
-    def _generate_comparison_note(self, price: float) -> str:
+    def _generate_comparison_note(self, price: float) -> Message:
         """Generate price comparison note."""
-        if price < 500:
-            return "Competitively priced in the budget segment"
-        elif price < 1000:
-            return "Positioned in the mid-range market segment"
-        else:
-            return "Positioned in the premium market segment"
-
-
+        return MESSAGES[NOTE_CODES[bisect_right(NOTE_THRESHOLDS, price)]]
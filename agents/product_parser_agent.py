@@ -1,10 +1,30 @@
 """Agent responsible for parsing raw JSON data into ProductModel."""
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 from models.product_model import ProductModel
 
 
+LIST_FIELDS = ("skin_type", "key_ingredients", "benefits")
+
+
+def split_list_field(value: Union[str, List[str], None]) -> List[str]:
+    """
+    Normalize a list field given either as a list or a comma-separated string.
+    
+    Args:
+        value: List of strings, comma-separated string, or None
+        
+    Returns:
+        List of non-empty, stripped strings
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
 class ProductParserAgent:
     """Parses raw JSON product data into validated ProductModel."""
     
@@ -16,6 +36,8 @@ class ProductParserAgent:
         """
         Parse raw JSON data into ProductModel.
         
+        List fields may be given as lists or comma-separated strings.
+        
         Args:
             raw_data: Dictionary containing product data
             
@@ -30,9 +52,9 @@ class ProductParserAgent:
             product = ProductModel(
                 product_name=raw_data.get("product_name", ""),
                 concentration=raw_data.get("concentration", ""),
-                skin_type=raw_data.get("skin_type", []),
-                key_ingredients=raw_data.get("key_ingredients", []),
-                benefits=raw_data.get("benefits", []),
+                skin_type=split_list_field(raw_data.get("skin_type")),
+                key_ingredients=split_list_field(raw_data.get("key_ingredients")),
+                benefits=split_list_field(raw_data.get("benefits")),
                 how_to_use=raw_data.get("how_to_use", ""),
                 side_effects=raw_data.get("side_effects", ""),
                 price=float(raw_data.get("price", 0))
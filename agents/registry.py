@@ -0,0 +1,87 @@
+"""Lazy loading and instantiation of pipeline agents."""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Agent class name -> module within the agents package
+AGENT_MODULES = {
+    "ProductParserAgent": "product_parser_agent",
+    "QuestionGeneratorAgent": "question_generator_agent",
+    "BenefitsAgent": "benefits_agent",
+    "UsageAgent": "usage_agent",
+    "SafetyAgent": "safety_agent",
+    "PriceAgent": "price_agent",
+    "ComparisonAgent": "comparison_agent",
+    "FAQAnswerAgent": "faq_answer_agent",
+    "PageAssemblyAgent": "page_assembly_agent"
+}
+
+
+def load_agent_class(name: str) -> type:
+    """
+    Import an agent's module and return its class.
+
+    Args:
+        name: Agent class name, a key of AGENT_MODULES
+
+    Returns:
+        The agent class
+
+    Raises:
+        KeyError: If the agent is unknown
+    """
+    module = importlib.import_module(f"agents.{AGENT_MODULES[name]}")
+    return getattr(module, name)
+
+
+def import_agent_modules() -> None:
+    """Import every agent module, e.g. in a server's master so forked workers inherit them."""
+    for name in AGENT_MODULES:
+        load_agent_class(name)
+
+
+class AgentRegistry:
+    """
+    Creates each agent on first use and reuses it afterwards.
+
+    Agents hold no per-request state, so one instance per registry is
+    shared by all callers. An agent's module is not even imported until
+    the agent is first requested.
+    """
+
+    def __init__(self, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            factories: Custom constructors by agent name; other agents are
+                built by calling their class with no arguments
+        """
+        self._factories = dict(factories or {})
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """
+        Get an agent, importing and instantiating it on first use.
+
+        Args:
+            name: Agent class name
+
+        Returns:
+            The shared agent instance
+        """
+        agent = self._instances.get(name)
+        if agent is None:
+            with self._lock:
+                agent = self._instances.get(name)
+                if agent is None:
+                    factory = self._factories.get(name) or load_agent_class(name)
+                    agent = self._instances[name] = factory()
+        return agent
+
+    def loaded(self) -> List[str]:
+        """Names of the agents instantiated so far."""
+        return list(self._instances)
@@ -2,11 +2,14 @@
 
 from typing import Dict, Any
 from models.product_model import ProductModel
+from templates.localization import MESSAGES, Message
 
 
 class SafetyAgent:
     """Generates structured safety information from product data."""
     
+    version = "1.0.0"
+    
     def __init__(self):
         """Initialize the safety agent."""
         pass
@@ -25,44 +28,44 @@ class SafetyAgent:
             "side_effects": product.side_effects,
             "safety_level": self._assess_safety_level(product),
             "skin_type_compatibility": {
-                skin_type: self._assess_compatibility(skin_type, product)
-                for skin_type in product.skin_type
+                skin_type: self._assess_compatibility(skin_lower, product)
+                for skin_type, skin_lower in zip(product.skin_type, product.features.skin_types)
             },
             "precautions": self._generate_precautions(product),
             "when_to_avoid": self._generate_avoidance_conditions(product)
         }
     
-    def _assess_safety_level(self, product: ProductModel) -> str:
+    def _assess_safety_level(self, product: ProductModel) -> Message:
         """Assess overall safety level."""
-        if "mild" in product.side_effects.lower() and "sensitive" in product.side_effects.lower():
-            return "Generally safe, may cause mild reactions in sensitive skin"
-        elif "tingling" in product.side_effects.lower():
-            return "Safe with possible mild tingling sensation"
+        features = product.features
+        if features.mild_side_effects and features.sensitive_side_effects:
+            return MESSAGES["safety.level.mild_sensitive"]
+        elif features.tingling_side_effects:
+            return MESSAGES["safety.level.tingling"]
         else:
-            return "Generally safe for indicated skin types"
+            return MESSAGES["safety.level.general"]
     
-    def _assess_compatibility(self, skin_type: str, product: ProductModel) -> str:
-        """Assess compatibility for specific skin type."""
-        skin_lower = skin_type.lower()
+    def _assess_compatibility(self, skin_lower: str, product: ProductModel) -> Message:
+        """Assess compatibility for specific skin type, given lowercased."""
         if "sensitive" in skin_lower:
-            return "Use with caution, perform patch test first"
+            return MESSAGES["safety.compatibility.caution"]
         elif "oily" in skin_lower or "combination" in skin_lower:
-            return "Well-suited for this skin type"
+            return MESSAGES["safety.compatibility.well_suited"]
         else:
-            return "Compatible with this skin type"
+            return MESSAGES["safety.compatibility.compatible"]
     
     def _generate_precautions(self, product: ProductModel) -> list:
         """Generate precautionary measures."""
         precautions = [
-            "Perform a patch test before first use",
-            "Avoid contact with eyes"
+            MESSAGES["safety.precaution.patch_test"],
+            MESSAGES["safety.precaution.avoid_eyes"]
         ]
         
-        if "sensitive" in product.side_effects.lower():
-            precautions.append("Start with lower frequency if you have sensitive skin")
+        if product.features.sensitive_side_effects:
+            precautions.append(MESSAGES["precaution.lower_frequency"])
         
-        if "vitamin c" in " ".join(product.key_ingredients).lower():
-            precautions.append("Store in a cool, dark place to maintain efficacy")
+        if product.features.contains_vitamin_c:
+            precautions.append(MESSAGES["safety.precaution.store_cool_dark"])
         
         return precautions
     
@@ -70,10 +73,10 @@ class SafetyAgent:
         """Generate conditions when product should be avoided."""
         conditions = []
         
-        if "sensitive" in product.side_effects.lower():
-            conditions.append("Active skin irritation or open wounds")
+        if product.features.sensitive_side_effects:
+            conditions.append(MESSAGES["safety.avoid.irritation"])
         
-        conditions.append("Known allergy to any ingredient")
+        conditions.append(MESSAGES["safety.avoid.allergy"])
         
         return conditions
 
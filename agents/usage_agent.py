@@ -2,11 +2,15 @@
 
 from typing import Dict, Any
 from models.product_model import ProductModel
+from models.product_features import ProductFeatures
+from templates.localization import MESSAGES, Message
 
 
 class UsageAgent:
     """Generates structured usage instructions from product data."""
     
+    version = "1.0.0"
+    
     def __init__(self):
         """Initialize the usage agent."""
         pass
@@ -21,47 +25,46 @@ class UsageAgent:
         Returns:
             Structured usage content block
         """
+        features = product.features
         return {
             "instructions": product.how_to_use,
-            "frequency": self._extract_frequency(product.how_to_use),
-            "time_of_day": self._extract_time_of_day(product.how_to_use),
-            "application_steps": self._parse_application_steps(product.how_to_use),
+            "frequency": self._extract_frequency(features),
+            "time_of_day": self._extract_time_of_day(features),
+            "application_steps": self._parse_application_steps(features),
             "precautions": [
-                "Apply to clean, dry skin",
-                "Follow with sunscreen during daytime",
-                "Start with lower frequency if you have sensitive skin"
+                MESSAGES["usage.precaution.clean_dry_skin"],
+                MESSAGES["usage.precaution.sunscreen_daytime"],
+                MESSAGES["precaution.lower_frequency"]
             ],
             "compatible_skin_types": product.skin_type
         }
     
-    def _extract_frequency(self, instructions: str) -> str:
+    def _extract_frequency(self, features: ProductFeatures) -> Message:
         """Extract frequency information from instructions."""
-        instructions_lower = instructions.lower()
-        if "morning" in instructions_lower:
-            return "Once daily (morning)"
-        elif "night" in instructions_lower or "evening" in instructions_lower:
-            return "Once daily (evening)"
+        if features.applied_in_morning:
+            return MESSAGES["usage.frequency.morning"]
+        elif features.applied_in_evening:
+            return MESSAGES["usage.frequency.evening"]
         else:
-            return "As directed"
+            return MESSAGES["usage.frequency.as_directed"]
     
-    def _extract_time_of_day(self, instructions: str) -> str:
+    def _extract_time_of_day(self, features: ProductFeatures) -> str:
         """Extract time of day from instructions."""
-        instructions_lower = instructions.lower()
-        if "morning" in instructions_lower:
+        if features.applied_in_morning:
             return "morning"
-        elif "night" in instructions_lower or "evening" in instructions_lower:
+        elif features.applied_in_evening:
             return "evening"
         else:
             return "flexible"
     
-    def _parse_application_steps(self, instructions: str) -> list:
+    def _parse_application_steps(self, features: ProductFeatures) -> list:
         """Parse application steps from instructions."""
         steps = []
-        if "drops" in instructions.lower():
-            steps.append("Dispense 2-3 drops")
-        steps.append("Apply to face and neck")
-        if "sunscreen" in instructions.lower():
-            steps.append("Follow with sunscreen")
+        if features.dispensed_in_drops:
+            steps.append(MESSAGES["usage.step.dispense_drops"])
+        steps.append(MESSAGES["usage.step.apply_face_neck"])
+        if features.mentions_sunscreen:
+            steps.append(MESSAGES["usage.step.follow_sunscreen"])
         return steps
 
 
@@ -1,14 +1,369 @@
 """Flask web application for the multi-agent content generation system."""
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, g, make_response, render_template, request, jsonify, stream_with_context
+import functools
+import hmac
+import itertools
 import json
 import os
+import threading
+import time
 from pathlib import Path
-from orchestrator.pipeline_orchestrator import PipelineOrchestrator
+from typing import Any, Dict, Iterator, Optional, Tuple
+from agents.product_parser_agent import split_list_field
+from orchestrator.pipeline_orchestrator import PipelineOrchestrator, resolve_pages
+from orchestrator.job_queue import JobQueue, JobWorkerPool
+from orchestrator.admission import AdmissionController
+from orchestrator.deadline import DeadlineExceededError, is_pending
+from orchestrator.tracing import JsonlTraceExporter, Tracer, build_span_tree, format_span_tree
+from orchestrator.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry, PipelineMetrics
+from orchestrator.profiling import SamplingProfiler
+from orchestrator.artifact_cache import MIN_COMPRESS_SIZE, SUPPORTED_ENCODINGS, Artifact, ArtifactCache, compress
+from orchestrator.search_index import SEARCHABLE_PAGES, SearchIndex
 from models.product_model import ProductModel
+from models.reference_data import SAMPLE_DATA_PATH
 
 app = Flask(__name__)
 
+# Per-process metrics, exposed on /metrics in the Prometheus text format; the
+# pid label keeps each gunicorn worker's series apart
+metrics = MetricsRegistry(process_label="pid")
+pipeline_metrics = PipelineMetrics(metrics)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to serve HTTP requests, including streamed bodies.",
+    ("route", "method")
+)
+http_requests_total = metrics.counter(
+    "http_requests_total",
+    "HTTP requests served.",
+    ("route", "method", "status")
+)
+
+# Traces of sampled, slow or failed requests, written to a local JSONL file
+# (outputs/*.jsonl* is gitignored)
+trace_exporter = JsonlTraceExporter(os.environ.get('TRACE_FILE', 'outputs/traces.jsonl'))
+tracer = Tracer(
+    trace_exporter,
+    sample_rate=float(os.environ.get('TRACE_SAMPLE_RATE', 0.01)),
+    slow_threshold=float(os.environ.get('TRACE_SLOW_MS', 1000)) / 1000
+) if os.environ.get('TRACING', 'on').lower() not in ('0', 'off', 'false') else None
+
+# Paths that are never traced
+_UNTRACED_PREFIXES = ('/metrics', '/debug/', '/static/')
+
+# Bearer token for /debug/profile and /debug/trace; they are disabled when unset
+DEBUG_TOKEN = os.environ.get('DEBUG_TOKEN')
+# A profile holds a request thread for its whole duration
+MAX_PROFILE_SECONDS = 30.0
+_profile_lock = threading.Lock()
+
+# One long-lived orchestrator per worker process, shared by its threads
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def _build_orchestrator() -> PipelineOrchestrator:
+    """Build an orchestrator that reports stage timings to metrics and the tracer."""
+    orchestrator = PipelineOrchestrator()
+    orchestrator.instrumentation.add_observer(pipeline_metrics)
+    orchestrator.instrumentation.set_tracer(tracer)
+    orchestrator.add_page_observer(_index_page)
+    return orchestrator
+
+
+def get_orchestrator() -> PipelineOrchestrator:
+    """Return this process's orchestrator, building it on first use."""
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = _build_orchestrator()
+    return _orchestrator
+
+
+# Search index over the pages this worker process has generated, keeping
+# the most recently generated pages when it is full
+_search_index = None
+_search_index_lock = threading.Lock()
+SEARCH_MAX_DOCUMENTS = int(os.environ.get('SEARCH_MAX_DOCUMENTS', 100000))
+MAX_SEARCH_RESULTS = 100
+
+
+def get_search_index() -> SearchIndex:
+    """Return this process's search index, creating it empty on first use."""
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = SearchIndex(max_documents=SEARCH_MAX_DOCUMENTS)
+    return _search_index
+
+
+def seed_search_index() -> None:
+    """Index the pages saved in outputs/, at worker startup rather than during a request."""
+    index = get_search_index()
+    for page_type in SEARCHABLE_PAGES:
+        path = Path("outputs") / f"{page_type}.json"
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                index.add_page(page_type, json.load(f))
+
+
+def _index_page(page_type: str, page: Dict[str, Any]) -> None:
+    """Page observer keeping the search index up to date with generated pages."""
+    get_search_index().add_page(page_type, page)
+
+
+def _parse_agent_timeouts(value: str) -> Dict[str, float]:
+    """Parse budgets such as "ComparisonAgent=0.5,PriceAgent=0.2"."""
+    budgets = {}
+    for item in value.split(','):
+        if item.strip():
+            name, seconds = item.split('=', 1)
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+# Latency budgets for interactive generation requests (unset means no limit)
+PIPELINE_TIMEOUT = float(os.environ['PIPELINE_TIMEOUT']) if os.environ.get('PIPELINE_TIMEOUT') else None
+AGENT_TIMEOUTS = _parse_agent_timeouts(os.environ.get('AGENT_TIMEOUTS', ''))
+
+
+# Background job queue and its worker threads, started per worker process
+_job_queue = None
+_job_pool = None
+_job_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return this process's job queue, starting its worker pool on first use."""
+    global _job_queue, _job_pool
+    if _job_queue is None:
+        with _job_lock:
+            if _job_queue is None:
+                queue = JobQueue(os.environ.get('JOB_DB_PATH', 'outputs/jobs.db'))
+                _job_pool = JobWorkerPool(
+                    queue,
+                    get_orchestrator,
+                    workers=int(os.environ.get('JOB_WORKERS', 2))
+                )
+                _job_pool.start()
+                _job_queue = queue
+    return _job_queue
+
+
+def init_worker() -> None:
+    """Build a fresh orchestrator and job workers for a newly forked worker process."""
+    global _orchestrator
+    with _orchestrator_lock:
+        _orchestrator = _build_orchestrator()
+        # Build every agent now rather than on the worker's first live request
+        _orchestrator.warm()
+    Path("outputs").mkdir(exist_ok=True)
+    seed_search_index()
+    # Starting the pool also resumes jobs left unfinished by a previous run
+    get_job_queue()
+
+
+# Downloads and sample data served from memory with precomputed compression
+_artifacts = ArtifactCache()
+
+# Bounds concurrent pipeline requests per worker process; excess load is shed with 503
+admission = AdmissionController(
+    max_concurrent=int(os.environ.get('ADMISSION_MAX_CONCURRENT', 4)),
+    max_queue=int(os.environ.get('ADMISSION_MAX_QUEUE', 16)),
+    queue_timeout=float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 5.0))
+)
+
+
+def admission_controlled(view):
+    """
+    Run a view only after the admission controller grants a slot.
+    
+    The slot is held until the response is closed, so streamed responses
+    count against the limit while they are generating.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not admission.acquire():
+            response = jsonify({"error": "Server is busy, please retry later"})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(admission.retry_after())
+            return response
+        
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            admission.release()
+            raise
+        response.call_on_close(admission.release)
+        return response
+    
+    return wrapper
+
+
+def _coalescing_samples():
+    """Coalescing counters from the current orchestrator."""
+    stats = get_orchestrator().get_coalescing_stats()
+    return [((kind,), stats[kind]) for kind in ("requests", "executions", "coalesced")]
+
+
+def _admission_gauge_samples():
+    """Current admission controller occupancy."""
+    stats = admission.stats()
+    return [(("active",), stats["active"]), (("queued",), stats["queue_depth"])]
+
+
+def _admission_counter_samples():
+    """Admission decisions so far."""
+    stats = admission.stats()
+    return [
+        (("admitted",), stats["admitted"]),
+        (("rejected_queue_full",), stats["rejected_queue_full"]),
+        (("rejected_timeout",), stats["rejected_timeout"])
+    ]
+
+
+metrics.callback(
+    "pipeline_coalescing_total",
+    "generate_pages() calls by outcome: requests, executions and coalesced waiters.",
+    "counter",
+    _coalescing_samples,
+    ("kind",)
+)
+metrics.callback(
+    "admission_requests",
+    "Generation requests currently admitted or waiting in the queue.",
+    "gauge",
+    _admission_gauge_samples,
+    ("state",)
+)
+metrics.callback(
+    "admission_decisions_total",
+    "Admission controller decisions.",
+    "counter",
+    _admission_counter_samples,
+    ("outcome",)
+)
+
+
+@app.before_request
+def _start_request_instrumentation() -> None:
+    """Record when the request started and open its root trace span."""
+    g.request_started = time.perf_counter()
+    g.request_span = None
+    if tracer is not None and not request.path.startswith(_UNTRACED_PREFIXES):
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        g.request_span = tracer.start_span(
+            f"request {request.method} {route}",
+            {"http.method": request.method, "http.route": route, "http.request_bytes": request.content_length or 0}
+        )
+
+
+@app.after_request
+def _record_request_metrics(response: Response) -> Response:
+    """Record route latency and close the trace once the response (including any stream) is closed."""
+    started = g.get("request_started")
+    if started is None:
+        return response
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    method = request.method
+    status = str(response.status_code)
+    span = g.get("request_span")
+    if span is not None:
+        span.set_attribute("http.status", response.status_code)
+        response.headers["X-Trace-Id"] = span.trace_id
+    
+    def record():
+        http_request_duration.observe(time.perf_counter() - started, route, method)
+        http_requests_total.inc(route, method, status)
+        if span is not None:
+            tracer.end_span(span)
+    
+    response.call_on_close(record)
+    return response
+
+
+def debug_token_required(view):
+    """Require ``Authorization: Bearer <DEBUG_TOKEN>``; respond 404 if no token is configured."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not DEBUG_TOKEN:
+            return jsonify({"error": "Not found"}), 404
+        scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(supplied.strip().encode(), DEBUG_TOKEN.encode()):
+            response = jsonify({"error": "Invalid or missing debug token"})
+            response.status_code = 401
+            response.headers['WWW-Authenticate'] = 'Bearer'
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@app.route('/debug/trace/<trace_id>')
+@debug_token_required
+def debug_trace(trace_id):
+    """
+    Show an exported trace as a span tree.
+    
+    Returns JSON by default, or an indented text waterfall with ``?format=text``.
+    Only traces that were sampled, slow or failed are available. Traces
+    carry product hashes and timings, so like /debug/profile this needs
+    the debug token.
+    """
+    trace = trace_exporter.get(trace_id)
+    if trace is None:
+        return jsonify({"error": "Trace not found (it may not have been sampled)"}), 404
+    if request.args.get('format') == 'text':
+        return Response(format_span_tree(trace), mimetype='text/plain')
+    return jsonify(dict(trace, spans=build_span_tree(trace)))
+
+
+@app.route('/debug/profile')
+@debug_token_required
+def debug_profile():
+    """
+    Sample this worker process's threads for ``?seconds=N`` and return the profile.
+    
+    Returns collapsed stacks grouped by agent (for flamegraph.pl or
+    speedscope) by default, or sample counts per agent and the stacks as
+    JSON with ``?format=json``. One profile runs at a time per process.
+    The interpreter's switch interval is left unchanged, since lowering it
+    would slow every thread of the worker while the profile runs.
+    """
+    try:
+        seconds = float(request.args.get('seconds', 10))
+    except ValueError:
+        return jsonify({"error": "seconds must be a number"}), 400
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return jsonify({"error": f"seconds must be between 0 and {MAX_PROFILE_SECONDS:.0f}"}), 400
+    
+    if not _profile_lock.acquire(blocking=False):
+        return jsonify({"error": "A profile is already running in this worker"}), 409
+    try:
+        profiler = SamplingProfiler(ignore_threads={threading.get_ident()}, lower_switch_interval=False)
+        with profiler:
+            time.sleep(seconds)
+    finally:
+        _profile_lock.release()
+    
+    if request.args.get('format') == 'json':
+        return jsonify({
+            "pid": os.getpid(),
+            "seconds": seconds,
+            "samples": profiler.samples,
+            "by_agent": profiler.by_agent(),
+            "collapsed": profiler.collapsed().splitlines()
+        })
+    return Response(profiler.collapsed(), mimetype='text/plain', headers={"X-Profile-Samples": str(profiler.samples)})
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Expose this worker process's metrics, labelled with its pid, in the Prometheus text format."""
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 
 @app.route('/')
 def index():
@@ -16,58 +371,440 @@ def index():
     return render_template('index.html')
 
 
+def _form_product_data() -> Dict[str, Any]:
+    """Build raw product data from the submitted form fields."""
+    return {
+        "product_name": request.form.get('product_name', '').strip(),
+        "concentration": request.form.get('concentration', '').strip(),
+        "skin_type": split_list_field(request.form.get('skin_type')),
+        "key_ingredients": split_list_field(request.form.get('key_ingredients')),
+        "benefits": split_list_field(request.form.get('benefits')),
+        "how_to_use": request.form.get('how_to_use', '').strip(),
+        "side_effects": request.form.get('side_effects', '').strip(),
+        "price": float(request.form.get('price', 0))
+    }
+
+
+def _missing_form_field(product_data: Dict[str, Any]) -> Optional[str]:
+    """Return an error message for the first missing required field, if any."""
+    if not product_data["product_name"]:
+        return "Product name is required"
+    
+    if not product_data["skin_type"]:
+        return "At least one skin type is required"
+    
+    if not product_data["key_ingredients"]:
+        return "At least one key ingredient is required"
+    
+    if not product_data["benefits"]:
+        return "At least one benefit is required"
+    
+    return None
+
+
+def _requested_pages() -> Optional[Tuple[str, ...]]:
+    """
+    Read the ``pages`` selection (e.g. ``faq,comparison_page``) from the query or form.
+    
+    Returns:
+        Requested page types, or None for all pages
+        
+    Raises:
+        ValueError: If an unknown page type is requested
+    """
+    value = request.args.get('pages') or request.form.get('pages')
+    if not value:
+        return None
+    return resolve_pages(split_list_field(value))
+
+
 @app.route('/generate', methods=['POST'])
+@admission_controlled
 def generate():
     """Generate content from product data."""
     try:
         # Get product data from form
-        product_data = {
-            "product_name": request.form.get('product_name', '').strip(),
-            "concentration": request.form.get('concentration', '').strip(),
-            "skin_type": [s.strip() for s in request.form.get('skin_type', '').split(',') if s.strip()],
-            "key_ingredients": [i.strip() for i in request.form.get('key_ingredients', '').split(',') if i.strip()],
-            "benefits": [b.strip() for b in request.form.get('benefits', '').split(',') if b.strip()],
-            "how_to_use": request.form.get('how_to_use', '').strip(),
-            "side_effects": request.form.get('side_effects', '').strip(),
-            "price": float(request.form.get('price', 0))
-        }
+        product_data = _form_product_data()
         
         # Validate required fields
-        if not product_data["product_name"]:
-            return jsonify({"error": "Product name is required"}), 400
-        
-        if not product_data["skin_type"]:
-            return jsonify({"error": "At least one skin type is required"}), 400
-        
-        if not product_data["key_ingredients"]:
-            return jsonify({"error": "At least one key ingredient is required"}), 400
-        
-        if not product_data["benefits"]:
-            return jsonify({"error": "At least one benefit is required"}), 400
+        missing = _missing_form_field(product_data)
+        if missing:
+            return jsonify({"error": missing}), 400
         
-        # Initialize orchestrator and execute pipeline
-        orchestrator = PipelineOrchestrator()
-        output_files = orchestrator.execute(product_data, output_dir="outputs")
-        
-        # Read generated JSON files
-        results = {}
-        for page_type, file_path in output_files.items():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                results[page_type] = json.load(f)
+        # Execute pipeline on the shared orchestrator
+        orchestrator = get_orchestrator()
+        results = orchestrator.generate_pages(product_data, PIPELINE_TIMEOUT, AGENT_TIMEOUTS, _requested_pages())
+        output_files = orchestrator.save_pages(results, output_dir="outputs")
         
         return jsonify({
             "success": True,
             "message": "Content generated successfully!",
             "results": results,
-            "output_files": output_files
+            "output_files": output_files,
+            "pending_pages": [page_type for page_type, page in results.items() if is_pending(page)]
         })
         
+    except DeadlineExceededError as e:
+        return jsonify({"error": f"Generation timed out: {str(e)}"}), 504
     except ValueError as e:
         return jsonify({"error": f"Validation error: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"error": f"Error generating content: {str(e)}"}), 500
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_page_events(
+    orchestrator: PipelineOrchestrator,
+    first_page: Tuple[str, Dict[str, Any]],
+    remaining_pages: Iterator[Tuple[str, Dict[str, Any]]]
+) -> Iterator[str]:
+    """Save and emit each page as an SSE event, then a final done event."""
+    output_files = {}
+    try:
+        for page_type, page in itertools.chain([first_page], remaining_pages):
+            output_files.update(orchestrator.save_pages({page_type: page}, output_dir="outputs"))
+            yield _sse_event("page", {
+                "page_type": page_type,
+                "page": page,
+                "output_file": output_files[page_type]
+            })
+    except Exception as e:
+        yield _sse_event("error", {"error": f"Error generating content: {str(e)}"})
+        return
+    
+    yield _sse_event("done", {
+        "success": True,
+        "message": "Content generated successfully!",
+        "output_files": output_files
+    })
+
+
+@app.route('/generate/stream', methods=['POST'])
+@admission_controlled
+def generate_stream():
+    """
+    Generate content from product data, streaming pages as server-sent events.
+    
+    Each page is pushed as a ``page`` event as soon as it is assembled,
+    followed by a ``done`` event. Input errors are returned as a regular
+    JSON 400 response before the stream starts.
+    """
+    try:
+        product_data = _form_product_data()
+        
+        missing = _missing_form_field(product_data)
+        if missing:
+            return jsonify({"error": missing}), 400
+        
+        # Produce the first page eagerly so parse errors surface as a 400
+        orchestrator = get_orchestrator()
+        pages = orchestrator.iter_pages(product_data, _requested_pages())
+        first_page = next(pages)
+        
+    except ValueError as e:
+        return jsonify({"error": f"Validation error: {str(e)}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error generating content: {str(e)}"}), 500
+    
+    return Response(
+        stream_with_context(_stream_page_events(orchestrator, first_page, pages)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _ndjson_line(record: Dict[str, Any]) -> str:
+    """Serialize one record as a newline-delimited JSON line."""
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _iter_request_products() -> Iterator[Any]:
+    """
+    Yield products from the request body.
+    
+    NDJSON bodies (application/x-ndjson) are read line by line so large
+    batches are never fully buffered; JSON bodies may hold a single product
+    object or an array of products.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        for line in request.stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+        return
+    
+    body = request.get_json(silent=True)
+    if isinstance(body, list):
+        yield from body
+    else:
+        yield body
+
+
+def _generate_records(products: Iterator[Any], pages: Optional[Tuple[str, ...]] = None) -> Iterator[str]:
+    """Run the pipeline per product and yield one NDJSON line as each finishes."""
+    orchestrator = get_orchestrator()
+    succeeded = 0
+    failed = 0
+    
+    try:
+        for index, product_data in enumerate(products):
+            try:
+                if not isinstance(product_data, dict):
+                    raise ValueError("each product must be a JSON object")
+                results = orchestrator.generate_pages(product_data, PIPELINE_TIMEOUT, AGENT_TIMEOUTS, pages)
+                succeeded += 1
+                yield _ndjson_line({
+                    "index": index,
+                    "success": True,
+                    "product_name": str(product_data.get("product_name", "")).strip(),
+                    "results": results,
+                    "pending_pages": [page_type for page_type, page in results.items() if is_pending(page)]
+                })
+            except DeadlineExceededError as e:
+                failed += 1
+                yield _ndjson_line({
+                    "index": index,
+                    "success": False,
+                    "error": f"Generation timed out: {str(e)}"
+                })
+            except ValueError as e:
+                failed += 1
+                yield _ndjson_line({
+                    "index": index,
+                    "success": False,
+                    "error": f"Validation error: {str(e)}"
+                })
+            except Exception as e:
+                failed += 1
+                yield _ndjson_line({
+                    "index": index,
+                    "success": False,
+                    "error": f"Error generating content: {str(e)}"
+                })
+    except ValueError as e:
+        # Malformed NDJSON line; report it and stop reading the body
+        yield _ndjson_line({
+            "index": succeeded + failed,
+            "success": False,
+            "error": f"Invalid JSON: {str(e)}"
+        })
+        failed += 1
+    
+    yield _ndjson_line({
+        "done": True,
+        "total": succeeded + failed,
+        "succeeded": succeeded,
+        "failed": failed
+    })
+
+
+@app.route('/api/generate', methods=['POST'])
+@admission_controlled
+def api_generate():
+    """
+    Generate content for one or more products from a JSON body.
+    
+    Accepts a product object, an array of product objects, or an NDJSON
+    stream of products. Results are streamed back as NDJSON, one line per
+    product as it finishes, followed by a summary line. ``?pages=faq,...``
+    limits generation to the listed pages and the agents they need.
+    """
+    try:
+        pages = _requested_pages()
+    except ValueError as e:
+        return jsonify({"error": f"Validation error: {str(e)}"}), 400
+    
+    if request.mimetype != 'application/x-ndjson':
+        body = request.get_json(silent=True)
+        if not isinstance(body, (dict, list)):
+            return jsonify({"error": "Request body must be a JSON object or array of objects"}), 400
+    
+    return Response(
+        stream_with_context(_generate_records(_iter_request_products(), pages)),
+        mimetype='application/x-ndjson'
+    )
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submit a catalog for background generation.
+    
+    The body is an array of products or an object with a ``products`` array
+    and an optional integer ``priority`` (higher runs first).
+    """
+    body = request.get_json(silent=True)
+    priority = 0
+    if isinstance(body, dict):
+        priority = body.get("priority", 0)
+        body = body.get("products")
+    
+    if not isinstance(body, list) or not body:
+        return jsonify({"error": "Request body must contain a non-empty array of products"}), 400
+    # bool is a subclass of int, but "priority": true is not a priority
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        return jsonify({"error": "priority must be an integer"}), 400
+    
+    queue = get_job_queue()
+    job_id = queue.submit(body, priority=priority)
+    _job_pool.notify()
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "results_url": f"/jobs/{job_id}/results"
+    }), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Return the status and progress of a job."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job."""
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not queue.cancel(job_id):
+        return jsonify({"error": "Job has already finished"}), 409
+    return jsonify(queue.get(job_id))
+
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    """
+    Stream a job's results as NDJSON in product order.
+    
+    By default the stream stays open until the job finishes; pass
+    ``?follow=false`` to return only the results available now.
+    """
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    follow = request.args.get('follow', 'true').lower() not in ('0', 'false', 'no')
+    records = queue.iter_results(job_id, follow=follow)
+    return Response(
+        stream_with_context(_ndjson_line(record) for record in records),
+        mimetype='application/x-ndjson'
+    )
+
+
+@app.route('/search')
+def search():
+    """
+    Search the FAQ and product pages generated by this worker process.
+    
+    Takes the query as ``?q=``, with optional ``limit`` (1-100, default 10)
+    and ``page_type`` (faq or product_page). Results are ranked by BM25.
+    
+    Each worker process keeps its own index of the pages it generated
+    (plus the saved outputs it was seeded with), so under gunicorn the
+    results depend on which worker answers; ``pid`` in the response names it.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        return jsonify({"error": f"limit must be between 1 and {MAX_SEARCH_RESULTS}"}), 400
+    page_type = request.args.get('page_type') or None
+    if page_type is not None and page_type not in SEARCHABLE_PAGES:
+        return jsonify({"error": f"page_type must be one of {', '.join(SEARCHABLE_PAGES)}"}), 400
+    
+    index = get_search_index()
+    start = time.perf_counter()
+    results = index.search(query, limit=limit, page_type=page_type)
+    return jsonify({
+        "query": query,
+        "results": results,
+        "documents": len(index),
+        "pid": os.getpid(),
+        "took_ms": round((time.perf_counter() - start) * 1000, 3)
+    })
+
+
+@app.route('/stats')
+def stats():
+    """Return runtime counters for this worker process."""
+    return jsonify({
+        "pid": os.getpid(),
+        "coalescing": get_orchestrator().get_coalescing_stats(),
+        "admission": admission.stats()
+    })
+
+
+def _negotiate_encoding() -> Optional[str]:
+    """Pick the preferred supported Content-Encoding the client accepts."""
+    best, best_quality = None, 0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _artifact_response(artifact: Artifact, download_name: Optional[str] = None) -> Response:
+    """
+    Serve a cached JSON artifact with validators and negotiated compression.
+    
+    Returns 304 Not Modified when the client's If-None-Match or
+    If-Modified-Since matches.
+    """
+    encoding = _negotiate_encoding() if artifact.encoded else None
+    body, etag = artifact.variant(encoding)
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.last_modified = artifact.last_modified
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if download_name:
+        response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    
+    return response.make_conditional(request)
+
+
+@app.after_request
+def compress_json_response(response: Response) -> Response:
+    """Compress buffered JSON responses when the client accepts gzip or deflate."""
+    if (
+        response.mimetype != 'application/json'
+        or response.is_streamed
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.status_code in (204, 304)
+    ):
+        return response
+    
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+    
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate_encoding()
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
 @app.route('/download/<page_type>')
 def download(page_type):
     """Download a specific JSON output file."""
@@ -75,20 +812,19 @@ def download(page_type):
     if page_type not in valid_types:
         return jsonify({"error": "Invalid page type"}), 400
     
-    file_path = Path("outputs") / f"{page_type}.json"
-    if not file_path.exists():
+    artifact = _artifacts.get(Path("outputs") / f"{page_type}.json")
+    if artifact is None:
         return jsonify({"error": "File not found. Please generate content first."}), 404
     
-    return send_file(file_path, as_attachment=True, download_name=f"{page_type}.json")
+    return _artifact_response(artifact, download_name=f"{page_type}.json")
 
 
 @app.route('/load-sample')
 def load_sample():
     """Load sample product data."""
-    sample_path = Path("data/product_data.json")
-    if sample_path.exists():
-        with open(sample_path, 'r', encoding='utf-8') as f:
-            return jsonify(json.load(f))
+    artifact = _artifacts.get(SAMPLE_DATA_PATH)
+    if artifact is not None:
+        return _artifact_response(artifact)
     return jsonify({"error": "Sample data not found"}), 404
 
 
@@ -153,8 +889,10 @@ def deployment_info():
 
 
 if __name__ == '__main__':
+    # Development server; production uses gunicorn with wsgi.py
     # Ensure outputs directory exists
     Path("outputs").mkdir(exist_ok=True)
+    seed_search_index()
     
     # Get port from environment variable (for cloud deployment) or use default
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,5 @@
+"""Benchmark suite for the multi-agent content generation pipeline."""
+
+from .synthetic import generate_product, generate_products
+
+__all__ = ['generate_product', 'generate_products']
@@ -0,0 +1,390 @@
+"""HTTP load-test harness for the Flask endpoints.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --concurrency 16 --duration 30
+    python -m benchmarks.load_test --mix generate=5,download=3,api=1,stream=1
+    python -m benchmarks.load_test --server gunicorn
+    python -m benchmarks.load_test --url http://staging.example.com
+
+Unless --url is given, the app is started locally on a free port: either
+in-process on Werkzeug's threaded server (default) or as a gunicorn
+subprocess using gunicorn.conf.py, which matches production. Results are
+written as JSON to benchmarks/results/load_latest.json, tagged with the
+git commit so runs can be compared across commits.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Allow running as a script from the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.run_benchmarks import summarize
+from benchmarks.synthetic import generate_products
+
+
+DEFAULT_MIX = "generate=4,download=3,api=2,stream=1"
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "load_latest.json"
+ENDPOINTS = ("generate", "stream", "api", "download", "sample")
+PAGE_TYPES = ["faq", "product_page", "comparison_page"]
+
+# Number of distinct synthetic products cycled through by the workers
+CATALOG_SIZE = 1000
+
+
+def _form_body(product: Dict[str, Any]) -> bytes:
+    """Encode a raw product as the /generate form."""
+    fields = {
+        key: ", ".join(value) if isinstance(value, list) else value
+        for key, value in product.items()
+    }
+    return urllib.parse.urlencode(fields).encode('utf-8')
+
+
+def build_request(endpoint: str, base_url: str, product: Dict[str, Any], rng: random.Random) -> urllib.request.Request:
+    """
+    Build the HTTP request for one endpoint in the mix.
+
+    Args:
+        endpoint: One of ENDPOINTS
+        base_url: Server root URL
+        product: Synthetic raw product to submit
+        rng: Random source for choosing download targets
+
+    Returns:
+        Request ready for urlopen
+    """
+    form_headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if endpoint == "generate":
+        return urllib.request.Request(f"{base_url}/generate", data=_form_body(product), headers=form_headers)
+    if endpoint == "stream":
+        return urllib.request.Request(f"{base_url}/generate/stream", data=_form_body(product), headers=form_headers)
+    if endpoint == "api":
+        return urllib.request.Request(
+            f"{base_url}/api/generate",
+            data=json.dumps(product).encode('utf-8'),
+            headers={"Content-Type": "application/json"}
+        )
+    if endpoint == "download":
+        return urllib.request.Request(
+            f"{base_url}/download/{rng.choice(PAGE_TYPES)}",
+            headers={"Accept-Encoding": "gzip"}
+        )
+    if endpoint == "sample":
+        return urllib.request.Request(f"{base_url}/load-sample")
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def parse_mix(value: str) -> List[Tuple[str, int]]:
+    """
+    Parse a request mix such as ``"generate=4,download=1"``.
+
+    Returns:
+        List of (endpoint, weight) pairs
+    """
+    mix = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        endpoint, _, weight = item.partition("=")
+        endpoint = endpoint.strip()
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint!r}; expected one of {', '.join(ENDPOINTS)}")
+        mix.append((endpoint, int(weight or 1)))
+    if not mix:
+        raise ValueError("Request mix is empty")
+    return mix
+
+
+def send(request: urllib.request.Request, timeout: float) -> int:
+    """
+    Send a request and read the full response body.
+
+    Returns:
+        HTTP status code, or 0 if the connection failed
+    """
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+class LoadRun:
+    """Drives a request mix at fixed concurrency and records every result."""
+
+    def __init__(
+        self,
+        base_url: str,
+        mix: List[Tuple[str, int]],
+        concurrency: int,
+        seed: int = 42,
+        timeout: float = 30.0,
+        sender: Callable[[urllib.request.Request, float], int] = send
+    ):
+        """
+        Initialize a run.
+
+        Args:
+            base_url: Server root URL
+            mix: Weighted endpoints from parse_mix()
+            concurrency: Number of concurrent client workers
+            seed: Seed for the synthetic catalog and endpoint choice
+            timeout: Per-request timeout in seconds
+            sender: Sends one request and returns its status code
+        """
+        self.base_url = base_url.rstrip("/")
+        self.mix = mix
+        self.concurrency = concurrency
+        self.seed = seed
+        self.timeout = timeout
+        self._send = sender
+        self._catalog = list(generate_products(CATALOG_SIZE, seed))
+        self._lock = threading.Lock()
+        self._durations: Dict[str, array] = defaultdict(lambda: array('d'))
+        self._statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def warm_up(self) -> None:
+        """Generate once so that /download has files to serve."""
+        self._send(build_request("generate", self.base_url, self._catalog[0], random.Random(self.seed)), self.timeout)
+
+    def _worker(self, worker_id: int, next_request: Callable[[], Optional[int]], stop_at: Optional[float]) -> None:
+        """Issue requests until the shared budget or the duration runs out."""
+        rng = random.Random(self.seed * 1000 + worker_id)
+        endpoints = [endpoint for endpoint, _ in self.mix]
+        weights = [weight for _, weight in self.mix]
+        while True:
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                return
+            number = next_request()
+            if number is None:
+                return
+            endpoint = rng.choices(endpoints, weights)[0]
+            request = build_request(endpoint, self.base_url, self._catalog[number % CATALOG_SIZE], rng)
+            started = time.perf_counter()
+            status = self._send(request, self.timeout)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._durations[endpoint].append(elapsed)
+                self._statuses[endpoint][status] += 1
+
+    def run(self, requests: Optional[int] = None, duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run the load test.
+
+        Args:
+            requests: Total number of requests to send
+            duration: Seconds to keep sending for; used when requests is None
+
+        Returns:
+            Overall and per-endpoint throughput, latency percentiles and error rates
+        """
+        counter = itertools.count()
+        counter_lock = threading.Lock()
+
+        def next_request() -> Optional[int]:
+            with counter_lock:
+                number = next(counter)
+            return number if requests is None or number < requests else None
+
+        started = time.perf_counter()
+        stop_at = started + duration if requests is None and duration is not None else None
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for worker_id in range(self.concurrency):
+                pool.submit(self._worker, worker_id, next_request, stop_at)
+        wall_seconds = time.perf_counter() - started
+
+        endpoints = {}
+        all_durations = array('d')
+        all_statuses = Counter()
+        for endpoint in sorted(self._durations):
+            durations = self._durations[endpoint]
+            statuses = self._statuses[endpoint]
+            endpoints[endpoint] = self._summarize(durations, statuses, wall_seconds)
+            all_durations.extend(durations)
+            all_statuses.update(statuses)
+
+        return {
+            "wall_seconds": round(wall_seconds, 6),
+            "overall": self._summarize(all_durations, all_statuses, wall_seconds),
+            "endpoints": endpoints
+        }
+
+    @staticmethod
+    def _summarize(durations: array, statuses: Counter, wall_seconds: float) -> Dict[str, Any]:
+        """Latency summary plus status counts and error rate."""
+        summary = summarize(durations, wall_seconds)
+        del summary["busy_seconds"]
+        errors = sum(count for status, count in statuses.items() if status == 0 or status >= 400)
+        summary["errors"] = errors
+        summary["error_rate"] = round(errors / summary["calls"], 4) if summary["calls"] else 0.0
+        summary["status_counts"] = {str(status): count for status, count in sorted(statuses.items())}
+        return summary
+
+
+def _free_port() -> int:
+    """Find an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    """Poll the server until it answers or the timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if send(urllib.request.Request(f"{base_url}/stats"), 2.0) == 200:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout:.0f}s")
+
+
+def start_werkzeug_server() -> Tuple[str, Callable[[], None]]:
+    """
+    Serve the app in-process on a threaded Werkzeug server.
+
+    Returns:
+        Tuple of (base_url, stop function)
+    """
+    from werkzeug.serving import make_server
+    from app import app
+
+    # Per-request access logs would swamp the report
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+
+def start_gunicorn_server() -> Tuple[str, Callable[[], None]]:
+    """
+    Serve the app from a gunicorn subprocess with the production config.
+
+    Returns:
+        Tuple of (base_url, stop function)
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=REPO_ROOT,
+        env=dict(os.environ, PORT=str(port))
+    )
+
+    def stop() -> None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Load-test the content generation web app.")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--server", choices=["werkzeug", "gunicorn"], default="werkzeug",
+                        help="How to start the local server (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests (default: %(default)s)")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a request count")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Weighted endpoints from {', '.join(ENDPOINTS)} (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic catalog seed (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Where to write results JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Start the server if needed, run the load test and write the results."""
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    stop = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    elif args.server == "gunicorn":
+        base_url, stop = start_gunicorn_server()
+    else:
+        base_url, stop = start_werkzeug_server()
+
+    try:
+        _wait_until_ready(base_url)
+        load_run = LoadRun(base_url, mix, args.concurrency, args.seed, args.timeout)
+        load_run.warm_up()
+        mode = f"{args.duration:.0f}s" if args.duration else f"{args.requests} requests"
+        print(f"Load testing {base_url} with {args.concurrency} clients for {mode} ({args.mix})...")
+        result = load_run.run(requests=None if args.duration else args.requests, duration=args.duration)
+    finally:
+        if stop is not None:
+            stop()
+
+    print(f"\n{'endpoint':<10} {'calls':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    for name, stats in itertools.chain(result["endpoints"].items(), [("overall", result["overall"])]):
+        print(f"{name:<10} {stats['calls']:>7} {stats['throughput_per_s']:>9.1f} {stats['p50_ms']:>9.2f} "
+              f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['error_rate']:>8.2%}")
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or args.server,
+            "concurrency": args.concurrency,
+            "requests": None if args.duration else args.requests,
+            "duration": args.duration,
+            "mix": dict(mix),
+            "seed": args.seed
+        },
+        **result
+    }
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Pipeline benchmark runner with baseline regression gates.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1,1000,1000000 --seed 7
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --threshold 0.15
+
+Results are written to benchmarks/results/latest.json. When a baseline
+exists (benchmarks/baseline.json by default) the run is compared against it
+and the process exits with status 1 if any metric regressed by more than
+the threshold.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import textwrap
+import time
+import tracemalloc
+from array import array
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a script from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.pipeline_orchestrator import PipelineOrchestrator
+from orchestrator.memory_profiling import MemoryProfiler, format_memory_report
+from benchmarks.synthetic import generate_products
+
+
+DEFAULT_SIZES = [1, 100, 1000, 10000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "latest.json"
+
+# Runs and stages with less total time than this are too noisy to gate on
+MIN_GATED_SECONDS = 0.5
+
+
+def percentile(sorted_values: array, fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(durations: array, wall_seconds: float) -> Dict[str, float]:
+    """
+    Summarize a set of durations.
+
+    Args:
+        durations: Per-call durations in seconds
+        wall_seconds: Wall time the calls were spread over
+
+    Returns:
+        Call count, throughput and latency percentiles in milliseconds
+    """
+    ordered = array('d', sorted(durations))
+    busy = sum(ordered)
+    return {
+        "calls": len(ordered),
+        "throughput_per_s": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        "busy_seconds": round(busy, 6),
+        "mean_ms": round(busy / len(ordered) * 1000, 6) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 6),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 6),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 6),
+        "max_ms": round(ordered[-1] * 1000, 6) if ordered else 0.0
+    }
+
+
+def run_size(
+    size: int,
+    seed: int,
+    with_writes: bool,
+    measure_memory: bool,
+    memory_profile: bool = False
+) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline over one synthetic catalog size.
+
+    Args:
+        size: Number of products
+        seed: Catalog seed
+        with_writes: Include JSON output writes (execute) instead of generate_pages
+        measure_memory: Run a second pass under tracemalloc to record peak memory
+        memory_profile: Run a further pass recording memory per stage and
+            allocation sites with MemoryProfiler
+
+    Returns:
+        End-to-end and per-stage statistics for this size
+    """
+    orchestrator = PipelineOrchestrator()
+    stage_durations = defaultdict(lambda: array('d'))
+
+    def record_stage(stage: str, name: str, seconds: float, error: Optional[BaseException]) -> None:
+        stage_durations[f"{stage}:{name}"].append(seconds)
+
+    orchestrator.instrumentation.add_observer(record_stage)
+    end_to_end = array('d')
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        run = (lambda product: orchestrator.execute(product, output_dir=output_dir)) if with_writes \
+            else orchestrator.generate_pages
+
+        gc.collect()
+        started = time.perf_counter()
+        for product in generate_products(size, seed):
+            call_started = time.perf_counter()
+            run(product)
+            end_to_end.append(time.perf_counter() - call_started)
+        wall_seconds = time.perf_counter() - started
+
+        peak_memory = None
+        if measure_memory:
+            memory_orchestrator = PipelineOrchestrator()
+            memory_run = (lambda product: memory_orchestrator.execute(product, output_dir=output_dir)) if with_writes \
+                else memory_orchestrator.generate_pages
+            gc.collect()
+            tracemalloc.start()
+            for product in generate_products(size, seed):
+                memory_run(product)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        memory_stages = None
+        retained_after_run = None
+        if memory_profile:
+            # Separate pass: allocation-site snapshots would inflate the peak above
+            profiled_orchestrator = PipelineOrchestrator()
+            profiler = MemoryProfiler(top_sites=5)
+            profiled_orchestrator.instrumentation.set_memory_profiler(profiler)
+            profiled_run = (lambda product: profiled_orchestrator.execute(product, output_dir=output_dir)) if with_writes \
+                else profiled_orchestrator.generate_pages
+            gc.collect()
+            with profiler:
+                baseline_memory = tracemalloc.get_traced_memory()[0]
+                for product in generate_products(size, seed):
+                    profiled_run(product)
+                gc.collect()
+                # Memory still held once every page has been dropped grows with
+                # the catalog only if something retains per-product data
+                retained_after_run = tracemalloc.get_traced_memory()[0] - baseline_memory
+            memory_stages = profiler.report()
+
+    stages = {}
+    for key in sorted(stage_durations):
+        # Stage throughput is relative to time spent in that stage
+        durations = stage_durations[key]
+        stages[key] = summarize(durations, sum(durations))
+
+    return {
+        "products": size,
+        "wall_seconds": round(wall_seconds, 6),
+        "end_to_end": summarize(end_to_end, wall_seconds),
+        "stages": stages,
+        "peak_memory_bytes": peak_memory,
+        "retained_after_run_bytes": retained_after_run,
+        "memory_stages": memory_stages
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Find regressions of the current run against a baseline.
+
+    Throughput must not drop, and p95 latency and peak memory must not
+    grow, by more than ``threshold`` (a fraction) for any size present in
+    both runs. Latency is only gated where the baseline spent at least
+    MIN_GATED_SECONDS in the run or stage; shorter timings are too noisy.
+
+    Args:
+        current: Results of this run
+        baseline: Saved baseline results
+        threshold: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        Human-readable descriptions of each regression
+    """
+    regressions = []
+    for size, base in baseline["results"].items():
+        result = current["results"].get(size)
+        if result is None:
+            continue
+
+        checks = []
+        if base["wall_seconds"] >= MIN_GATED_SECONDS:
+            checks.append(("end_to_end.throughput_per_s", base["end_to_end"]["throughput_per_s"],
+                           result["end_to_end"]["throughput_per_s"], False))
+            checks.append(("end_to_end.p95_ms", base["end_to_end"]["p95_ms"],
+                           result["end_to_end"]["p95_ms"], True))
+            for stage, stats in base["stages"].items():
+                if stage in result["stages"] and stats["busy_seconds"] >= MIN_GATED_SECONDS:
+                    checks.append((f"stages.{stage}.p95_ms", stats["p95_ms"],
+                                   result["stages"][stage]["p95_ms"], True))
+        if base.get("peak_memory_bytes") and result.get("peak_memory_bytes"):
+            checks.append(("peak_memory_bytes", base["peak_memory_bytes"], result["peak_memory_bytes"], True))
+
+        for metric, old, new, higher_is_worse in checks:
+            if not old:
+                continue
+            change = (new - old) / old
+            if (higher_is_worse and change > threshold) or (not higher_is_worse and -change > threshold):
+                regressions.append(f"size {size}: {metric} {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the content generation pipeline.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated catalog sizes (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic catalog seed (default: %(default)s)")
+    parser.add_argument("--with-writes", action="store_true", help="Benchmark execute() including JSON writes")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--memory-profile", action="store_true",
+                        help="Also record memory and allocation sites per agent and assembly step")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Where to write results JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression before failing (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks and apply the regression gate."""
+    args = parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "with_writes": args.with_writes
+        },
+        "results": {}
+    }
+
+    for size in sizes:
+        print(f"Benchmarking {size} products...")
+        result = run_size(size, args.seed, args.with_writes, not args.no_memory, args.memory_profile)
+        results["results"][str(size)] = result
+        e2e = result["end_to_end"]
+        memory = result["peak_memory_bytes"]
+        print(f"  {e2e['throughput_per_s']:.0f} products/s  "
+              f"p50 {e2e['p50_ms']:.3f} ms  p95 {e2e['p95_ms']:.3f} ms  p99 {e2e['p99_ms']:.3f} ms"
+              + (f"  peak {memory / 1024:.0f} KiB" if memory is not None else ""))
+        if result["memory_stages"] is not None:
+            print(f"  retained after run: {result['retained_after_run_bytes']} B")
+            print(textwrap.indent(format_memory_report(result["memory_stages"]), "  "))
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output_path}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"\n[PASS] No regressions beyond {args.threshold:.0%} against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
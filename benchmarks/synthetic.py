@@ -0,0 +1,109 @@
+"""Seeded synthetic product catalog generator for benchmarks and load tests."""
+
+import random
+from typing import Any, Dict, Iterator
+
+
+SKIN_TYPES = ["Oily", "Dry", "Combination", "Normal", "Sensitive"]
+
+INGREDIENTS = [
+    "Vitamin C", "Hyaluronic Acid", "Niacinamide", "Vitamin E", "Retinol",
+    "Ferulic Acid", "Salicylic Acid", "Glycolic Acid", "Lactic Acid", "Peptides",
+    "Ceramides", "Squalane", "Zinc PCA", "Green Tea Extract", "Aloe Vera",
+    "Centella Asiatica", "Panthenol", "Allantoin", "Bakuchiol", "Azelaic Acid",
+    "Licorice Root Extract", "Alpha Arbutin", "Tranexamic Acid", "Kojic Acid",
+    "Glycerin", "Jojoba Oil", "Rosehip Oil", "Caffeine", "Snail Mucin", "Collagen"
+]
+
+BENEFITS = [
+    "Brightening", "Fades dark spots", "Hydration", "Anti-aging", "Even skin tone",
+    "Reduces fine lines", "Minimizes pores", "Soothes redness", "Oil control",
+    "Strengthens skin barrier", "Improves texture", "Boosts radiance", "Firming"
+]
+
+NAME_WORDS = [
+    "Glow", "Radiant", "Pure", "Luminous", "Velvet", "Dew", "Bright", "Clear",
+    "Silk", "Bloom", "Aura", "Prism", "Nova", "Zen", "Halo", "Petal"
+]
+
+PRODUCT_TYPES = ["Serum", "Essence", "Cream", "Gel", "Lotion", "Ampoule", "Toner"]
+
+HOW_TO_USE = [
+    "Apply {drops} drops in the morning before sunscreen",
+    "Apply {drops} drops in the evening after cleansing",
+    "Use {drops} drops at night on clean skin",
+    "Massage a small amount into face and neck twice daily",
+    "Apply {drops} drops in the morning and follow with sunscreen"
+]
+
+SIDE_EFFECTS = [
+    "Mild tingling for sensitive skin",
+    "May cause dryness in some users",
+    "Mild irritation possible for sensitive skin",
+    "Slight tingling on first use",
+    "",
+    "None reported"
+]
+
+
+def generate_product(rng: random.Random, index: int) -> Dict[str, Any]:
+    """
+    Generate one synthetic raw product.
+
+    Ingredient and benefit counts, string lengths and prices vary widely so
+    that every agent branch and page size is exercised.
+
+    Args:
+        rng: Seeded random source
+        index: Position in the catalog, included in the name for uniqueness
+
+    Returns:
+        Raw product data accepted by ProductParserAgent
+    """
+    name_words = rng.sample(NAME_WORDS, rng.randint(1, 4))
+    name = f"{' '.join(name_words)} {rng.choice(INGREDIENTS)} {rng.choice(PRODUCT_TYPES)} #{index}"
+    if rng.random() < 0.1:
+        # Occasional very long names stress string handling
+        name += " " + " ".join(rng.choices(NAME_WORDS, k=rng.randint(10, 60)))
+
+    if rng.random() < 0.9:
+        concentration = f"{rng.randint(1, 30)}% {rng.choice(INGREDIENTS)}"
+    else:
+        concentration = "Proprietary blend"
+
+    how_to_use = rng.choice(HOW_TO_USE).format(drops=rng.randint(1, 5))
+    if rng.random() < 0.2:
+        how_to_use += ". " + " ".join(rng.choices(["Avoid the eye area", "Patch test first", "Shake well"], k=rng.randint(1, 10)))
+
+    # Log-uniform prices cover budget through luxury categories
+    price = round(10 ** rng.uniform(1.7, 3.9), 2)
+
+    return {
+        "product_name": name,
+        "concentration": concentration,
+        "skin_type": rng.sample(SKIN_TYPES, rng.randint(1, len(SKIN_TYPES))),
+        "key_ingredients": rng.sample(INGREDIENTS, rng.randint(1, 12)),
+        "benefits": rng.sample(BENEFITS, rng.randint(1, 8)),
+        "how_to_use": how_to_use,
+        "side_effects": rng.choice(SIDE_EFFECTS),
+        "price": price
+    }
+
+
+def generate_products(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily generate a reproducible synthetic catalog.
+
+    Products are yielded one at a time, so catalogs of a million products
+    never need to be held in memory.
+
+    Args:
+        count: Number of products
+        seed: Random seed; the same seed always yields the same catalog
+
+    Yields:
+        Raw product data dictionaries
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_product(rng, index)
@@ -0,0 +1,190 @@
+"""Page validation benchmark: legacy, compiled and trusted validation.
+
+Usage:
+    python -m benchmarks.validation_benchmark
+    python -m benchmarks.validation_benchmark --pages 100000 --distinct 2000
+
+Pages are generated from a synthetic catalog, then validated in a batch by
+three paths: the original hand-written validators (frozen below), the
+compiled schema validators the templates now use, and trusted mode, which
+skips validation entirely. Results are written to
+benchmarks/results/validation_latest.json.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Allow running as a script from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.pipeline_orchestrator import PipelineOrchestrator
+from templates.faq_template import FAQTemplate
+from templates.product_page_template import ProductPageTemplate
+from templates.comparison_page_template import ComparisonPageTemplate
+from benchmarks.synthetic import generate_products
+
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "validation_latest.json"
+
+
+# Validators as they were before schemas were compiled; kept as the baseline
+
+
+def legacy_validate_faq(data: Dict[str, Any]) -> bool:
+    structure = FAQTemplate.get_structure()
+    for field in structure["required_fields"]:
+        if field not in data:
+            raise ValueError(f"Missing required field: {field}")
+    if "questions" in data:
+        questions = data["questions"]
+        if "total_count" not in questions:
+            raise ValueError("questions must have total_count")
+        if questions["total_count"] < 15:
+            raise ValueError("questions.total_count must be >= 15")
+        if "categories" not in questions:
+            raise ValueError("questions must have categories")
+        if len(questions["categories"]) < 3:
+            raise ValueError("questions.categories must have at least 3 categories")
+    return True
+
+
+def legacy_validate_product_page(data: Dict[str, Any]) -> bool:
+    structure = ProductPageTemplate.get_structure()
+    for field in structure["required_fields"]:
+        if field not in data:
+            raise ValueError(f"Missing required field: {field}")
+    for block in ["benefits", "usage", "safety", "price"]:
+        if not isinstance(data.get(block), dict) or not data[block]:
+            raise ValueError(f"{block} must be a non-empty object")
+    if "price" in data and "price" in data["price"]:
+        price_value = data["price"]["price"]
+        if not isinstance(price_value, (int, float)) or price_value <= 0:
+            raise ValueError("price.price must be a positive number")
+    return True
+
+
+def legacy_validate_comparison_page(data: Dict[str, Any]) -> bool:
+    structure = ComparisonPageTemplate.get_structure()
+    for field in structure["required_fields"]:
+        if field not in data:
+            raise ValueError(f"Missing required field: {field}")
+    for product_key in ["product_a", "product_b"]:
+        if product_key in data:
+            product = data[product_key]
+            for field in ["name", "concentration", "price", "key_ingredients", "benefits", "skin_type"]:
+                if field not in product:
+                    raise ValueError(f"{product_key}.{field} is required")
+    if "comparison_points" in data:
+        if len(data["comparison_points"]) < 3:
+            raise ValueError("comparison_points must include at least 3 comparison categories")
+    if "recommendation" in data:
+        if not isinstance(data["recommendation"], str) or not data["recommendation"].strip():
+            raise ValueError("recommendation must be a non-empty string")
+    return True
+
+
+LEGACY_VALIDATORS = {
+    "faq": legacy_validate_faq,
+    "product_page": legacy_validate_product_page,
+    "comparison_page": legacy_validate_comparison_page
+}
+
+COMPILED_VALIDATORS = {
+    "faq": FAQTemplate.validate,
+    "product_page": ProductPageTemplate.validate,
+    "comparison_page": ComparisonPageTemplate.validate
+}
+
+
+def build_pages(count: int, distinct: int, seed: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Build a batch of (page_type, page) pairs.
+
+    ``distinct`` products are run through the pipeline once and their pages
+    are cycled to fill the batch, so building 100k pages stays quick.
+    """
+    orchestrator = PipelineOrchestrator()
+    unique = []
+    for product in generate_products(max(1, distinct // 3 + 1), seed):
+        unique.extend(orchestrator.generate_pages(product).items())
+    return list(itertools.islice(itertools.cycle(unique), count))
+
+
+def time_batch(pages: List[Tuple[str, Dict[str, Any]]], validators: Optional[Dict[str, Callable]]) -> float:
+    """
+    Validate every page, returning the elapsed seconds.
+
+    With no validators every page type is trusted and only the trusted-page
+    check that PageAssemblyAgent makes is timed.
+    """
+    trusted = frozenset() if validators is not None else frozenset(COMPILED_VALIDATORS)
+    started = time.perf_counter()
+    for page_type, page in pages:
+        if page_type in trusted:
+            continue
+        validators[page_type](page)
+    return time.perf_counter() - started
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark page template validation.")
+    parser.add_argument("--pages", type=int, default=100000, help="Pages per batch (default: %(default)s)")
+    parser.add_argument("--distinct", type=int, default=2000,
+                        help="Distinct pages cycled to fill the batch (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic catalog seed (default: %(default)s)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Where to write results JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the validation benchmark."""
+    args = parse_args(argv)
+    print(f"Building {args.pages} pages...")
+    pages = build_pages(args.pages, args.distinct, args.seed)
+
+    paths = {"legacy": LEGACY_VALIDATORS, "compiled": COMPILED_VALIDATORS, "trusted": None}
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "pages": len(pages),
+            "distinct": args.distinct
+        },
+        "results": {}
+    }
+
+    for name, validators in paths.items():
+        seconds = min(time_batch(pages, validators) for _ in range(args.repeat))
+        results["results"][name] = {
+            "seconds": round(seconds, 6),
+            "pages_per_s": round(len(pages) / seconds, 1) if seconds else None,
+            "us_per_page": round(seconds / len(pages) * 1e6, 4)
+        }
+
+    legacy_seconds = results["results"]["legacy"]["seconds"]
+    for name, result in results["results"].items():
+        result["speedup"] = round(legacy_seconds / result["seconds"], 1) if result["seconds"] else None
+        print(f"  {name:<9} {result['seconds'] * 1000:>9.1f} ms  {result['us_per_page']:>7.3f} us/page"
+              + (f"  {result['speedup']:.1f}x" if result["speedup"] else ""))
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
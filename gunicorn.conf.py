@@ -0,0 +1,28 @@
+"""Gunicorn configuration for the multi-agent content generation web app.
+
+All settings can be overridden through environment variables:
+    PORT              Port to bind (default 5000)
+    WEB_CONCURRENCY   Number of worker processes (default 2)
+    GUNICORN_THREADS  Threads per worker (default 4)
+    GUNICORN_TIMEOUT  Worker timeout in seconds (default 120)
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = "gthread"
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Import the app (and its reference data) once in the master before forking
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """Give each worker its own long-lived orchestrator."""
+    from wsgi import init_worker
+    init_worker()
@@ -1,23 +1,162 @@
 """Main entry point for the multi-agent content generation system."""
 
+import argparse
+import cProfile
+import functools
 import json
+import pstats
+import tracemalloc
+from datetime import datetime
 from pathlib import Path
 from orchestrator.pipeline_orchestrator import PipelineOrchestrator
+from orchestrator.profiling import SamplingProfiler, agent_times, write_profile
+from orchestrator.memory_profiling import MemoryProfiler, format_memory_report
 
 
-def main():
+def positive_int(value):
+    """Argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run the multi-agent content generation pipeline.")
+    parser.add_argument("--data", default="data/product_data.json", help="Product data JSON file")
+    parser.add_argument("--output-dir", default="outputs", help="Directory for generated pages")
+    parser.add_argument("--pages", help="Comma-separated page types to generate, e.g. faq,comparison_page "
+                                        "(default: all pages)")
+    parser.add_argument("--locales", help="Comma-separated locales, e.g. en,hi,es; pages for each are "
+                                          "written to OUTPUT_DIR/<locale>/ from a single pipeline run")
+    # tracemalloc slows every allocation, which would skew the CPU profile
+    profiling = parser.add_mutually_exclusive_group()
+    profiling.add_argument("--profile", nargs="?", const="outputs/profile", metavar="DIR",
+                           help="Profile the run and write cProfile stats and collapsed stacks under DIR "
+                                "(default: %(const)s)")
+    profiling.add_argument("--memory-profile", nargs="?", const="outputs/profile/memory.json", metavar="FILE",
+                           help="Record retained and peak memory plus allocation sites per agent and "
+                                "assembly step, and write them to FILE (default: %(const)s); "
+                                "cannot be combined with --profile")
+    parser.add_argument("--html", nargs="?", const="outputs/site", metavar="DIR",
+                        help="Also render the pages to a static HTML site in DIR, re-rendering only "
+                             "pages whose content changed since the last export (default: %(const)s)")
+    parser.add_argument("--base-url", default="", help="URL the HTML site is served from, for its sitemap")
+    parser.add_argument("--workers", type=int, help="Processes rendering HTML pages (default: CPU count)")
+    parser.add_argument("--repeat", type=positive_int, default=1,
+                        help="Run the pipeline this many times; useful for fuller profiles")
+    return parser.parse_args(argv)
+
+
+def run_locales(orchestrator, product_data, locales, output_dir, pages):
+    """Generate and write the pages of several locales, keyed by "<locale>/<page_type>"."""
+    localized = orchestrator.generate_locales(product_data, locales, pages)
+    return {
+        f"{locale}/{page_type}": file_path
+        for locale, files in orchestrator.save_locales(localized, output_dir).items()
+        for page_type, file_path in files.items()
+    }
+
+
+def export_html(output_files, site_dir, base_url, workers):
+    """Render the written JSON pages to a static HTML site; each locale gets its own."""
+    # Imported here so the CLI runs without jinja2 unless --html is given
+    from orchestrator.site_export import SiteExporter
+    
+    sites = {}
+    for key, file_path in output_files.items():
+        locale, _, page_type = key.rpartition("/")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            sites.setdefault(locale, {})[page_type] = json.load(f)
+    
+    summaries = {}
+    for locale, pages in sites.items():
+        exporter = SiteExporter(str(Path(site_dir) / locale) if locale else site_dir, base_url, workers)
+        summaries[locale] = exporter.export([pages])
+    return summaries
+
+
+def run_profiled(run, repeat, profile_dir):
+    """Run the pipeline under the sampling profiler and cProfile and write the results."""
+    # Separate passes: a thread under cProfile starves the sampler of the GIL
+    with SamplingProfiler() as sampler:
+        for _ in range(repeat):
+            run()
+    
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        for _ in range(repeat):
+            output_files = run()
+    finally:
+        profile.disable()
+    
+    run_dir = Path(profile_dir) / datetime.now().strftime("%Y%m%d-%H%M%S")
+    paths = write_profile(run_dir, profile, sampler)
+    
+    print("\nProfile written:")
+    for path in paths:
+        print(f"  - {path}")
+    print("\nCumulative time per agent:")
+    for agent, seconds in agent_times(pstats.Stats(profile)).items():
+        print(f"  {agent}: {seconds * 1000:.3f} ms")
+    return output_files
+
+
+def run_memory_profiled(orchestrator, run, repeat, report_path):
+    """Run the pipeline under the memory profiler and write the per-stage report."""
+    profiler = MemoryProfiler()
+    orchestrator.instrumentation.set_memory_profiler(profiler)
+    try:
+        with profiler:
+            held_before = tracemalloc.get_traced_memory()[0]
+            for _ in range(repeat):
+                output_files = run()
+            held_after = tracemalloc.get_traced_memory()[0]
+    finally:
+        orchestrator.instrumentation.set_memory_profiler(None)
+    
+    report = profiler.report()
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({"retained_after_run_bytes": held_after - held_before, "stages": report}, f, indent=2)
+    
+    print("\nMemory per stage (retained = still allocated when the stage returns):")
+    print(format_memory_report(report), end="")
+    print(f"Traced memory still held after {repeat} run(s): {held_after - held_before} B")
+    print(f"Memory profile written to {report_path}")
+    return output_files
+
+
+def main(argv=None):
     """Execute the multi-agent content generation pipeline."""
+    args = parse_args(argv)
+    
     # Load product data
-    data_path = Path("data/product_data.json")
+    data_path = Path(args.data)
     with open(data_path, 'r', encoding='utf-8') as f:
         product_data = json.load(f)
     
     # Initialize orchestrator
     orchestrator = PipelineOrchestrator()
+    pages = [page.strip() for page in args.pages.split(",") if page.strip()] if args.pages else None
+    if args.locales:
+        locales = [locale.strip() for locale in args.locales.split(",") if locale.strip()]
+        run = functools.partial(run_locales, orchestrator, product_data, locales, args.output_dir, pages)
+    else:
+        run = functools.partial(orchestrator.execute, product_data, output_dir=args.output_dir, pages=pages)
     
     # Execute pipeline
     print("Starting multi-agent content generation pipeline...")
-    output_files = orchestrator.execute(product_data)
+    if args.profile:
+        output_files = run_profiled(run, args.repeat, args.profile)
+    elif args.memory_profile:
+        output_files = run_memory_profiled(orchestrator, run, args.repeat, args.memory_profile)
+    else:
+        for _ in range(args.repeat):
+            output_files = run()
     
     # Print results
     print("\nPipeline execution completed successfully!")
@@ -25,6 +164,12 @@ def main():
     for page_type, file_path in output_files.items():
         print(f"  - {page_type}: {file_path}")
     
+    if args.html:
+        print("\nHTML site:")
+        for locale, summary in export_html(output_files, args.html, args.base_url, args.workers).items():
+            print(f"  - {Path(summary['index']).parent}: {summary['rendered']} rendered, "
+                  f"{summary['unchanged']} unchanged, {summary['removed']} removed")
+    
     print("\nExecution flow:")
     flow = orchestrator.get_execution_flow()
     for step in flow["pipeline_steps"]:
@@ -34,4 +179,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
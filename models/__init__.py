@@ -1,7 +1,13 @@
 """Data models for the multi-agent content generation system."""
 
+from .currency import CurrencyTable, get_currency_table
+from .product_features import ProductFeatures
 from .product_model import ProductModel
-
-__all__ = ['ProductModel']
-
-
+from .reference_data import get_reference_product, get_reference_store, preload_reference_data
+from .reference_store import ReferenceStore, write_reference_store
+
+__all__ = [
+    'ProductModel', 'ProductFeatures', 'CurrencyTable', 'get_currency_table',
+    'get_reference_product', 'get_reference_store', 'preload_reference_data',
+    'ReferenceStore', 'write_reference_store'
+]
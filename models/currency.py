@@ -0,0 +1,109 @@
+"""Currency conversion from the locally cached exchange rate table."""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+CURRENCY_RATES_PATH = Path(__file__).resolve().parent.parent / "data" / "currency_rates.json"
+
+
+class CurrencyTable:
+    """
+    Exchange rates relative to one base currency.
+
+    Rates are read from a file shipped with the project rather than fetched
+    at runtime, so conversions are deterministic and work offline. Refresh
+    data/currency_rates.json to update them.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float], as_of: Optional[str] = None):
+        """
+        Initialize a currency table.
+
+        Args:
+            base: Currency that product prices and thresholds are given in
+            rates: Units of each currency per one unit of the base currency
+            as_of: Date the rates were recorded
+
+        Raises:
+            ValueError: If the base currency is missing or a rate is not positive
+        """
+        if rates.get(base) != 1:
+            raise ValueError(f"Currency rates must give the base currency {base} a rate of 1")
+        for currency, rate in rates.items():
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool) or rate <= 0:
+                raise ValueError(f"Rate for {currency} must be a positive number")
+        self.base = base
+        self.rates = {currency: float(rate) for currency, rate in rates.items()}
+        self.as_of = as_of
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "CurrencyTable":
+        """
+        Load a currency table from JSON.
+
+        Args:
+            path: JSON file with ``base``, ``rates`` and ``as_of``; defaults
+                to data/currency_rates.json
+
+        Returns:
+            Currency table
+        """
+        with open(path or CURRENCY_RATES_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data["base"], data["rates"], data.get("as_of"))
+
+    @property
+    def currencies(self) -> List[str]:
+        """Supported currency codes, sorted."""
+        return sorted(self.rates)
+
+    def rate(self, currency: str, from_currency: Optional[str] = None) -> float:
+        """
+        Get the conversion factor between two currencies.
+
+        Args:
+            currency: Target currency code
+            from_currency: Source currency code; defaults to the base currency
+
+        Returns:
+            Units of ``currency`` per one unit of ``from_currency``
+
+        Raises:
+            ValueError: If either currency is not in the table
+        """
+        source = from_currency or self.base
+        for code in (currency, source):
+            if code not in self.rates:
+                raise ValueError(f"Unsupported currency: {code}; available: {', '.join(self.currencies)}")
+        return self.rates[currency] / self.rates[source]
+
+    def convert(self, amount: Any, currency: str, from_currency: Optional[str] = None) -> Any:
+        """
+        Convert an amount, or a NumPy array of amounts, to another currency.
+
+        Args:
+            amount: Amount in ``from_currency``
+            currency: Target currency code
+            from_currency: Source currency code; defaults to the base currency
+
+        Returns:
+            The amount in ``currency``, unrounded
+
+        Raises:
+            ValueError: If either currency is not in the table
+        """
+        return amount * self.rate(currency, from_currency)
+
+
+@lru_cache(maxsize=None)
+def get_currency_table() -> CurrencyTable:
+    """
+    Get the currency table from data/currency_rates.json, loaded once per process.
+
+    Returns:
+        Cached currency table (treat as read-only)
+    """
+    return CurrencyTable.from_file()
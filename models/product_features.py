@@ -0,0 +1,82 @@
+"""Normalized, read-only feature view of a product, extracted once per product."""
+
+import re
+from typing import TYPE_CHECKING, FrozenSet, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .product_model import ProductModel
+
+
+_PERCENT_PATTERN = re.compile(r'(\d+)%')
+
+
+class ProductFeatures(NamedTuple):
+    """
+    Derived values the content agents test product text against.
+
+    Lowercased text, parsed numbers, keyword flags and sets are computed
+    once from a ProductModel and shared by every agent, instead of each
+    agent lowercasing and searching the same fields again. Tuples follow
+    the order of the product's lists. A named tuple rather than a frozen
+    dataclass, which costs several times more to build per product.
+    """
+
+    # Lowercased text fields
+    how_to_use: str
+    side_effects: str
+    skin_types: Tuple[str, ...]
+    ingredients: Tuple[str, ...]
+    benefits: Tuple[str, ...]
+
+    # Normalized sets: ingredients lowercased, skin types and benefits as given
+    ingredient_set: FrozenSet[str]
+    skin_type_set: FrozenSet[str]
+    benefit_set: FrozenSet[str]
+
+    # First whole-number percentage in the concentration, e.g. 10.0 for "10% Vitamin C"
+    concentration_percent: Optional[float]
+
+    # Keyword flags
+    applied_in_morning: bool
+    applied_in_evening: bool
+    dispensed_in_drops: bool
+    mentions_sunscreen: bool
+    mild_side_effects: bool
+    sensitive_side_effects: bool
+    tingling_side_effects: bool
+    contains_vitamin_c: bool
+
+    @classmethod
+    def from_product(cls, product: "ProductModel") -> "ProductFeatures":
+        """
+        Extract the features of a product.
+
+        Args:
+            product: Normalized ProductModel
+
+        Returns:
+            Feature view of the product
+        """
+        how_to_use = product.how_to_use.lower()
+        side_effects = product.side_effects.lower()
+        ingredients = tuple([ingredient.lower() for ingredient in product.key_ingredients])
+        match = _PERCENT_PATTERN.search(product.concentration)
+        return cls(
+            how_to_use=how_to_use,
+            side_effects=side_effects,
+            skin_types=tuple([skin_type.lower() for skin_type in product.skin_type]),
+            ingredients=ingredients,
+            benefits=tuple([benefit.lower() for benefit in product.benefits]),
+            ingredient_set=frozenset(ingredients),
+            skin_type_set=frozenset(product.skin_type),
+            benefit_set=frozenset(product.benefits),
+            concentration_percent=float(match.group(1)) if match else None,
+            applied_in_morning="morning" in how_to_use,
+            applied_in_evening="night" in how_to_use or "evening" in how_to_use,
+            dispensed_in_drops="drops" in how_to_use,
+            mentions_sunscreen="sunscreen" in how_to_use,
+            mild_side_effects="mild" in side_effects,
+            sensitive_side_effects="sensitive" in side_effects,
+            tingling_side_effects="tingling" in side_effects,
+            contains_vitamin_c="vitamin c" in " ".join(ingredients)
+        )
@@ -1,8 +1,12 @@
 """Product data model with validation and normalization."""
 
+import hashlib
+import json
 from typing import List, Optional
 from dataclasses import dataclass, field
 
+from .product_features import ProductFeatures
+
 
 @dataclass
 class ProductModel:
@@ -17,6 +21,9 @@ class ProductModel:
     side_effects: str
     price: float
     
+    # Set by extract_features(); not part of the product's data
+    _features: Optional[ProductFeatures] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Validate and normalize product data."""
         if not self.product_name or not self.product_name.strip():
@@ -63,5 +70,37 @@ class ProductModel:
             "side_effects": self.side_effects,
             "price": self.price
         }
-
-
+    
+    @property
+    def features(self) -> ProductFeatures:
+        """Normalized feature view shared by the agents, extracted on first use."""
+        features = self._features
+        if features is None:
+            features = self.extract_features()
+        return features
+    
+    def extract_features(self) -> ProductFeatures:
+        """
+        Extract the feature view and keep it for later reads.
+        
+        Products are not modified after parsing, so the view stays current.
+        The orchestrator calls this right after parsing, before agents that
+        may run concurrently read it.
+        
+        Returns:
+            The product's ProductFeatures
+        """
+        self._features = ProductFeatures.from_product(self)
+        return self._features
+    
+    def fingerprint(self) -> str:
+        """
+        Get a stable hash of the normalized product data.
+        
+        Products that normalize to the same fields share a fingerprint.
+        
+        Returns:
+            Hex-encoded SHA-256 digest
+        """
+        canonical = json.dumps(self.to_dict(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
@@ -0,0 +1,151 @@
+"""Reference data shared by agents across requests and worker processes."""
+
+import json
+import os
+import stat
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any
+
+from .currency import get_currency_table
+from .product_model import ProductModel
+from .reference_store import ReferenceStore, attach_reference_store, catalog_digest
+
+
+SAMPLE_DATA_PATH = Path("data/product_data.json")
+
+# Fictional competitor used as Product B on comparison pages
+REFERENCE_PRODUCT_DATA = {
+    "product_name": "RadiantGlow Vitamin C Serum",
+    "concentration": "15% Vitamin C",
+    "skin_type": ["Dry", "Normal"],
+    "key_ingredients": ["Vitamin C", "Niacinamide", "Vitamin E"],
+    "benefits": ["Anti-aging", "Even skin tone", "Hydration"],
+    "how_to_use": "Apply 3-4 drops in the evening after cleansing",
+    "side_effects": "May cause dryness in some users",
+    "price": 899
+}
+
+
+# Competitor catalog written to the reference store; its first product is Product B
+REFERENCE_CATALOG = [REFERENCE_PRODUCT_DATA]
+
+
+def _private_cache_dir() -> Path:
+    """
+    Get this user's private cache directory in the temporary directory.
+
+    The directory is created with mode 0700. An existing one is only used
+    if it is a real directory owned by the current user that no one else
+    can access, so another user cannot plant or swap files in it.
+
+    Returns:
+        Path of the directory
+
+    Raises:
+        OSError: If the directory cannot be created or is not private
+    """
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    path = Path(tempfile.gettempdir()) / f"multi-agent-content-{user}"
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or (hasattr(os, "getuid") and info.st_uid != os.getuid())
+        or info.st_mode & 0o077
+    ):
+        raise PermissionError(f"{path} is not a private directory of the current user")
+    return path
+
+
+def _attach_reference_store(verify: bool = False) -> ReferenceStore:
+    """Attach the competitor catalog's store; see get_reference_store()."""
+    path = os.environ.get('REFERENCE_STORE_PATH')
+    if path and Path(path).exists():
+        return ReferenceStore(path)
+    if not path:
+        path = _private_cache_dir() / f"reference-catalog-{catalog_digest(REFERENCE_CATALOG)[:16]}.bin"
+    return attach_reference_store(path, REFERENCE_CATALOG, verify=verify)
+
+
+@lru_cache(maxsize=None)
+def get_reference_store() -> ReferenceStore:
+    """
+    Attach the competitor catalog, writing its reference store on first use.
+
+    With REFERENCE_STORE_PATH set to an existing file, that store is
+    attached as is, so a large catalog written once with
+    write_reference_store() is never parsed by the serving processes.
+    Otherwise REFERENCE_CATALOG is written to a file named by its digest
+    in _private_cache_dir(), which later processes of the same user attach
+    after checking only its header. preload_reference_data() checks the
+    whole file once, in the parent.
+
+    Returns:
+        Read-only store shared by every process that attaches it
+
+    Raises:
+        OSError: If the store can be neither read nor written
+        ValueError: If REFERENCE_STORE_PATH is not a valid reference store
+    """
+    return _attach_reference_store()
+
+
+@lru_cache(maxsize=None)
+def get_reference_product() -> ProductModel:
+    """
+    Get the reference product used for comparisons.
+
+    The model is decoded from the reference store, and it and its feature
+    view are built once per process and shared read-only by every
+    ComparisonAgent instance. When the store cannot be attached or
+    written, the product is built from REFERENCE_PRODUCT_DATA instead.
+
+    Returns:
+        ProductModel for the reference product
+    """
+    try:
+        product = get_reference_store().product(0)
+    except (OSError, ValueError):
+        product = ProductModel(**REFERENCE_PRODUCT_DATA)
+    product.extract_features()
+    return product
+
+
+@lru_cache(maxsize=None)
+def load_sample_data() -> Dict[str, Any]:
+    """
+    Load the sample product data shipped with the project.
+
+    Returns:
+        Raw sample product data (treat as read-only)
+
+    Raises:
+        FileNotFoundError: If the sample data file is missing
+    """
+    with open(SAMPLE_DATA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def preload_reference_data() -> None:
+    """Build all cached reference data so forked workers inherit it."""
+    # Imported here: templates.localization imports the models package
+    from templates.localization import DEFAULT_LOCALE, get_string_table
+
+    # Compare the whole store file with the catalog once, here, rebuilding
+    # it if it was altered; workers then trust its header
+    try:
+        _attach_reference_store(verify=True).close()
+    except (OSError, ValueError):
+        pass
+    # Also maps the reference store, whose pages forked workers share
+    get_reference_product()
+    get_currency_table()
+    # Every Message renders its default text from this table
+    get_string_table(DEFAULT_LOCALE)
+    if SAMPLE_DATA_PATH.exists():
+        load_sample_data()
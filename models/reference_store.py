@@ -0,0 +1,375 @@
+"""Read-only competitor catalogs in a compact binary file shared between processes."""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .product_model import ProductModel
+
+
+# File layout, in native byte order (the file is a per-host cache):
+#   header    _HEADER
+#   records   one _RECORD per product, in catalog order
+#   lists     _STRING_REF per list item (skin types, ingredients, benefits)
+#   names     uint32 record numbers sorted by product name, for lookups
+#   prices    float64 product prices, ascending
+#   strings   UTF-8 text, each distinct string stored once
+MAGIC = b"MACGREF\0"
+FORMAT_VERSION = 2
+_BYTE_ORDER_MARK = 0x01020304
+
+# magic, version, byte order mark, source digest, product count, list item
+# count, file size, then the offsets of the records, lists, names, prices
+# and strings
+_HEADER = struct.Struct("=8sII32sII6Q")
+
+# price, then (offset, length) of the name, concentration, how to use and
+# side effects strings, then (first list item, item count) of the skin
+# types, key ingredients and benefits
+_RECORD = struct.Struct("=d14I")
+
+# (offset, length) of a string
+_STRING_REF = struct.Struct("=II")
+
+# Text fields of a record, in layout order
+_TEXT_FIELDS = ("product_name", "concentration", "how_to_use", "side_effects")
+_LIST_FIELDS = ("skin_type", "key_ingredients", "benefits")
+
+ProductData = Union[ProductModel, Dict[str, Any]]
+
+
+def catalog_digest(products: Iterable[ProductData]) -> str:
+    """
+    Fingerprint a catalog's normalized data, in catalog order.
+
+    Args:
+        products: ProductModel instances or raw product dicts
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for product in products:
+        if not isinstance(product, ProductModel):
+            product = ProductModel(**product)
+        digest.update(json.dumps(product.to_dict(), sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next multiple of eight."""
+    return (offset + 7) & ~7
+
+
+def encode_reference_store(products: Iterable[ProductData]) -> bytes:
+    """
+    Encode a catalog in the reference store file format.
+
+    Encoding is deterministic, so the same catalog always gives the same bytes.
+
+    Args:
+        products: ProductModel instances or raw product dicts
+
+    Returns:
+        Contents of the reference store file
+
+    Raises:
+        ValueError: If a product is invalid or the catalog has duplicate names
+    """
+    models = [product if isinstance(product, ProductModel) else ProductModel(**product) for product in products]
+    names = [product.product_name for product in models]
+    if len(set(names)) != len(names):
+        raise ValueError("Reference catalog product names must be unique")
+
+    strings = bytearray()
+    string_refs: Dict[str, Tuple[int, int]] = {}
+
+    def intern(text: str) -> Tuple[int, int]:
+        ref = string_refs.get(text)
+        if ref is None:
+            encoded = text.encode("utf-8")
+            ref = string_refs[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return ref
+
+    records = bytearray()
+    items = bytearray()
+    item_count = 0
+    for product in models:
+        fields: List[int] = []
+        for name in _TEXT_FIELDS:
+            fields.extend(intern(getattr(product, name)))
+        for name in _LIST_FIELDS:
+            values = getattr(product, name)
+            fields.extend((item_count, len(values)))
+            for value in values:
+                items.extend(_STRING_REF.pack(*intern(value)))
+            item_count += len(values)
+        records.extend(_RECORD.pack(float(product.price), *fields))
+
+    order = sorted(range(len(models)), key=lambda number: names[number].encode("utf-8"))
+    sections = [
+        bytes(records),
+        bytes(items),
+        struct.pack(f"={len(order)}I", *order),
+        struct.pack(f"={len(models)}d", *sorted(float(product.price) for product in models)),
+        bytes(strings)
+    ]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position = _align(position)
+        offsets.append(position)
+        position += len(section)
+
+    contents = bytearray(_HEADER.pack(
+        MAGIC, FORMAT_VERSION, _BYTE_ORDER_MARK, bytes.fromhex(catalog_digest(models)),
+        len(models), item_count, position, *offsets
+    ))
+    for offset, section in zip(offsets, sections):
+        contents.extend(b"\0" * (offset - len(contents)))
+        contents.extend(section)
+    return bytes(contents)
+
+
+def write_reference_store(path: Union[str, Path], products: Iterable[ProductData]) -> Path:
+    """
+    Write a catalog to a reference store file.
+
+    The file is written next to its destination and renamed into place, so
+    processes attaching concurrently see either the old or the new file.
+
+    Args:
+        path: Destination file
+        products: ProductModel instances or raw product dicts
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        ValueError: If a product is invalid or the catalog has duplicate names
+    """
+    return _write_contents(Path(path), encode_reference_store(products))
+
+
+def _write_contents(path: Path, contents: bytes) -> Path:
+    """Write encoded store contents to a file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(contents)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return path
+
+
+class ReferenceStore:
+    """
+    Competitor catalog attached read-only from a memory-mapped file.
+
+    The file is built once, typically in the parent process, and every
+    process that attaches it maps the same pages from the operating
+    system's page cache: the catalog is neither copied into nor parsed by
+    each worker. Products are decoded into ProductModel objects only when
+    requested, and the price column is exposed without a copy.
+
+    A mapping inherited through fork() stays valid in the child, so gunicorn
+    workers forked after preload_reference_data() share the master's.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Attach a reference store file.
+
+        Args:
+            path: File written by write_reference_store()
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a reference store of this version
+                or its size differs from the one in its header
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            # The mapping stays valid after the file is closed
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"{self.path} is not a reference store")
+            (
+                magic, version, byte_order_mark, digest, count, item_count,
+                size, records, items, names, prices, strings
+            ) = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a reference store")
+            if version != FORMAT_VERSION or byte_order_mark != _BYTE_ORDER_MARK:
+                raise ValueError(f"{self.path} was written by another format version or byte order; rebuild it")
+            if size != len(self._map):
+                raise ValueError(f"{self.path} is truncated or was appended to; rebuild it")
+        except BaseException:
+            self._map.close()
+            raise
+
+        self.digest = digest.hex()
+        self._count = count
+        self._records = records
+        self._items = items
+        self._strings = strings
+        view = memoryview(self._map)
+        self._names = view[names:names + 4 * count].cast("I")
+        # Float64 view of the mapped prices, usable by bisect and numpy.asarray
+        self.prices = view[prices:prices + 8 * count].cast("d")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[ProductModel]:
+        for number in range(self._count):
+            yield self.product(number)
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(name) is not None
+
+    def __enter__(self) -> "ReferenceStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def product(self, number: int) -> ProductModel:
+        """
+        Decode one product.
+
+        Args:
+            number: Position of the product in the catalog
+
+        Returns:
+            New ProductModel for the product
+
+        Raises:
+            IndexError: If the number is out of range
+        """
+        if not 0 <= number < self._count:
+            raise IndexError("reference product number out of range")
+        fields = _RECORD.unpack_from(self._map, self._records + number * _RECORD.size)
+        data: Dict[str, Any] = {"price": fields[0]}
+        for position, name in enumerate(_TEXT_FIELDS):
+            data[name] = self._string(*fields[1 + 2 * position:3 + 2 * position])
+        for position, name in enumerate(_LIST_FIELDS):
+            start, length = fields[9 + 2 * position:11 + 2 * position]
+            data[name] = [
+                self._string(*ref)
+                for ref in _STRING_REF.iter_unpack(
+                    self._map[self._items + start * _STRING_REF.size:self._items + (start + length) * _STRING_REF.size]
+                )
+            ]
+        return ProductModel(**data)
+
+    def find(self, name: str) -> Optional[ProductModel]:
+        """
+        Decode the product with a given name.
+
+        Args:
+            name: Product name, as normalized by ProductModel
+
+        Returns:
+            New ProductModel, or None if the catalog has no such product
+        """
+        number = self._find(name)
+        return None if number is None else self.product(number)
+
+    def content_digest(self) -> str:
+        """Hex SHA-256 digest of the whole mapped file."""
+        return hashlib.sha256(self._map).hexdigest()
+
+    def names(self) -> List[str]:
+        """Product names in catalog order."""
+        return [self._name(number) for number in range(self._count)]
+
+    def close(self) -> None:
+        """Release the mapping; products already decoded stay usable."""
+        self._names.release()
+        self.prices.release()
+        self._map.close()
+
+    def _name(self, number: int) -> str:
+        return str(self._name_bytes(number), "utf-8")
+
+    def _name_bytes(self, number: int) -> bytes:
+        offset, length = _STRING_REF.unpack_from(self._map, self._records + number * _RECORD.size + 8)
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def _find(self, name: str) -> Optional[int]:
+        """Record number of a product name, by binary search over the name index."""
+        encoded = name.encode("utf-8")
+        names = self._names
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            probe = self._name_bytes(names[middle])
+            if probe == encoded:
+                return names[middle]
+            if probe < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return str(self._map[start:start + length], "utf-8")
+
+
+def attach_reference_store(
+    path: Union[str, Path],
+    products: Iterable[ProductData],
+    verify: bool = False
+) -> ReferenceStore:
+    """
+    Attach a catalog's reference store, writing it first if needed.
+
+    An existing file is reused when the catalog digest and file size in
+    its header match, so attaching reads only the header and does not
+    encode the catalog or page in the rest of the file. Only the first
+    process to attach it, normally the parent, builds it. With ``verify``
+    the whole file must also equal the encoded catalog, which catches a
+    file altered in place; do this once in the process that builds the
+    store, not in every worker.
+
+    Args:
+        path: Reference store file
+        products: Catalog the file must hold
+        verify: Compare the file's full contents, not just its header
+
+    Returns:
+        Attached store
+
+    Raises:
+        ValueError: If a product is invalid or the catalog has duplicate names
+    """
+    models = [product if isinstance(product, ProductModel) else ProductModel(**product) for product in products]
+    contents = None
+    try:
+        store = ReferenceStore(path)
+    except (FileNotFoundError, ValueError):
+        pass
+    else:
+        if store.digest == catalog_digest(models):
+            if not verify:
+                return store
+            contents = encode_reference_store(models)
+            if store.content_digest() == hashlib.sha256(contents).hexdigest():
+                return store
+        store.close()
+    _write_contents(Path(path), contents or encode_reference_store(models))
+    return ReferenceStore(path)
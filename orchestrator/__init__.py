@@ -1,7 +1,6 @@
 """Orchestration module for multi-agent pipeline."""
 
 from .pipeline_orchestrator import PipelineOrchestrator
+from .job_queue import JobQueue, JobWorkerPool
 
-__all__ = ['PipelineOrchestrator']
-
-
+__all__ = ['PipelineOrchestrator', 'JobQueue', 'JobWorkerPool']
@@ -0,0 +1,110 @@
+"""Admission control for bounding concurrent pipeline work."""
+
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Union
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded FIFO wait queue and queue deadlines.
+    
+    Up to ``max_concurrent`` callers run at once. Further callers wait in a
+    queue of at most ``max_queue`` entries for up to ``queue_timeout``
+    seconds; callers that find the queue full or whose deadline passes are
+    rejected so they can be shed quickly instead of piling up latency.
+    """
+    
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 5.0):
+        """
+        Initialize the controller.
+        
+        Args:
+            max_concurrent: Maximum number of admitted callers at once
+            max_queue: Maximum number of callers waiting for a slot
+            queue_timeout: Maximum seconds a caller may wait for a slot
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue cannot be negative")
+        
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        
+        self._lock = threading.Lock()
+        self._waiters: Deque[threading.Event] = deque()
+        self._active = 0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+    
+    def acquire(self) -> bool:
+        """
+        Wait for a slot.
+        
+        Returns:
+            True if admitted (call release() when done), False if rejected
+        """
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                self._admitted += 1
+                return True
+            if len(self._waiters) >= self.max_queue:
+                self._rejected_queue_full += 1
+                return False
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        
+        if waiter.wait(self.queue_timeout):
+            # release() handed its slot directly to this waiter
+            return True
+        
+        with self._lock:
+            if waiter.is_set():
+                # Slot arrived between the timeout and taking the lock
+                return True
+            self._waiters.remove(waiter)
+            self._rejected_timeout += 1
+            return False
+    
+    def release(self) -> None:
+        """Release a slot, handing it to the longest-waiting caller if any."""
+        with self._lock:
+            if self._waiters:
+                self._admitted += 1
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+    
+    def retry_after(self) -> int:
+        """
+        Suggest how long a rejected client should wait before retrying.
+        
+        Returns:
+            Whole seconds, at least 1
+        """
+        return max(1, math.ceil(self.queue_timeout))
+    
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get limiter state and counters.
+        
+        Returns:
+            Dictionary with active requests, queue depth, limits and
+            admission/rejection counts
+        """
+        with self._lock:
+            return {
+                "active": self._active,
+                "queue_depth": len(self._waiters),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_timeout": self._rejected_timeout
+            }
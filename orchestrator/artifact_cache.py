@@ -0,0 +1,114 @@
+"""In-memory cache of precompressed output artifacts for HTTP delivery."""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+# Encodings served to clients, in order of preference
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 500
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "gzip" or "deflate" (zlib-wrapped, as HTTP defines it)
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class Artifact(NamedTuple):
+    """A file's contents with precomputed encodings and validators."""
+
+    body: bytes
+    encoded: Dict[str, bytes]
+    etag: str
+    last_modified: float
+
+    def variant(self, encoding: Optional[str]) -> Tuple[bytes, str]:
+        """
+        Get the body and ETag for a content encoding.
+
+        Args:
+            encoding: One of SUPPORTED_ENCODINGS, or None for identity
+
+        Returns:
+            Tuple of (body, etag); each encoding has its own ETag
+        """
+        if encoding is None or encoding not in self.encoded:
+            return self.body, self.etag
+        return self.encoded[encoding], f"{self.etag}-{encoding}"
+
+
+class ArtifactCache:
+    """
+    Caches files in memory together with their compressed forms.
+
+    Entries are keyed by path and revalidated against the file's size and
+    modification time on every lookup, so a regenerated file (written
+    atomically by the orchestrator) is picked up on the next request.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[int, int], Artifact]] = {}
+
+    def get(self, path: Path) -> Optional[Artifact]:
+        """
+        Get a file's cached artifact, loading it if missing or stale.
+
+        Args:
+            path: File to serve
+
+        Returns:
+            Artifact, or None if the file does not exist
+        """
+        key = str(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        encoded = {}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            encoded = {encoding: compress(body, encoding) for encoding in SUPPORTED_ENCODINGS}
+
+        artifact = Artifact(
+            body=body,
+            encoded=encoded,
+            etag=hashlib.sha1(body).hexdigest(),
+            last_modified=stat.st_mtime
+        )
+        with self._lock:
+            self._entries[key] = (version, artifact)
+        return artifact
@@ -0,0 +1,72 @@
+"""Request deadlines for bounding pipeline latency."""
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+PENDING = "pending"
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a required agent does not finish within its budget."""
+
+
+class Deadline:
+    """
+    Time budget for one pipeline run.
+    
+    The total budget and any per-agent budgets are measured from the moment
+    the deadline is created, since agents start together.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Start the clock.
+        
+        Args:
+            timeout: Total budget in seconds, or None for no limit
+        """
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout if timeout is not None else None
+    
+    def remaining(self, budget: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds left before the deadline, optionally capped by a tighter budget.
+        
+        Args:
+            budget: Per-agent budget in seconds from the start of the run
+            
+        Returns:
+            Non-negative seconds remaining, or None if there is no limit
+        """
+        expires_at = self.expires_at
+        if budget is not None:
+            agent_expires_at = self.started_at + budget
+            expires_at = agent_expires_at if expires_at is None else min(expires_at, agent_expires_at)
+        if expires_at is None:
+            return None
+        return max(0.0, expires_at - time.monotonic())
+
+
+def pending_page(page_type: str, missing_agents: List[str]) -> Dict[str, Any]:
+    """
+    Build the placeholder returned for a page whose agents missed their budget.
+    
+    Args:
+        page_type: Page that could not be assembled in time
+        missing_agents: Agents that did not finish
+        
+    Returns:
+        Placeholder marking the page as pending
+    """
+    return {
+        "status": PENDING,
+        "page_type": page_type,
+        "missing_agents": missing_agents,
+        "reason": "Deadline exceeded before the page could be assembled"
+    }
+
+
+def is_pending(page: Dict[str, Any]) -> bool:
+    """Return True if a page is a pending placeholder."""
+    return page.get("status") == PENDING
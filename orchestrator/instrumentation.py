@@ -0,0 +1,104 @@
+"""Timing hooks for pipeline stages."""
+
+import time
+from typing import Any, Callable, List, Optional
+
+
+# Observer signature: (stage, name, seconds, error)
+StageObserver = Callable[[str, str, float, Optional[BaseException]], None]
+
+
+class _Stage:
+    """Context manager that times one stage and notifies observers on exit."""
+    
+    __slots__ = ("_observers", "_tracer", "_memory", "_memory_frame", "_span", "_stage", "_name", "_started")
+    
+    def __init__(self, observers: List[StageObserver], tracer: Any, memory: Any, stage: str, name: str):
+        self._observers = observers
+        self._tracer = tracer
+        self._memory = memory
+        self._memory_frame = None
+        self._span = None
+        self._stage = stage
+        self._name = name
+        self._started = 0.0
+    
+    def __enter__(self):
+        if self._tracer is not None:
+            self._span = self._tracer.start_span(f"{self._stage} {self._name}", {"stage": self._stage})
+        if self._memory is not None:
+            self._memory_frame = self._memory.enter(self._stage, self._name)
+        self._started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        if self._memory is not None:
+            self._memory.exit(self._memory_frame)
+        if self._span is not None:
+            self._tracer.end_span(self._span, exc)
+        for observer in self._observers:
+            observer(self._stage, self._name, elapsed, exc)
+        return False
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to this stage's span; a no-op when not tracing."""
+        if self._span is not None:
+            self._span.set_attribute(key, value)
+
+
+class Instrumentation:
+    """
+    Dispatches timed pipeline stages to registered observers.
+    
+    Stages are identified by a kind (``execute``, ``generate``, ``parse``,
+    ``agent``, ``assemble``, ``validate``, ``write``) and a name such as the
+    agent class or page type. With no observers or tracer, timing a stage
+    costs two clock reads.
+    """
+    
+    def __init__(self):
+        """Initialize with no observers and no tracer."""
+        self._observers: List[StageObserver] = []
+        self.tracer = None
+        self.memory_profiler = None
+    
+    def add_observer(self, observer: StageObserver) -> None:
+        """
+        Register a callback invoked after every stage.
+        
+        Args:
+            observer: Called with (stage, name, seconds, error)
+        """
+        self._observers = self._observers + [observer]
+    
+    def set_tracer(self, tracer: Any) -> None:
+        """
+        Record each stage as a span, nested under the current span.
+        
+        Args:
+            tracer: A tracing.Tracer, or None to stop tracing
+        """
+        self.tracer = tracer
+    
+    def set_memory_profiler(self, memory_profiler: Any) -> None:
+        """
+        Record allocated and peak memory for each stage.
+        
+        Args:
+            memory_profiler: A memory_profiling.MemoryProfiler, or None to stop
+        """
+        self.memory_profiler = memory_profiler
+    
+    def stage(self, stage: str, name: str) -> _Stage:
+        """
+        Time a block of pipeline work.
+        
+        Args:
+            stage: Kind of work (parse, agent, assemble, validate, write)
+            name: Agent class name or page type
+            
+        Returns:
+            Context manager that reports the block's duration
+        """
+        return _Stage(self._observers, self.tracer, self.memory_profiler, stage, name)
@@ -0,0 +1,437 @@
+"""Persistent background job queue for large generation batches."""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = (COMPLETED, CANCELLED)
+
+# Per-product item statuses (pending items use QUEUED)
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    succeeded INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, created_at);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    product TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of generation jobs.
+
+    Each job holds a list of products. Workers claim a job with a time-limited
+    lease and renew it as they go; a job whose lease expires (for example
+    because its process was restarted) is claimed again and resumes from its
+    first unfinished product.
+    """
+
+    def __init__(self, db_path: str = "outputs/jobs.db", lease_seconds: float = 60.0):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            lease_seconds: How long a claimed job stays owned without renewal
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection; safe to use from any thread or process."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, products: Iterable[Dict[str, Any]], priority: int = 0) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            products: Raw product data dictionaries
+            priority: Higher values are processed first
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        items = [
+            (job_id, idx, QUEUED, json.dumps(product, ensure_ascii=False))
+            for idx, product in enumerate(products)
+        ]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, status, product) VALUES (?, ?, ?, ?)",
+                items
+            )
+            conn.execute(
+                "INSERT INTO jobs (id, status, priority, total, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, priority, len(items), time.time())
+            )
+            conn.execute("COMMIT")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a job.
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            Job status dictionary, or None if the job does not exist
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, priority, total, succeeded, failed, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["job_id"] = job.pop("id")
+        job["completed"] = job["succeeded"] + job["failed"]
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Products already processed keep their results.
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            True if the job was cancelled, False if it was already finished or unknown
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, worker_id = NULL, lease_until = NULL "
+                "WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def claim(self, worker_id: str) -> Optional[str]:
+        """
+        Claim the highest-priority job that is queued or whose lease expired.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Claimed job id, or None if there is nothing to do
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_until = ?, "
+                "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        return row["id"]
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend a claimed job's lease.
+
+        Args:
+            job_id: Claimed job id
+            worker_id: Worker that holds the claim
+
+        Returns:
+            False if the job was cancelled or claimed by another worker
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND worker_id = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def pending_items(self, job_id: str, batch_size: int = 100) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield the products of a job that have not been processed yet.
+
+        Args:
+            job_id: Job id
+            batch_size: Number of products read from the database at a time
+
+        Yields:
+            Tuples of (index, raw product data)
+        """
+        last_idx = -1
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT idx, product FROM job_items WHERE job_id = ? AND status = ? AND idx > ? "
+                    "ORDER BY idx LIMIT ?",
+                    (job_id, QUEUED, last_idx, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                last_idx = row["idx"]
+                yield row["idx"], json.loads(row["product"])
+
+    def record_item(
+        self,
+        job_id: str,
+        idx: int,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Store the outcome of one product.
+
+        Args:
+            job_id: Job id
+            idx: Index of the product within the job
+            result: Generated pages on success
+            error: Error message on failure
+        """
+        status, counter = (ITEM_FAILED, "failed") if error is not None else (ITEM_DONE, "succeeded")
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ? "
+                "WHERE job_id = ? AND idx = ? AND status = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    error,
+                    job_id,
+                    idx,
+                    QUEUED
+                )
+            )
+            if cursor.rowcount == 1:
+                conn.execute(f"UPDATE jobs SET {counter} = {counter} + 1 WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        """
+        Mark a claimed job as completed.
+
+        Args:
+            job_id: Claimed job id
+            worker_id: Worker that holds the claim
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, worker_id = NULL, lease_until = NULL "
+                "WHERE id = ? AND status = ? AND worker_id = ?",
+                (COMPLETED, time.time(), job_id, RUNNING, worker_id)
+            )
+
+    def results(self, job_id: str, start: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get processed product results in index order.
+
+        Results are contiguous: a product is only returned once every product
+        before it has been processed, so callers can resume from ``start``.
+
+        Args:
+            job_id: Job id
+            start: First product index to return
+
+        Returns:
+            List of result records
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT idx, status, result, error FROM job_items "
+                "WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT 100",
+                (job_id, start)
+            ).fetchall()
+
+        records = []
+        for row in rows:
+            if row["status"] == QUEUED:
+                break
+            record = {"index": row["idx"], "success": row["status"] == ITEM_DONE}
+            if row["status"] == ITEM_DONE:
+                record["results"] = json.loads(row["result"])
+            else:
+                record["error"] = row["error"]
+            records.append(record)
+        return records
+
+    def iter_results(self, job_id: str, follow: bool = True, poll_interval: float = 0.5) -> Iterator[Dict[str, Any]]:
+        """
+        Yield result records, optionally waiting for the job to finish.
+
+        Args:
+            job_id: Job id
+            follow: Keep waiting for new results until the job is finished
+            poll_interval: Seconds between checks while following
+
+        Yields:
+            Result records in index order
+        """
+        next_idx = 0
+        while True:
+            # Read the status first so no result is missed after the final batch
+            job = self.get(job_id)
+            records = self.results(job_id, next_idx)
+            for record in records:
+                yield record
+            if records:
+                next_idx = records[-1]["index"] + 1
+                continue
+            if not follow or job is None or job["status"] in TERMINAL_STATUSES:
+                return
+            time.sleep(poll_interval)
+
+
+class JobWorkerPool:
+    """Background threads that claim jobs from a JobQueue and run the pipeline."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        orchestrator_factory: Callable[[], Any],
+        workers: int = 2,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            queue: Queue to take jobs from
+            orchestrator_factory: Returns the orchestrator used to generate pages
+            workers: Number of worker threads
+            poll_interval: Seconds to wait between polls when the queue is empty
+        """
+        self.queue = queue
+        self.orchestrator_factory = orchestrator_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the worker threads. Unfinished jobs are resumed automatically."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for n in range(self.workers):
+            worker_id = f"{socket.gethostname()}-{os.getpid()}-{n}-{uuid.uuid4().hex[:8]}"
+            thread = threading.Thread(
+                target=self._run,
+                args=(worker_id,),
+                name=f"job-worker-{n}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads after their current product."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers, e.g. after a job is submitted."""
+        self._wakeup.set()
+
+    def _run(self, worker_id: str) -> None:
+        """Worker loop: claim a job, process it, repeat."""
+        while not self._stop.is_set():
+            try:
+                job_id = self.queue.claim(worker_id)
+            except sqlite3.Error:
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            try:
+                self._process(job_id, worker_id)
+            except Exception:
+                # The worker survives; the job's lease expires and it is resumed
+                logger.exception("Job worker %s failed while processing job %s", worker_id, job_id)
+                self._stop.wait(self.poll_interval)
+
+    def _process(self, job_id: str, worker_id: str) -> None:
+        """Generate pages for every unprocessed product of a claimed job."""
+        orchestrator = self.orchestrator_factory()
+        for idx, product_data in self.queue.pending_items(job_id):
+            # Stops on shutdown, cancellation, or loss of the lease
+            if self._stop.is_set() or not self.queue.renew(job_id, worker_id):
+                return
+            try:
+                if not isinstance(product_data, dict):
+                    raise ValueError("each product must be a JSON object")
+                pages = orchestrator.generate_pages(product_data)
+                self.queue.record_item(job_id, idx, result=pages)
+            except ValueError as e:
+                self.queue.record_item(job_id, idx, error=f"Validation error: {str(e)}")
+            except Exception as e:
+                self.queue.record_item(job_id, idx, error=f"Error generating content: {str(e)}")
+
+        self.queue.complete(job_id, worker_id)
@@ -0,0 +1,221 @@
+"""Per-stage allocation and peak memory profiling with tracemalloc."""
+
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Allocations made by the profiler itself are excluded from site reports
+_IGNORED_SITE_FILES = frozenset({tracemalloc.__file__, __file__})
+
+
+class _StageFrame:
+    """Memory state of one stage while it runs."""
+
+    __slots__ = ("key", "start", "peak", "snapshot")
+
+    def __init__(self, key: str, start: int, snapshot: Optional[tracemalloc.Snapshot]):
+        self.key = key
+        self.start = start
+        self.peak = start
+        self.snapshot = snapshot
+
+
+class _StageStats:
+    """Memory totals for one stage across calls."""
+
+    __slots__ = ("calls", "site_calls", "retained", "peak", "sites")
+
+    def __init__(self):
+        self.calls = 0
+        self.site_calls = 0
+        self.retained = 0
+        self.peak = 0
+        self.sites: Counter = Counter()
+
+
+class MemoryProfiler:
+    """
+    Records allocated bytes and peak memory for every pipeline stage.
+
+    Attach it with ``Instrumentation.set_memory_profiler``. For each stage
+    (an agent, page assembly, validation, a write) it records:
+
+    - retained bytes: traced memory still allocated when the stage exits,
+      i.e. what the stage handed back to its caller or left in caches
+    - peak bytes: the highest traced memory above the stage's starting
+      point, including short-lived temporaries
+    - top allocation sites (file:line) by retained bytes, for the stage
+      kinds in ``snapshot_stages``, from tracemalloc snapshot diffs of the
+      first ``site_calls`` calls of each stage (snapshots cost time in
+      proportion to everything allocated in the process)
+
+    tracemalloc tracks the whole process, so stages that run at the same
+    time in other threads (deadline-bounded runs) are attributed to each
+    other. Profile serial runs for exact per-agent numbers. Snapshots are
+    themselves traced, so with sites enabled the peaks of enclosing stages
+    (generate, execute) include snapshot overhead; leaf stage peaks do not.
+    """
+
+    def __init__(
+        self,
+        top_sites: int = 10,
+        site_calls: int = 20,
+        snapshot_stages: Tuple[str, ...] = ("parse", "agent", "assemble")
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            top_sites: Allocation sites reported per stage; 0 disables snapshots
+            site_calls: Calls of each stage whose allocation sites are collected
+            snapshot_stages: Stage kinds for which allocation sites are collected
+        """
+        self.top_sites = top_sites
+        self.site_calls = site_calls
+        self.snapshot_stages = frozenset(snapshot_stages)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _StageStats] = {}
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracemalloc if it is not already tracing."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _stack(self) -> List[_StageFrame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, stage: str, name: str) -> Optional[_StageFrame]:
+        """Begin measuring a stage; returns the frame to pass to exit()."""
+        if not tracemalloc.is_tracing():
+            return None
+        stack = self._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # The peak is reset below, so credit the parent with it first
+            stack[-1].peak = max(stack[-1].peak, peak)
+
+        key = f"{stage}:{name}"
+        snapshot = None
+        if self.top_sites and stage in self.snapshot_stages and self._wants_sites(key):
+            snapshot = tracemalloc.take_snapshot()
+            current = tracemalloc.get_traced_memory()[0]
+
+        frame = _StageFrame(key, current, snapshot)
+        stack.append(frame)
+        tracemalloc.reset_peak()
+        return frame
+
+    def exit(self, frame: Optional[_StageFrame]) -> None:
+        """Finish measuring a stage started with enter()."""
+        if frame is None or not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        frame.peak = max(frame.peak, peak)
+
+        sites = None
+        if frame.snapshot is not None:
+            diff = tracemalloc.take_snapshot().compare_to(frame.snapshot, "lineno")
+            sites = [
+                (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff)
+                for stat in diff
+                if stat.size_diff > 0 and stat.traceback[0].filename not in _IGNORED_SITE_FILES
+            ][:self.top_sites]
+            frame.snapshot = None
+
+        stack = self._stack()
+        if stack and stack[-1] is frame:
+            stack.pop()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, frame.peak)
+
+        with self._lock:
+            stats = self._stats.get(frame.key)
+            if stats is None:
+                stats = self._stats[frame.key] = _StageStats()
+            stats.calls += 1
+            stats.retained += current - frame.start
+            stats.peak = max(stats.peak, frame.peak - frame.start)
+            if sites is not None:
+                stats.site_calls += 1
+                for site, size in sites:
+                    stats.sites[site] += size
+
+    def _wants_sites(self, key: str) -> bool:
+        """Whether allocation sites are still being collected for a stage."""
+        with self._lock:
+            stats = self._stats.get(key)
+            return stats is None or stats.site_calls < self.site_calls
+
+    def reset(self) -> None:
+        """Discard recorded measurements."""
+        with self._lock:
+            self._stats = {}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize memory per stage.
+
+        Returns:
+            Dictionary keyed by ``stage:name`` with calls, total and
+            per-call retained bytes, the largest peak above the stage's
+            start, and the top allocation sites by retained bytes per
+            sampled call
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        report = {}
+        for key, stats in sorted(items, key=lambda item: item[1].retained, reverse=True):
+            report[key] = {
+                "calls": stats.calls,
+                "retained_bytes": stats.retained,
+                "retained_bytes_per_call": round(stats.retained / stats.calls, 1),
+                "peak_bytes": stats.peak,
+                "top_sites": [
+                    {"site": site, "retained_bytes_per_call": round(size / stats.site_calls, 1)}
+                    for site, size in stats.sites.most_common(self.top_sites)
+                ]
+            }
+        return report
+
+
+def format_memory_report(report: Dict[str, Dict[str, Any]], sites: int = 3) -> str:
+    """
+    Render a memory report as a text table.
+
+    Args:
+        report: Output of MemoryProfiler.report()
+        sites: Allocation sites listed under each stage
+
+    Returns:
+        One line per stage, largest retained memory first
+    """
+    lines = [f"{'stage':<36} {'calls':>7} {'retained/call':>14} {'peak':>10}"]
+    for key, stats in report.items():
+        lines.append(
+            f"{key:<36} {stats['calls']:>7} {stats['retained_bytes_per_call']:>12.0f} B "
+            f"{stats['peak_bytes']:>8} B"
+        )
+        for site in stats["top_sites"][:sites]:
+            lines.append(f"    {site['retained_bytes_per_call']:>10.0f} B  {site['site']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,244 @@
+"""Dependency-free metrics registry with Prometheus text exposition."""
+
+import bisect
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+# Labels added to every sample of a registry at scrape time, as (name, value) pairs
+ConstLabels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], const_labels: ConstLabels = ()) -> str:
+    """Format a label set, e.g. {stage="agent",name="PriceAgent"}, followed by any constant labels."""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in const_labels]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing count per label set."""
+    
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Increase the counter for a label set."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+    
+    def render(self, const_labels: ConstLabels = ()) -> List[str]:
+        """Render this metric in the text format."""
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in values:
+            labels = _format_labels(self.labelnames, labelvalues, const_labels)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed distribution of observed values per label set."""
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label set: [per-bucket counts (last is +Inf), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+    
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for a label set."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[labelvalues] = entry
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def snapshot(self, *labelvalues: str) -> Optional[Dict[str, float]]:
+        """
+        Get the count and sum for a label set.
+        
+        Returns:
+            Dictionary with count and sum, or None if nothing was observed
+        """
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                return None
+            return {"count": entry[2], "sum": entry[1]}
+    
+    def render(self, const_labels: ConstLabels = ()) -> List[str]:
+        """Render this metric in the text format."""
+        with self._lock:
+            values = sorted((labels, (list(entry[0]), entry[1], entry[2])) for labels, entry in self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.labelnames + ("le",)
+        for labelvalues, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_names, labelvalues + (_format_value(bound),), const_labels)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues, const_labels)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """Metric whose samples are read from a callback at scrape time."""
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        metric_type: str,
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Tuple[str, ...] = ()
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.callback = callback
+        self.labelnames = labelnames
+    
+    def render(self, const_labels: ConstLabels = ()) -> List[str]:
+        """Render this metric in the text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for labelvalues, value in self.callback():
+            labels = _format_labels(self.labelnames, labelvalues, const_labels)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on a scrape."""
+    
+    def __init__(self, process_label: Optional[str] = None):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            process_label: Name of a label holding the rendering process's
+                pid, added to every sample. The pid is read at scrape time,
+                so a registry created before fork() labels each worker's
+                samples with that worker's pid
+        """
+        self.process_label = process_label
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+    
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, help_text, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+    
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        metric_type: str,
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Tuple[str, ...] = ()
+    ) -> CallbackMetric:
+        """Register a gauge or counter whose samples come from a callback."""
+        return self._register(CallbackMetric(name, help_text, metric_type, callback, labelnames))
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition text ending with a newline
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        const_labels = ((self.process_label, str(os.getpid())),) if self.process_label else ()
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(const_labels))
+        return "\n".join(lines) + "\n"
+
+
+class PipelineMetrics:
+    """Stage observer that records pipeline timings into a registry."""
+    
+    def __init__(self, registry: MetricsRegistry):
+        """
+        Register the pipeline metrics.
+        
+        Args:
+            registry: Registry to add the metrics to
+        """
+        self.durations = registry.histogram(
+            "pipeline_stage_duration_seconds",
+            "Time spent in each pipeline stage.",
+            ("stage", "name")
+        )
+        self.errors = registry.counter(
+            "pipeline_stage_errors_total",
+            "Pipeline stages that raised an exception.",
+            ("stage", "name")
+        )
+    
+    def __call__(self, stage: str, name: str, seconds: float, error: Optional[BaseException]) -> None:
+        """Record one stage; registered with Instrumentation.add_observer()."""
+        self.durations.observe(seconds, stage, name)
+        if error is not None:
+            self.errors.inc(stage, name)
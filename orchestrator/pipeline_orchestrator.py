@@ -1,101 +1,830 @@
 """Pipeline orchestrator that controls multi-agent execution flow."""
 
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import contextvars
 import json
+import logging
+import os
+import tempfile
+import threading
 from pathlib import Path
 
 from models.product_model import ProductModel
-from agents.product_parser_agent import ProductParserAgent
-from agents.question_generator_agent import QuestionGeneratorAgent
-from agents.benefits_agent import BenefitsAgent
-from agents.usage_agent import UsageAgent
-from agents.safety_agent import SafetyAgent
-from agents.price_agent import PriceAgent
-from agents.comparison_agent import ComparisonAgent
-from agents.page_assembly_agent import PageAssemblyAgent
+from agents.registry import AgentRegistry, load_agent_class
+from templates.localization import get_string_table, localize, plan_localization
+from .single_flight import SingleFlight
+from .deadline import Deadline, DeadlineExceededError, is_pending, pending_page
+from .instrumentation import Instrumentation
+from .quarantine import quarantine_record
+
+logger = logging.getLogger(__name__)
+
+
+OUTPUT_FILENAMES = {
+    "faq": "faq.json",
+    "product_page": "product_page.json",
+    "comparison_page": "comparison_page.json"
+}
+
+# Products assembled before their pages are validated together in generate_batch()
+DEFAULT_BATCH_SIZE = 256
+
+# Content agents each page depends on, in page delivery order
+PAGE_DEPENDENCIES = {
+    "faq": ("QuestionGeneratorAgent",),
+    "product_page": ("BenefitsAgent", "UsageAgent", "SafetyAgent", "PriceAgent"),
+    "comparison_page": ("ComparisonAgent",)
+}
+
+ALL_PAGES = tuple(PAGE_DEPENDENCIES)
+
+# Agents that build a page's block from the other content blocks of the same
+# run, called as generate(product, blocks) just before the page is assembled.
+# They never add dependencies: the agents they read (their ``agents``) run
+# first only when the request needs them anyway, and are otherwise missing
+DERIVED_AGENTS = {
+    "faq": ("FAQAnswerAgent",)
+}
+
+# Agents whose pages may be returned as pending when they miss their budget
+DEFAULT_OPTIONAL_AGENTS = frozenset({"ComparisonAgent"})
+
+# Runs of one agent allowed on the deadline thread pool at once, counting
+# runs that missed their deadline and are still finishing
+DEFAULT_MAX_AGENT_RUNS = 4
+
+# Page observer signature: (page_type, page)
+PageObserver = Callable[[str, Dict[str, Any]], None]
+
+# Content agent versions whose output is known to satisfy the page templates;
+# trusted orchestrators run only the templates' checks on product data (such
+# as a positive price, which agents pass through) for pages built only from
+# these. Each
+# content agent has a class-level ``version``, bumped whenever the structure
+# of its generated block changes; add the new version here only once its
+# pages have been checked against the templates.
+TRUSTED_AGENT_VERSIONS = {
+    "QuestionGeneratorAgent": frozenset({"1.0.0"}),
+    "BenefitsAgent": frozenset({"1.0.0"}),
+    "UsageAgent": frozenset({"1.0.0"}),
+    "SafetyAgent": frozenset({"1.0.0"}),
+    "PriceAgent": frozenset({"1.1.0"}),
+    "ComparisonAgent": frozenset({"1.0.0"}),
+    "FAQAnswerAgent": frozenset({"1.0.0"})
+}
+
+
+def _write_json_atomic(file_path: Path, data: Dict[str, Any]) -> int:
+    """
+    Write JSON via a temporary file so concurrent readers never see partial output.
+    
+    Returns:
+        Number of bytes written
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, file_path)
+        return size
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def resolve_pages(pages: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Normalize a requested page selection.
+    
+    Args:
+        pages: Page types to generate, or None for all pages
+        
+    Returns:
+        The requested page types in delivery order
+        
+    Raises:
+        ValueError: If a page type is unknown or nothing was requested
+    """
+    if pages is None:
+        return ALL_PAGES
+    requested = set(pages)
+    unknown = requested.difference(PAGE_DEPENDENCIES)
+    if unknown:
+        raise ValueError(f"Unknown page type(s): {', '.join(sorted(unknown))}")
+    if not requested:
+        raise ValueError("At least one page type must be requested")
+    return tuple(page_type for page_type in PAGE_DEPENDENCIES if page_type in requested)
+
+
+def required_agents(page_types: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Content agents needed to build the given pages.
+    
+    Args:
+        page_types: Page types, as returned by resolve_pages()
+        
+    Returns:
+        Agent class names in pipeline order, without duplicates
+    """
+    names = []
+    for page_type in page_types:
+        for name in PAGE_DEPENDENCIES[page_type]:
+            if name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+class _TrustedPages:
+    """
+    Page types whose agents all have trusted versions.
+    
+    Membership is checked the first time each page type is asked about, by
+    which point its agents are loaded, so pages never requested do not
+    import their agents.
+    """
+    
+    def __init__(self):
+        self._checked: Dict[str, bool] = {}
+    
+    def __contains__(self, page_type: str) -> bool:
+        trusted = self._checked.get(page_type)
+        if trusted is None:
+            trusted = self._checked[page_type] = all(
+                getattr(load_agent_class(name), "version", None) in TRUSTED_AGENT_VERSIONS.get(name, ())
+                for name in PAGE_DEPENDENCIES[page_type] + DERIVED_AGENTS.get(page_type, ())
+            )
+        return trusted
 
 
 class PipelineOrchestrator:
     """Orchestrates the multi-agent content generation pipeline."""
     
-    def __init__(self):
-        """Initialize the orchestrator with all agents."""
-        self.parser_agent = ProductParserAgent()
-        self.question_agent = QuestionGeneratorAgent()
-        self.benefits_agent = BenefitsAgent()
-        self.usage_agent = UsageAgent()
-        self.safety_agent = SafetyAgent()
-        self.price_agent = PriceAgent()
-        self.comparison_agent = ComparisonAgent()
-        self.assembly_agent = PageAssemblyAgent()
-    
-    def execute(self, raw_product_data: Dict[str, Any], output_dir: str = "outputs") -> Dict[str, str]:
+    def __init__(
+        self,
+        optional_agents: Iterable[str] = DEFAULT_OPTIONAL_AGENTS,
+        max_workers: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        trusted: bool = False,
+        max_agent_runs: int = DEFAULT_MAX_AGENT_RUNS
+    ):
+        """
+        Initialize the orchestrator.
+        
+        Content agents are imported and created on first use, so a caller
+        that only ever requests the FAQ never loads the comparison agent.
+        
+        Args:
+            optional_agents: Agent class names whose pages may be degraded
+                to pending when they miss a deadline
+            max_workers: Threads used to run agents concurrently under a
+                deadline; defaults to enough for every agent to use all of
+                its ``max_agent_runs`` at once
+            instrumentation: Stage timing hooks; a new one is created if omitted
+            trusted: Reduce template validation to the checks on product
+                data for pages whose agents all have versions listed in
+                TRUSTED_AGENT_VERSIONS
+            max_agent_runs: Runs of one agent allowed on that thread pool
+                at once. A run that misses its deadline keeps its slot until
+                it finishes, so a stuck agent holds at most this many threads
+        """
+        self.instrumentation = instrumentation or Instrumentation()
+        self.trusted = trusted
+        self.agents = AgentRegistry({
+            "PageAssemblyAgent": lambda: load_agent_class("PageAssemblyAgent")(
+                self.instrumentation, _TrustedPages() if trusted else ()
+            )
+        })
+        
+        self.optional_agents = frozenset(optional_agents)
+        self._page_observers: List[PageObserver] = []
+        
+        # Identical products generated concurrently share one pipeline run
+        self._in_flight = SingleFlight()
+        
+        # Bound each agent's share of the thread pool, so runs of one agent
+        # stuck past their deadlines cannot starve the others
+        self._agent_slots = {
+            name: threading.BoundedSemaphore(max_agent_runs) for name in required_agents(ALL_PAGES)
+        }
+        self._max_workers = max_workers or max_agent_runs * len(self._agent_slots)
+        
+        # Created on first deadline-bounded run, i.e. after any fork
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    @property
+    def parser_agent(self):
+        """Product parser, created on first use."""
+        return self.agents.get("ProductParserAgent")
+    
+    @property
+    def question_agent(self):
+        """FAQ question generator, created on first use."""
+        return self.agents.get("QuestionGeneratorAgent")
+    
+    @property
+    def benefits_agent(self):
+        """Benefits content agent, created on first use."""
+        return self.agents.get("BenefitsAgent")
+    
+    @property
+    def usage_agent(self):
+        """Usage content agent, created on first use."""
+        return self.agents.get("UsageAgent")
+    
+    @property
+    def safety_agent(self):
+        """Safety content agent, created on first use."""
+        return self.agents.get("SafetyAgent")
+    
+    @property
+    def price_agent(self):
+        """Price content agent, created on first use."""
+        return self.agents.get("PriceAgent")
+    
+    @property
+    def comparison_agent(self):
+        """Comparison content agent, created on first use."""
+        return self.agents.get("ComparisonAgent")
+    
+    @property
+    def answer_agent(self):
+        """FAQ answer agent, created on first use."""
+        return self.agents.get("FAQAnswerAgent")
+    
+    @property
+    def assembly_agent(self):
+        """Page assembly agent, created on first use."""
+        return self.agents.get("PageAssemblyAgent")
+    
+    def warm(self, pages: Optional[Iterable[str]] = None) -> None:
+        """
+        Create the agents that the given pages need before the first request.
+        
+        Long-lived servers call this once per worker so that no live request
+        pays for importing and building agents.
+        
+        Args:
+            pages: Page types to prepare for; defaults to all pages
+        """
+        page_types = resolve_pages(pages)
+        self.agents.get("ProductParserAgent")
+        for name in required_agents(page_types):
+            self.agents.get(name)
+        for page_type in page_types:
+            for name in DERIVED_AGENTS.get(page_type, ()):
+                self.agents.get(name)
+        self.agents.get("PageAssemblyAgent")
+    
+    def add_page_observer(self, observer: PageObserver) -> None:
+        """
+        Register a callback invoked with every page delivered to a caller.
+        
+        Observers see the pages returned by generate_pages() and
+        iter_pages() and the valid pages of generate_batch(), once per
+        pipeline run: callers coalesced into one run are reported once.
+        Pending placeholders are not reported. An observer that raises is
+        logged and skipped; it never fails the run or its callers.
+        
+        Args:
+            observer: Called with (page_type, page); must not mutate the page
+        """
+        self._page_observers = self._page_observers + [observer]
+    
+    def _notify_page(self, page_type: str, page: Dict[str, Any]) -> None:
+        """Pass a delivered page to the page observers."""
+        if not is_pending(page):
+            for observer in self._page_observers:
+                try:
+                    observer(page_type, page)
+                except Exception:
+                    logger.exception("Page observer %r failed on the %s page", observer, page_type)
+    
+    def execute(
+        self,
+        raw_product_data: Dict[str, Any],
+        output_dir: str = "outputs",
+        timeout: Optional[float] = None,
+        agent_timeouts: Optional[Dict[str, float]] = None,
+        pages: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
         """
         Execute the complete pipeline.
         
         Args:
             raw_product_data: Raw JSON product data
             output_dir: Directory to save output files
+            timeout: Total budget in seconds for the run
+            agent_timeouts: Per-agent budgets in seconds, keyed by agent class name
+            pages: Page types to generate, e.g. {"faq"}; only the agents
+                those pages depend on are run. Defaults to all pages.
             
         Returns:
             Dictionary with paths to generated output files
+            
+        Raises:
+            DeadlineExceededError: If a required agent misses its budget
+            ValueError: If an unknown page type is requested
+        """
+        with self.instrumentation.stage("execute", "pipeline"):
+            generated = self.generate_pages(raw_product_data, timeout, agent_timeouts, pages)
+            return self.save_pages(generated, output_dir)
+    
+    def generate_pages(
+        self,
+        raw_product_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        agent_timeouts: Optional[Dict[str, float]] = None,
+        pages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the agents and assemble pages without writing them to disk.
+        
+        Agents hold no per-request state, so a single orchestrator can
+        serve concurrent calls from multiple threads. Concurrent calls for
+        the same normalized product are coalesced into one run and all
+        receive the same page dictionaries, which must not be mutated.
+        
+        With a timeout or agent budgets, content agents run concurrently.
+        A page whose optional agent misses its budget is returned as a
+        pending placeholder (see ``deadline.pending_page``) while the other
+        pages are returned as usual.
+        
+        Args:
+            raw_product_data: Raw JSON product data
+            timeout: Total budget in seconds for the run
+            agent_timeouts: Per-agent budgets in seconds, keyed by agent class name
+            pages: Page types to generate; defaults to all pages
+            
+        Returns:
+            Dictionary mapping page type to assembled page
+            
+        Raises:
+            DeadlineExceededError: If a required agent misses its budget
+            ValueError: If an unknown page type is requested
+        """
+        deadline = Deadline(timeout)
+        agent_timeouts = agent_timeouts or {}
+        page_types = resolve_pages(pages)
+        
+        with self.instrumentation.stage("generate", "pages") as stage:
+            product = self._parse(raw_product_data)
+            fingerprint = product.fingerprint()
+            stage.set_attribute("product.hash", fingerprint[:16])
+            stage.set_attribute("product.ingredients", len(product.key_ingredients))
+            stage.set_attribute("product.benefits", len(product.benefits))
+            
+            # Stays False when this call waits on an identical in-flight run
+            ran_here = []
+            
+            key = fingerprint if page_types == ALL_PAGES else (fingerprint, page_types)
+            if timeout is None and not agent_timeouts:
+                compute = lambda: dict(self._iter_product_pages(product, page_types))
+            else:
+                key = (key, timeout, tuple(sorted(agent_timeouts.items())))
+                compute = lambda: self._generate_within_deadline(product, deadline, agent_timeouts, page_types)
+            
+            def run():
+                ran_here.append(True)
+                generated = compute()
+                for page_type, page in generated.items():
+                    self._notify_page(page_type, page)
+                return generated
+            
+            pages = self._in_flight.do(key, run)
+            stage.set_attribute("coalesced", not ran_here)
+            return pages
+    
+    def iter_pages(
+        self,
+        raw_product_data: Dict[str, Any],
+        pages: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Assemble pages one at a time, yielding each as soon as it is ready.
+        
+        Each page only waits for the agents it depends on, so the FAQ page
+        is available before the comparison agent has run. Its answers read
+        the product page's blocks, so when that page is also requested
+        those agents run first.
+        
+        Args:
+            raw_product_data: Raw JSON product data
+            pages: Page types to generate; defaults to all pages
+            
+        Yields:
+            Tuples of (page_type, assembled page)
         """
+        page_types = resolve_pages(pages)
         # Step 1: Parse raw data into ProductModel
-        product = self.parser_agent.parse(raw_product_data)
+        product = self._parse(raw_product_data)
+        for page_type, page in self._iter_product_pages(product, page_types):
+            self._notify_page(page_type, page)
+            yield page_type, page
+    
+    def generate_locales(
+        self,
+        raw_product_data: Dict[str, Any],
+        locales: Iterable[str],
+        pages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Generate pages in several locales from a single pipeline run.
+        
+        The content agents run once and return language-neutral blocks,
+        with text as message codes (see ``templates.localization``). Each
+        locale then only renders those blocks with its cached string table
+        and assembles its pages, so extra locales cost rendering, not
+        analysis.
+        
+        Args:
+            raw_product_data: Raw JSON product data
+            locales: Locale names, e.g. ["en", "hi"]
+            pages: Page types to generate; defaults to all pages
+            
+        Returns:
+            Dictionary mapping locale to a page type -> page dictionary;
+            each page's metadata records its locale
+            
+        Raises:
+            ValueError: If a locale or page type is unknown
+        """
+        page_types = resolve_pages(pages)
+        # Resolve every table first so an unknown locale fails before any work
+        tables = [get_string_table(locale) for locale in dict.fromkeys(locales)]
+        
+        with self.instrumentation.stage("generate", "locales") as stage:
+            stage.set_attribute("locales", len(tables))
+            product = self._parse(raw_product_data)
+            neutral = {
+                name: self._analyze(name, self.agents.get(name), product)
+                for name in required_agents(page_types)
+            }
+            # Where each block holds messages, found once for all locales
+            plans = {name: plan_localization(block) for name, block in neutral.items()}
+            
+            localized = {}
+            for table in tables:
+                with self.instrumentation.stage("localize", table.locale):
+                    blocks = {
+                        name: block if plans[name] is None else localize(block, table, plans[name])
+                        for name, block in neutral.items()
+                    }
+                pages_for_locale = {}
+                for page_type in page_types:
+                    page = self._assemble_page(page_type, product, blocks)
+                    page["metadata"]["locale"] = table.locale
+                    pages_for_locale[page_type] = page
+                localized[table.locale] = pages_for_locale
+            return localized
+    
+    def generate_batch(
+        self,
+        products: Iterable[Dict[str, Any]],
+        quarantine: Any,
+        pages: Optional[Iterable[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[int, Dict[str, Dict[str, Any]]]]:
+        """
+        Generate pages for many products, quarantining bad ones instead of raising.
         
-        # Step 2: Generate questions
-        questions = self.question_agent.generate(product)
+        Products are processed in chunks of ``batch_size``: their pages are
+        assembled without validation, then the whole chunk is validated in
+        one pass with PageAssemblyAgent.validate_batch. Each invalid page
+        is passed to ``quarantine.put`` with its structured errors, and a
+        product that cannot be parsed or generated is quarantined whole
+        (page_type None). Valid pages carry on downstream as usual.
         
-        # Step 3: Generate content blocks
-        benefits = self.benefits_agent.generate(product)
-        usage = self.usage_agent.generate(product)
-        safety = self.safety_agent.generate(product)
-        price = self.price_agent.generate(product)
+        Args:
+            products: Raw JSON product data, read lazily
+            quarantine: Sink with a ``put(record)`` method, such as
+                quarantine.MemoryQuarantine or quarantine.JsonlQuarantine
+            pages: Page types to generate; defaults to all pages
+            batch_size: Products assembled per validation pass
+            
+        Yields:
+            Tuples of (product index, valid pages by type) for each product
+            with at least one valid page
+            
+        Raises:
+            ValueError: If an unknown page type is requested
+        """
+        page_types = resolve_pages(pages)
+        chunk = []
+        for index, raw_product_data in enumerate(products):
+            chunk.append((index, raw_product_data))
+            if len(chunk) >= batch_size:
+                yield from self._generate_chunk(chunk, page_types, quarantine)
+                chunk = []
+        if chunk:
+            yield from self._generate_chunk(chunk, page_types, quarantine)
+    
+    def _generate_chunk(
+        self,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        page_types: Tuple[str, ...],
+        quarantine: Any
+    ) -> Iterator[Tuple[int, Dict[str, Dict[str, Any]]]]:
+        """Assemble a chunk of products, validate its pages together and route them."""
+        def reject(index: int, raw_product_data: Any, code: str, error: Exception) -> None:
+            name = raw_product_data.get("product_name", "") if isinstance(raw_product_data, dict) else ""
+            record = quarantine_record(
+                index, str(name).strip(), None, [{"path": "", "code": code, "message": str(error)}], raw_product_data
+            )
+            quarantine.put(record)
         
-        # Step 4: Generate comparison
-        comparison_data = self.comparison_agent.generate(product)
+        parsed = []
+        for index, raw_product_data in chunk:
+            try:
+                if not isinstance(raw_product_data, dict):
+                    raise ValueError("each product must be a JSON object")
+                parsed.append((index, raw_product_data, self._parse(raw_product_data)))
+            except Exception as e:
+                reject(index, raw_product_data, "parse", e)
         
-        # Step 5: Assemble pages
-        faq_page = self.assembly_agent.assemble_faq_page(
-            product.product_name,
-            questions
-        )
+        # Agents with a generate_batch() method run once for the whole chunk
+        products = [product for _, _, product in parsed]
+        blocks = {
+            name: self._run_agent_batch(name, self.agents.get(name), products)
+            for name in required_agents(page_types)
+        }
         
-        product_page = self.assembly_agent.assemble_product_page(
-            product.product_name,
-            benefits,
-            usage,
-            safety,
-            price
-        )
+        assembled = []
+        for position, (index, raw_product_data, product) in enumerate(parsed):
+            try:
+                # Every block of the product, so derived agents can use them all
+                product_blocks = {}
+                for name, agent_blocks in blocks.items():
+                    if not isinstance(agent_blocks[position], Exception):
+                        product_blocks[name] = agent_blocks[position]
+                product_pages = []
+                for page_type in page_types:
+                    for name in PAGE_DEPENDENCIES[page_type]:
+                        if name not in product_blocks:
+                            raise blocks[name][position]
+                    product_pages.append((page_type, self._assemble_page(page_type, product, product_blocks, False)))
+            except Exception as e:
+                reject(index, raw_product_data, "generate", e)
+                continue
+            assembled.append((index, product.product_name, product_pages))
+        
+        errors = iter(self.assembly_agent.validate_batch(
+            page for _, _, product_pages in assembled for page in product_pages
+        ))
+        for index, product_name, product_pages in assembled:
+            valid = {}
+            for page_type, page in product_pages:
+                page_errors = next(errors)
+                if page_errors:
+                    quarantine.put(quarantine_record(index, product_name, page_type, page_errors, page))
+                else:
+                    valid[page_type] = page
+                    self._notify_page(page_type, page)
+            if valid:
+                yield index, valid
+    
+    def _parse(self, raw_product_data: Dict[str, Any]) -> ProductModel:
+        """Parse raw data into a ProductModel and extract its shared feature view."""
+        with self.instrumentation.stage("parse", "ProductParserAgent"):
+            product = self.parser_agent.parse(raw_product_data)
+        # Once per product, before agents that may run concurrently read it
+        with self.instrumentation.stage("features", "ProductFeatures"):
+            product.extract_features()
+        return product
+    
+    def _iter_product_pages(
+        self,
+        product: ProductModel,
+        page_types: Tuple[str, ...] = ALL_PAGES,
+        validate: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the content agents for a parsed product, yielding pages in order.
+        
+        Each page waits for its own agents and for those of the requested
+        agents its derived blocks read, so the FAQ answers are the same
+        whether the pages are streamed or collected.
+        """
+        requested = required_agents(page_types)
+        # Blocks computed so far in this run; pages sharing an agent reuse its block
+        blocks = {}
+        # Steps 2-4: Run each page's agents, then assemble it (FAQ, product, comparison)
+        for page_type in page_types:
+            names = PAGE_DEPENDENCIES[page_type]
+            for derived in DERIVED_AGENTS.get(page_type, ()):
+                sources = self.agents.get(derived).agents
+                names += tuple(name for name in requested if name in sources)
+            for name in names:
+                if name not in blocks:
+                    blocks[name] = self._run_agent(name, self.agents.get(name), product)
+            yield page_type, self._assemble_page(page_type, product, blocks, validate)
+    
+    def _generate_within_deadline(
+        self,
+        product: ProductModel,
+        deadline: Deadline,
+        agent_timeouts: Dict[str, float],
+        page_types: Tuple[str, ...] = ALL_PAGES
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run content agents concurrently and assemble the pages ready in time."""
+        executor = self._get_executor()
+        futures = {}
+        for name in required_agents(page_types):
+            slots = self._agent_slots[name]
+            # Waiting for a slot, held by earlier runs still finishing past
+            # their deadlines, counts against the agent's budget
+            if not slots.acquire(timeout=deadline.remaining(agent_timeouts.get(name))):
+                self._skip_late_agent(name, futures)
+                continue
+            # Each task runs in a copy of the caller's context so spans nest correctly
+            future = executor.submit(
+                contextvars.copy_context().run, self._run_agent, name, self.agents.get(name), product
+            )
+            # Released once the run finishes, or is cancelled before starting
+            future.add_done_callback(lambda _, slots=slots: slots.release())
+            futures[name] = future
+        
+        blocks = {}
+        for name, future in futures.items():
+            try:
+                blocks[name] = future.result(timeout=deadline.remaining(agent_timeouts.get(name)))
+            except FutureTimeoutError:
+                # A running agent cannot be interrupted; its result is discarded
+                future.cancel()
+                self._skip_late_agent(name, futures)
         
-        comparison_page = self.assembly_agent.assemble_comparison_page(
-            comparison_data
+        pages = {}
+        for page_type in page_types:
+            missing = [name for name in PAGE_DEPENDENCIES[page_type] if name not in blocks]
+            if missing:
+                pages[page_type] = pending_page(page_type, missing)
+            else:
+                pages[page_type] = self._assemble_page(page_type, product, blocks)
+        return pages
+    
+    def _skip_late_agent(self, name: str, futures: Dict[str, Any]) -> None:
+        """Give up on an agent that missed its budget, failing the run if it is required."""
+        if name not in self.optional_agents:
+            for other in futures.values():
+                other.cancel()
+            raise DeadlineExceededError(f"{name} did not finish within its deadline")
+    
+    def _run_agent(self, name: str, agent: Any, product: ProductModel) -> Dict[str, Any]:
+        """Run one content agent under a timing stage."""
+        with self.instrumentation.stage("agent", name):
+            return agent.generate(product)
+    
+    def _analyze(self, name: str, agent: Any, product: ProductModel) -> Any:
+        """Run one content agent for its language-neutral block."""
+        with self.instrumentation.stage("agent", name):
+            analyze = getattr(agent, "analyze", None)
+            return analyze(product) if analyze is not None else agent.generate(product)
+    
+    def _run_agent_batch(self, name: str, agent: Any, products: List[ProductModel]) -> List[Any]:
+        """
+        Run one content agent over many products.
+        
+        Returns one block per product; a product the agent failed on gets
+        the exception instead, so one bad product does not fail the rest.
+        """
+        generate_batch = getattr(agent, "generate_batch", None)
+        if generate_batch is not None and products:
+            try:
+                with self.instrumentation.stage("agent", name) as stage:
+                    stage.set_attribute("products", len(products))
+                    return generate_batch(products)
+            except Exception:
+                # Retry one product at a time to isolate the failure
+                pass
+        results = []
+        for product in products:
+            try:
+                results.append(self._run_agent(name, agent, product))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _assemble_page(
+        self,
+        page_type: str,
+        product: ProductModel,
+        blocks: Dict[str, Dict[str, Any]],
+        validate: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Assemble one page from the content blocks of its agents.
+        
+        ``blocks`` is the run's shared context: blocks of the page's derived
+        agents are added to it, so they are computed once per run.
+        """
+        for name in DERIVED_AGENTS.get(page_type, ()):
+            if name not in blocks:
+                with self.instrumentation.stage("agent", name):
+                    blocks[name] = self.agents.get(name).generate(product, blocks)
+        # Step 6: Assemble pages
+        with self.instrumentation.stage("assemble", page_type):
+            return self._assemble_page_blocks(page_type, product, blocks, validate)
+    
+    def _assemble_page_blocks(
+        self,
+        page_type: str,
+        product: ProductModel,
+        blocks: Dict[str, Dict[str, Any]],
+        validate: bool = True
+    ) -> Dict[str, Any]:
+        """Call the assembly agent method for a page type."""
+        if page_type == "faq":
+            return self.assembly_agent.assemble_faq_page(
+                product.product_name,
+                blocks["QuestionGeneratorAgent"],
+                blocks["FAQAnswerAgent"],
+                validate=validate
+            )
+        if page_type == "product_page":
+            return self.assembly_agent.assemble_product_page(
+                product.product_name,
+                blocks["BenefitsAgent"],
+                blocks["UsageAgent"],
+                blocks["SafetyAgent"],
+                blocks["PriceAgent"],
+                validate=validate
+            )
+        return self.assembly_agent.assemble_comparison_page(
+            blocks["ComparisonAgent"],
+            validate=validate
         )
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool used for deadline-bounded runs."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="agent"
+                    )
+        return self._executor
+    
+    def save_pages(self, pages: Dict[str, Dict[str, Any]], output_dir: str = "outputs") -> Dict[str, str]:
+        """
+        Write assembled pages to JSON files.
         
-        # Step 6: Save outputs
+        Pending placeholders are written as well, so a downloaded file
+        always reflects the latest run.
+        
+        Args:
+            pages: Dictionary mapping page type to assembled page
+            output_dir: Directory to save output files
+            
+        Returns:
+            Dictionary with paths to generated output files
+        """
+        # Step 7: Save outputs
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
-        faq_path = output_path / "faq.json"
-        product_path = output_path / "product_page.json"
-        comparison_path = output_path / "comparison_page.json"
-        
-        with open(faq_path, 'w', encoding='utf-8') as f:
-            json.dump(faq_page, f, indent=2, ensure_ascii=False)
+        output_files = {}
+        for page_type, page in pages.items():
+            file_path = output_path / OUTPUT_FILENAMES[page_type]
+            with self.instrumentation.stage("write", page_type) as stage:
+                stage.set_attribute("bytes", _write_json_atomic(file_path, page))
+            output_files[page_type] = str(file_path)
         
-        with open(product_path, 'w', encoding='utf-8') as f:
-            json.dump(product_page, f, indent=2, ensure_ascii=False)
-        
-        with open(comparison_path, 'w', encoding='utf-8') as f:
-            json.dump(comparison_page, f, indent=2, ensure_ascii=False)
+        return output_files
+    
+    def save_locales(
+        self,
+        localized: Dict[str, Dict[str, Dict[str, Any]]],
+        output_dir: str = "outputs"
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Write the pages of each locale to ``<output_dir>/<locale>/``.
         
+        Args:
+            localized: Output of generate_locales()
+            output_dir: Directory holding one subdirectory per locale
+            
+        Returns:
+            Dictionary mapping locale to its page type -> file path
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
         return {
-            "faq": str(faq_path),
-            "product_page": str(product_path),
-            "comparison_page": str(comparison_path)
+            locale: self.save_pages(pages, str(Path(output_dir) / locale))
+            for locale, pages in localized.items()
         }
     
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get request coalescing counters for generate_pages().
+        
+        Returns:
+            Dictionary with requests, executions, coalesced and in_flight counts
+        """
+        return self._in_flight.stats()
+    
     def get_execution_flow(self) -> Dict[str, Any]:
         """
         Get the execution flow diagram.
@@ -140,13 +869,20 @@ class PipelineOrchestrator:
                 },
                 {
                     "step": 5,
+                    "agent": "FAQAnswerAgent",
+                    "input": "ProductModel + content_blocks",
+                    "output": "faq_answers (dict)",
+                    "description": "Answer FAQ questions from the computed content blocks"
+                },
+                {
+                    "step": 6,
                     "agent": "PageAssemblyAgent",
                     "input": "templates + content_blocks",
                     "output": "complete_pages (dict)",
                     "description": "Assemble final JSON pages"
                 },
                 {
-                    "step": 6,
+                    "step": 7,
                     "action": "Save outputs",
                     "input": "complete_pages",
                     "output": "JSON files",
@@ -163,7 +899,7 @@ class PipelineOrchestrator:
                     "PriceAgent",
                     "ComparisonAgent"
                 ],
-                "content_blocks": "PageAssemblyAgent",
+                "content_blocks": ["FAQAnswerAgent", "PageAssemblyAgent"],
                 "final_pages": "outputs/"
             }
         }
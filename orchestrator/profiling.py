@@ -0,0 +1,214 @@
+"""Sampling and deterministic profiling of pipeline runs, grouped by agent."""
+
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+AGENTS_DIR = PROJECT_ROOT / "agents"
+
+# Stack prefix for samples outside any agent
+PIPELINE_GROUP = "pipeline"
+
+
+@lru_cache(maxsize=None)
+def _classify_file(filename: str) -> Tuple[bool, Optional[str]]:
+    """
+    Classify a source file.
+
+    Returns:
+        Tuple of (is_project_file, agent_name); agent_name is derived from
+        the module name, e.g. agents/safety_agent.py -> SafetyAgent
+    """
+    path = Path(filename).resolve()
+    if path == Path(__file__).resolve():
+        return False, None
+    if path.parent == AGENTS_DIR and path.stem.endswith("_agent"):
+        return True, "".join(part.capitalize() for part in path.stem.split("_"))
+    return PROJECT_ROOT in path.parents, None
+
+
+def _frame_label(code) -> str:
+    """Flamegraph label for a code object."""
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the stacks of running threads.
+
+    Each sample is recorded as a collapsed stack prefixed with the agent
+    that was running (the outermost frame inside ``agents/``), or
+    ``pipeline`` when no agent was on the stack. Only stacks that pass
+    through project code are kept, so idle server threads do not drown out
+    the pipeline. Output is in the collapsed format read by flamegraph.pl
+    and speedscope.
+
+    While sampling, the interpreter's thread switch interval is lowered
+    well below the sampling interval; otherwise a busy thread would mostly
+    yield the GIL to the sampler at I/O calls and the samples would cluster
+    there. The switch interval is process-wide, so a server profiling its
+    live threads should leave it alone with ``lower_switch_interval=False``.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.001,
+        ignore_threads: Iterable[int] = (),
+        lower_switch_interval: bool = True
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+            ignore_threads: Thread idents never sampled, e.g. the caller
+                waiting on the profile
+            lower_switch_interval: Lower the interpreter's switch interval
+                while sampling, for more evenly spread samples
+        """
+        self.interval = interval
+        self._ignore = set(ignore_threads)
+        self.lower_switch_interval = lower_switch_interval
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stop.clear()
+        if self.lower_switch_interval:
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(self._switch_interval, self.interval / 10))
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own_ident)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Record the current stack of every sampled thread once."""
+        self._samples += 1
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude or ident in self._ignore:
+                continue
+
+            labels = []
+            agent = None
+            in_project = False
+            while frame is not None:
+                is_project, frame_agent = _classify_file(frame.f_code.co_filename)
+                in_project = in_project or is_project
+                # Walking leaf to root, so the last agent seen is the outermost
+                agent = frame_agent or agent
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+
+            if in_project:
+                labels.append(agent or PIPELINE_GROUP)
+                self._stacks[";".join(reversed(labels))] += 1
+
+    @property
+    def samples(self) -> int:
+        """Number of sampling passes taken."""
+        return self._samples
+
+    def collapsed(self) -> str:
+        """Render the recorded stacks in collapsed (folded) format."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self._stacks.items()))
+
+    def by_agent(self) -> Dict[str, int]:
+        """Sample counts per agent group, largest first."""
+        totals = Counter()
+        for stack, count in self._stacks.items():
+            totals[stack.split(";", 1)[0]] += count
+        return dict(totals.most_common())
+
+
+def agent_times(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Cumulative seconds spent in each agent according to cProfile stats.
+
+    An agent's time is the largest cumulative time of any function in its
+    module, which is its entry method.
+
+    Args:
+        stats: Stats of a profiled run
+
+    Returns:
+        Seconds per agent, largest first
+    """
+    times: Dict[str, float] = {}
+    for (filename, _, _), (_, _, _, cumulative, _) in stats.stats.items():
+        _, agent = _classify_file(filename)
+        if agent is not None:
+            times[agent] = max(times.get(agent, 0.0), cumulative)
+    return dict(sorted(times.items(), key=lambda item: item[1], reverse=True))
+
+
+def write_profile(
+    output_dir: Path,
+    profile: cProfile.Profile,
+    sampler: SamplingProfiler,
+    name: str = "pipeline"
+) -> List[Path]:
+    """
+    Write a profiled run's artifacts.
+
+    Args:
+        output_dir: Directory for this run
+        profile: Finished cProfile profile
+        sampler: Finished sampling profiler
+        name: Base file name
+
+    Returns:
+        Paths of the ``.prof`` stats, collapsed stacks and text summary
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    prof_path = output_dir / f"{name}.prof"
+    collapsed_path = output_dir / f"{name}.collapsed"
+    summary_path = output_dir / f"{name}.txt"
+
+    profile.dump_stats(str(prof_path))
+    collapsed_path.write_text(sampler.collapsed(), encoding='utf-8')
+
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        stats = pstats.Stats(profile, stream=f)
+        f.write("Cumulative seconds per agent:\n")
+        for agent, seconds in agent_times(stats).items():
+            f.write(f"  {agent:<28} {seconds:.6f}\n")
+        f.write(f"\nSamples per group ({sampler.samples} sampling passes):\n")
+        for group, count in sampler.by_agent().items():
+            f.write(f"  {group:<28} {count}\n")
+        f.write("\n")
+        stats.sort_stats("cumulative").print_stats(30)
+
+    return [prof_path, collapsed_path, summary_path]
@@ -0,0 +1,85 @@
+"""Sinks for pages and products that fail validation in batch runs."""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def quarantine_record(
+    index: int,
+    product_name: str,
+    page_type: Optional[str],
+    errors: List[Dict[str, str]],
+    page: Any = None
+) -> Dict[str, Any]:
+    """
+    Build a quarantine record.
+
+    Args:
+        index: Position of the product in the batch
+        product_name: Product name, empty if it could not be read
+        page_type: Rejected page type, or None when the whole product failed
+        errors: Structured ``{"path", "code", "message"}`` errors
+        page: The rejected page, or the raw product when page_type is None
+
+    Returns:
+        JSON-serializable record
+    """
+    return {
+        "index": index,
+        "product_name": product_name,
+        "page_type": page_type,
+        "errors": errors,
+        "page": page,
+        "quarantined_at": datetime.now().isoformat()
+    }
+
+
+class MemoryQuarantine:
+    """Keeps quarantined records in a list, for tests and API responses."""
+
+    def __init__(self):
+        """Initialize an empty quarantine."""
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Store one record."""
+        with self._lock:
+            self.records.append(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class JsonlQuarantine:
+    """
+    Appends quarantined records to a JSONL file, one record per line.
+
+    The file is rotated to ``<path>.1`` when it grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, path: str = "outputs/quarantine.jsonl", max_bytes: int = 50_000_000):
+        """
+        Initialize the sink.
+
+        Args:
+            path: JSONL file to append records to
+            max_bytes: Size at which the file is rotated
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Write one record."""
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
@@ -0,0 +1,717 @@
+"""In-process BM25 search over generated FAQ and product page content."""
+
+import heapq
+import math
+import string
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy every document stays in the Python buffer
+    np = None
+
+
+# Page types that are indexed, and the product page blocks whose text is
+SEARCHABLE_PAGES = ("faq", "product_page")
+PRODUCT_PAGE_BLOCKS = ("benefits", "usage", "safety")
+
+# BM25 parameters, as commonly used by search engines
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Documents collected in the Python buffer before it is sealed into a
+# NumPy segment; the buffer is scored in Python, so it is kept small
+DEFAULT_SEGMENT_SIZE = 2048
+
+# Segments of the same level merged into one of the next level
+MERGE_FACTOR = 10
+
+# Share of deleted documents at which a segment is rewritten without them
+MAX_DELETED_RATIO = 0.5
+
+# Segment documents are grouped into blocks of 2**BLOCK_SHIFT by number;
+# terms with more postings than a segment has blocks keep each block's
+# highest score, so queries skip blocks that cannot reach the top results
+BLOCK_SHIFT = 6
+
+# Segments whose query postings are fewer than this are scored in full
+MIN_PRUNED_POSTINGS = 16384
+
+# Blocks scored before the first threshold update; doubles every round
+FIRST_BLOCK_BATCH = 8
+
+# Relative slack on block bounds, covering float32 rounding of the scores
+_BOUND_SLACK = 1.0 + 1e-5
+
+# Punctuation turned into spaces before splitting text into words; a
+# translate() and split() are several times faster than a regex
+_SEPARATORS = str.maketrans({character: " " for character in string.punctuation + "\u2013\u2014\u2018\u2019\u201c\u201d\u2026\u2022"})
+
+STOPWORDS = frozenset(
+    "a an and any are as at be by can do does for from have how i if in is it my of on or should "
+    "the there this to what when where which while with you your".split()
+)
+
+# Document key: (page_type, product_name)
+DocumentKey = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text, without stopwords."""
+    return [token for token in text.lower().translate(_SEPARATORS).split() if token not in STOPWORDS]
+
+
+def term_counts(text: str) -> Tuple[Counter, int]:
+    """
+    Count the terms of a text as tokenize() splits it.
+
+    Returns:
+        Tuple of (count per term, number of terms)
+    """
+    tokens = text.lower().translate(_SEPARATORS).split()
+    counts = Counter(tokens)
+    length = len(tokens)
+    for stopword in STOPWORDS.intersection(counts):
+        length -= counts.pop(stopword)
+    return counts, length
+
+
+def _collect_text(value: Any, parts: List[str], keys: bool) -> None:
+    """Append the strings in a content block value; dict keys too when ``keys``."""
+    # Strings, the common leaves, are appended without a call
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if keys:
+                parts.append(key)
+            if isinstance(item, str):
+                parts.append(item)
+            else:
+                _collect_text(item, parts, True)
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, str):
+                parts.append(item)
+            else:
+                _collect_text(item, parts, True)
+    elif isinstance(value, str):
+        parts.append(value)
+
+
+def page_text(page_type: str, page: Dict[str, Any]) -> str:
+    """
+    Extract the searchable text of a page.
+
+    FAQ pages contribute their questions and answers, product pages the
+    benefits, usage and safety blocks. Field names such as
+    ``primary_benefits`` are left out; names held in nested keys, such as
+    benefit or skin type names, are kept.
+
+    Args:
+        page_type: "faq" or "product_page"
+        page: Assembled page
+
+    Returns:
+        Text to index, starting with the product name
+    """
+    parts = [page.get("product_name", "")]
+    if page_type == "faq":
+        for category in (page.get("questions") or {}).get("categories", {}).values():
+            parts.extend(category.get("questions", []))
+        for answers in (page.get("answers") or {}).values():
+            for answer in answers:
+                if answer:
+                    _collect_text(answer.get("answer"), parts, True)
+    else:
+        for block in PRODUCT_PAGE_BLOCKS:
+            _collect_text(page.get(block), parts, False)
+    return "\n".join(parts)
+
+
+class _Buffer:
+    """Recently added documents with dict postings, updated in place."""
+
+    def __init__(self):
+        self.keys: List[Optional[DocumentKey]] = []
+        self.lengths: List[int] = []
+        # Term counts per document, so deletes remove its postings exactly
+        self.terms: List[Optional[Counter]] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.live = 0
+
+    def add(self, key: DocumentKey, terms: Counter, length: int) -> int:
+        doc = len(self.keys)
+        self.keys.append(key)
+        self.lengths.append(length)
+        self.terms.append(terms)
+        postings = self.postings
+        for term, count in terms.items():
+            if term in postings:
+                postings[term][doc] = count
+            else:
+                postings[term] = {doc: count}
+        self.live += 1
+        return doc
+
+    def remove(self, doc: int) -> Tuple[Counter, int]:
+        terms = self.terms[doc]
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc]
+            if not postings:
+                del self.postings[term]
+        self.keys[doc] = None
+        self.terms[doc] = None
+        self.live -= 1
+        return terms, self.lengths[doc]
+
+
+class _Segment:
+    """
+    Sealed documents with postings in NumPy arrays.
+
+    Segments are immutable apart from deletes, which only mark a document
+    as no longer live until the segment is merged or compacted.
+
+    Block bounds are computed with the length normalization at sealing
+    time. Normalization only changes with the average document length:
+    a smaller one can raise a term's score by at most the ratio of the
+    two, so queries scale the bounds up by that ratio and stay exact.
+    """
+
+    __slots__ = ("keys", "page_types", "lengths", "live", "postings", "blocks", "deleted", "level", "_base", "_scale")
+
+    def __init__(
+        self,
+        keys: List[DocumentKey],
+        lengths: Any,
+        postings: Dict[str, Tuple[Any, Any]],
+        level: int,
+        base: float,
+        scale: float
+    ):
+        self.keys = keys
+        self.page_types = np.fromiter((SEARCHABLE_PAGES.index(key[0]) for key in keys), np.int8, len(keys))
+        self.lengths = np.asarray(lengths, dtype=np.float32)
+        self.live = np.ones(len(keys), dtype=bool)
+        # Term -> (document numbers ascending, term frequencies)
+        self.postings = postings
+        self.deleted = 0
+        self.level = level
+        # BM25 length normalization, base + scale * length, the bounds use
+        self._base = base
+        self._scale = scale
+
+        # Term -> (offset of each block's postings, highest term score
+        # factor in each block), for terms with postings in most blocks
+        self.blocks: Dict[str, Tuple[Any, Any]] = {}
+        block_count = self.block_count
+        boundaries = np.arange(block_count + 1, dtype=np.int64) << BLOCK_SHIFT
+        for term, (ids, frequencies) in postings.items():
+            if len(ids) <= block_count:
+                continue
+            offsets = np.searchsorted(ids, boundaries).astype(np.int32)
+            factors = frequencies / (frequencies + (base + scale * self.lengths[ids]))
+            maxima = np.zeros(block_count, dtype=np.float32)
+            filled = offsets[1:] > offsets[:-1]
+            maxima[filled] = np.maximum.reduceat(factors, offsets[:-1][filled])
+            self.blocks[term] = (offsets, maxima)
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    @property
+    def block_count(self) -> int:
+        return ((len(self.keys) - 1) >> BLOCK_SHIFT) + 1
+
+    def score(
+        self,
+        weights: List[Tuple[str, float]],
+        k1: float,
+        b: float,
+        inverse_average_length: float,
+        page_type: Optional[str],
+        limit: int,
+        threshold: float = 0.0
+    ) -> List[Tuple[float, DocumentKey]]:
+        """
+        Top ``limit`` live documents of the segment by BM25 score.
+
+        Documents scoring below ``threshold``, the lowest score already
+        among the results, are skipped. Documents tied with the last one
+        returned are all returned, so ties are broken by the caller.
+        """
+        base = k1 * (1 - b)
+        scale = k1 * b * inverse_average_length
+        terms = []
+        for term, idf in weights:
+            posting = self.postings.get(term)
+            if posting is not None:
+                terms.append((term, posting[0], posting[1], idf * (k1 + 1)))
+        if not terms:
+            return []
+
+        if sum(len(ids) for _, ids, _, _ in terms) < MIN_PRUNED_POSTINGS or scale <= 0:
+            ids, scores = self._score_all(terms, base, scale)
+            return self._top(ids, scores, page_type, limit, threshold)
+        return self._score_blocks(terms, base, scale, page_type, limit, threshold)
+
+    def _score_all(self, terms: List[Tuple[str, Any, Any, float]], base: float, scale: float) -> Tuple[Any, Any]:
+        """Score every document matching a term."""
+        matches = []
+        for _, ids, frequencies, factor in terms:
+            norms = base + scale * self.lengths[ids]
+            matches.append((ids, frequencies * factor / (frequencies + norms)))
+
+        # Sums are float64 in every path, so equal documents tie exactly
+        if len(matches) == 1:
+            ids, scores = matches[0]
+            return ids, scores.astype(np.float64)
+        if sum(len(ids) for ids, _ in matches) * 4 > self.size:
+            # Many matches: accumulate into a dense array; ids are unique per term
+            totals = np.zeros(self.size)
+            for term_ids, term_scores in matches:
+                totals[term_ids] += term_scores
+            ids = np.flatnonzero(totals)
+            return ids, totals[ids]
+        ids, inverse = np.unique(np.concatenate([ids for ids, _ in matches]), return_inverse=True)
+        return ids, np.bincount(inverse, weights=np.concatenate([scores for _, scores in matches]))
+
+    def _score_blocks(
+        self,
+        terms: List[Tuple[str, Any, Any, float]],
+        base: float,
+        scale: float,
+        page_type: Optional[str],
+        limit: int,
+        threshold: float
+    ) -> List[Tuple[float, DocumentKey]]:
+        """
+        Score the blocks that can reach the results, best bound first.
+
+        Blocks are scored in growing batches; after each batch the
+        threshold rises to the lowest score among the best ``limit`` so far,
+        and blocks bounded below it are never scored.
+        """
+        block_count = self.block_count
+        relax = max(1.0, self._scale / scale) * _BOUND_SLACK
+        bounds = np.zeros(block_count, dtype=np.float32)
+        sparse = []
+        for term, ids, frequencies, factor in terms:
+            blocks = self.blocks.get(term)
+            if blocks is not None:
+                bounds += blocks[1] * (factor * relax)
+            else:
+                # Few postings: score them all now and bound blocks exactly
+                scores = frequencies * factor / (frequencies + (base + scale * self.lengths[ids]))
+                term_bounds = np.zeros(block_count, dtype=np.float32)
+                np.maximum.at(term_bounds, ids >> BLOCK_SHIFT, scores * _BOUND_SLACK)
+                bounds += term_bounds
+                sparse.append((ids, scores))
+        dense = [
+            (ids, frequencies, factor, self.blocks[term][0])
+            for term, ids, frequencies, factor in terms if term in self.blocks
+        ]
+
+        order = np.argsort(-bounds, kind="stable")
+        order_bounds = bounds[order]
+        best_ids = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0)
+        start = 0
+        batch_size = FIRST_BLOCK_BATCH
+        span = 1 << BLOCK_SHIFT
+        while start < block_count and order_bounds[start] >= threshold and order_bounds[start] > 0:
+            if start * 8 >= block_count:
+                # Loose bounds, as for terms rarely found together: when a third
+                # of the blocks is still left to score, scoring all matches,
+                # which costs less per posting, is cheaper
+                remaining = int(np.searchsorted(-order_bounds, -threshold, side="right")) - start
+                if remaining * 3 > block_count:
+                    ids, scores = self._score_all(terms, base, scale)
+                    return self._top(ids, scores, page_type, limit, threshold)
+            batch = np.sort(order[start:start + batch_size])
+            batch = batch[bounds[batch] >= threshold]
+            start += batch_size
+            batch_size *= 2
+
+            # Batch-local document number: position of the block in the batch, then offset in the block
+            position = np.full(block_count, -1, dtype=np.int64)
+            position[batch] = np.arange(len(batch))
+            local_ids = []
+            local_scores = []
+            for ids, frequencies, factor, offsets in dense:
+                starts = offsets[batch]
+                counts = offsets[batch + 1] - starts
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # Postings indexes of the batch's blocks, one run per block
+                indexes = np.arange(total) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+                term_ids = ids[indexes]
+                term_frequencies = frequencies[indexes]
+                local_ids.append((position[term_ids >> BLOCK_SHIFT] << BLOCK_SHIFT) | (term_ids & (span - 1)))
+                local_scores.append(
+                    term_frequencies * factor / (term_frequencies + (base + scale * self.lengths[term_ids]))
+                )
+            for ids, scores in sparse:
+                in_batch = position[ids >> BLOCK_SHIFT]
+                keep = in_batch >= 0
+                local_ids.append((in_batch[keep] << BLOCK_SHIFT) | (ids[keep] & (span - 1)))
+                local_scores.append(scores[keep])
+
+            totals = np.bincount(
+                np.concatenate(local_ids), weights=np.concatenate(local_scores), minlength=len(batch) << BLOCK_SHIFT
+            )
+            local = np.flatnonzero(totals)
+            ids = (batch[local >> BLOCK_SHIFT] << BLOCK_SHIFT) | (local & (span - 1))
+            scores = totals[local]
+            keep = self.live[ids] & (scores >= threshold)
+            if page_type is not None:
+                keep &= self.page_types[ids] == SEARCHABLE_PAGES.index(page_type)
+            best_ids = np.concatenate([best_ids, ids[keep]])
+            best_scores = np.concatenate([best_scores, scores[keep]])
+            if len(best_ids) >= limit:
+                best_ids, best_scores = _top_with_ties(best_ids, best_scores, limit)
+                threshold = max(threshold, float(best_scores.min()))
+
+        keys = self.keys
+        return [(score, keys[doc]) for doc, score in zip(best_ids.tolist(), best_scores.tolist())]
+
+    def _top(
+        self,
+        ids: Any,
+        scores: Any,
+        page_type: Optional[str],
+        limit: int,
+        threshold: float
+    ) -> List[Tuple[float, DocumentKey]]:
+        """Best ``limit`` of scored documents that are live and of the page type."""
+        keep = self.live[ids] & (scores >= threshold)
+        if page_type is not None:
+            keep &= self.page_types[ids] == SEARCHABLE_PAGES.index(page_type)
+        ids, scores = _top_with_ties(ids[keep], scores[keep], limit)
+        keys = self.keys
+        return [(score, keys[doc]) for doc, score in zip(ids.tolist(), scores.tolist())]
+
+
+def _top_with_ties(ids: Any, scores: Any, limit: int) -> Tuple[Any, Any]:
+    """The ``limit`` highest scores, and any tied with the lowest of them."""
+    if len(ids) <= limit:
+        return ids, scores
+    lowest = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+    keep = scores >= lowest
+    return ids[keep], scores[keep]
+
+
+class SearchIndex:
+    """
+    Inverted index over FAQ and product pages, ranked with BM25.
+
+    Each product's FAQ and product page is one document, replaced when
+    the page is regenerated. New documents go to a small buffer with dict
+    postings. Full buffers are sealed into immutable segments whose
+    postings are NumPy arrays, so a query scores each term's postings in
+    a few array operations. Segments are merged ten at a time, as in
+    log-structured stores, which keeps their number logarithmic in the
+    corpus size. Queries visit segments largest first and pass on the
+    lowest score among the results so far, below which segments skip
+    whole blocks of documents. Replaced documents are only marked deleted in sealed
+    segments, and, as in Lucene, still count towards document
+    frequencies until their segment is merged or compacted. With
+    ``max_documents``, the least recently indexed documents are removed
+    to make room, so memory stays bounded however many products pass.
+
+    Safe for concurrent use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_documents: Optional[int] = None
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            segment_size: Documents buffered before sealing a segment
+            max_documents: Documents kept at most; beyond it the least
+                recently indexed are evicted. Unlimited when None.
+
+        Raises:
+            ValueError: If max_documents is not positive
+        """
+        if max_documents is not None and max_documents < 1:
+            raise ValueError("max_documents must be positive")
+        self.k1 = k1
+        self.b = b
+        self.segment_size = segment_size
+        self.max_documents = max_documents
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._buffer = _Buffer()
+        self._segments: List[_Segment] = []
+        # Key -> (segment, or None for the buffer, document number), least
+        # recently indexed first
+        self._locations: "OrderedDict[DocumentKey, Tuple[Optional[_Segment], int]]" = OrderedDict()
+        # Corpus statistics, including deleted documents not yet merged away
+        self._document_frequencies: Counter = Counter()
+        self._document_count = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def add_page(self, page_type: str, page: Dict[str, Any]) -> bool:
+        """
+        Index a page, replacing the product's earlier version of it.
+
+        Matches the PipelineOrchestrator page observer signature.
+
+        Args:
+            page_type: Page type; only SEARCHABLE_PAGES are indexed
+            page: Assembled page
+
+        Returns:
+            Whether the page was indexed
+        """
+        if page_type not in SEARCHABLE_PAGES or not page.get("product_name"):
+            return False
+        terms, length = term_counts(page_text(page_type, page))
+        key = (page_type, page["product_name"])
+        with self._lock:
+            self._remove(key)
+            self._locations[key] = (None, self._buffer.add(key, terms, length))
+            self._document_frequencies.update(terms.keys())
+            self._document_count += 1
+            self._total_length += length
+            if self.max_documents is not None:
+                while len(self._locations) > self.max_documents:
+                    self._remove(next(iter(self._locations)))
+                    self.evicted += 1
+            if np is not None and self._buffer.live >= self.segment_size:
+                self._seal()
+        return True
+
+    def add_pages(self, pages: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Index the searchable pages of one product.
+
+        Args:
+            pages: Pages keyed by page type, as from generate_pages()
+
+        Returns:
+            Number of pages indexed
+        """
+        return sum(self.add_page(page_type, page) for page_type, page in pages.items())
+
+    def remove(self, product_name: str, page_type: Optional[str] = None) -> int:
+        """
+        Remove a product's pages from the index.
+
+        Args:
+            product_name: Product whose pages to remove
+            page_type: Only remove this page type
+
+        Returns:
+            Number of pages removed
+        """
+        page_types = (page_type,) if page_type else SEARCHABLE_PAGES
+        with self._lock:
+            return sum(self._remove((kind, product_name)) for kind in page_types)
+
+    def search(self, query: str, limit: int = 10, page_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find the pages best matching a query.
+
+        Args:
+            query: Free text; stopwords are ignored
+            limit: Maximum number of results
+            page_type: Only return pages of this type
+
+        Returns:
+            Results by descending BM25 score, each with ``product_name``,
+            ``page_type`` and ``score``
+
+        Raises:
+            ValueError: If the page type is not searchable or limit is not positive
+        """
+        if page_type is not None and page_type not in SEARCHABLE_PAGES:
+            raise ValueError(f"Unsearchable page type: {page_type}; expected one of {', '.join(SEARCHABLE_PAGES)}")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        with self._lock:
+            if not terms or not self._locations:
+                return []
+            count = self._document_count
+            inverse_average_length = count / self._total_length if self._total_length else 0.0
+            weights = [
+                (term, math.log(1 + (count - frequency + 0.5) / (frequency + 0.5)))
+                for term, frequency in ((term, self._document_frequencies.get(term, 0)) for term in terms)
+                if frequency
+            ]
+            if not weights:
+                return []
+            candidates = self._score_buffer(weights, inverse_average_length, page_type)
+            threshold = 0.0
+            # Largest segments first, so the threshold rises early
+            for segment in sorted(self._segments, key=lambda segment: -segment.size):
+                if len(candidates) >= limit:
+                    # Keep the best candidates and any tied with the last of them
+                    threshold = heapq.nlargest(limit, [score for score, _ in candidates])[-1]
+                    candidates = [match for match in candidates if match[0] >= threshold]
+                candidates.extend(
+                    segment.score(weights, self.k1, self.b, inverse_average_length, page_type, limit, threshold)
+                )
+
+        best = heapq.nsmallest(limit, candidates, key=lambda match: (-match[0], match[1][1], match[1][0]))
+        return [
+            {"product_name": key[1], "page_type": key[0], "score": round(float(score), 4)}
+            for score, key in best
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Document, deleted, evicted document, term and segment counts."""
+        with self._lock:
+            return {
+                "documents": len(self._locations),
+                "deleted": sum(segment.deleted for segment in self._segments),
+                "evicted": self.evicted,
+                "terms": len(self._document_frequencies),
+                "segments": [segment.size for segment in self._segments],
+                "buffered": self._buffer.live
+            }
+
+    def _score_buffer(
+        self,
+        weights: List[Tuple[str, float]],
+        inverse_average_length: float,
+        page_type: Optional[str]
+    ) -> List[Tuple[float, DocumentKey]]:
+        """Score the buffered documents in Python."""
+        k1 = self.k1
+        base = k1 * (1 - self.b)
+        scale = k1 * self.b * inverse_average_length
+        lengths = self._buffer.lengths
+        scores: Dict[int, float] = {}
+        for term, idf in weights:
+            postings = self._buffer.postings.get(term)
+            if not postings:
+                continue
+            factor = idf * (k1 + 1)
+            for doc, frequency in postings.items():
+                scores[doc] = scores.get(doc, 0.0) + frequency * factor / (frequency + base + scale * lengths[doc])
+        keys = self._buffer.keys
+        return [
+            (score, keys[doc]) for doc, score in scores.items()
+            if page_type is None or keys[doc][0] == page_type
+        ]
+
+    def _normalization(self) -> Tuple[float, float]:
+        """BM25 length normalization as (base, scale per unit of length)."""
+        inverse_average_length = self._document_count / self._total_length if self._total_length else 0.0
+        return self.k1 * (1 - self.b), self.k1 * self.b * inverse_average_length
+
+    def _remove(self, key: DocumentKey) -> bool:
+        """Remove a document, if indexed; the lock must be held."""
+        location = self._locations.pop(key, None)
+        if location is None:
+            return False
+        segment, doc = location
+        if segment is None:
+            # Buffered documents are removed exactly, statistics included
+            terms, length = self._buffer.remove(doc)
+            frequencies = self._document_frequencies
+            for term in terms:
+                frequencies[term] -= 1
+                if not frequencies[term]:
+                    del frequencies[term]
+            self._document_count -= 1
+            self._total_length -= length
+        else:
+            segment.live[doc] = False
+            segment.deleted += 1
+            if segment.deleted > segment.size * MAX_DELETED_RATIO:
+                self._replace([segment], segment.level)
+        return True
+
+    def _seal(self) -> None:
+        """Turn the buffer into a segment and merge segments as needed."""
+        buffer = self._buffer
+        docs = [doc for doc, key in enumerate(buffer.keys) if key is not None]
+        numbers = {doc: number for number, doc in enumerate(docs)}
+        postings = {}
+        for term, term_postings in buffer.postings.items():
+            ids = np.fromiter((numbers[doc] for doc in term_postings), np.int32, len(term_postings))
+            frequencies = np.fromiter(term_postings.values(), np.float32, len(term_postings))
+            order = np.argsort(ids, kind="stable")
+            postings[term] = (ids[order], frequencies[order])
+        segment = _Segment(
+            [buffer.keys[doc] for doc in docs], [buffer.lengths[doc] for doc in docs], postings, 0, *self._normalization()
+        )
+        self._buffer = _Buffer()
+        self._segments.append(segment)
+        for number, key in enumerate(segment.keys):
+            self._locations[key] = (segment, number)
+
+        # Merge the newest segments while MERGE_FACTOR of them share a level
+        while len(self._segments) >= MERGE_FACTOR:
+            tail = self._segments[-MERGE_FACTOR:]
+            level = tail[-1].level
+            if any(segment.level != level for segment in tail):
+                break
+            self._replace(tail, level + 1)
+
+    def _replace(self, segments: List[_Segment], level: int) -> None:
+        """Merge segments into one without their deleted documents."""
+        keys: List[DocumentKey] = []
+        lengths = []
+        mappings = []
+        for segment in segments:
+            # Old document number -> merged number, or -1 when deleted
+            mapping = np.where(segment.live, np.cumsum(segment.live) - 1 + len(keys), -1).astype(np.int32)
+            mappings.append(mapping)
+            keys.extend(key for key, live in zip(segment.keys, segment.live.tolist()) if live)
+            lengths.append(segment.lengths[segment.live])
+            if segment.deleted:
+                # Deleted documents leave the corpus statistics now
+                dead = ~segment.live
+                for term, (ids, _) in segment.postings.items():
+                    removed = int(np.count_nonzero(dead[ids]))
+                    if removed:
+                        self._document_frequencies[term] -= removed
+                self._document_count -= segment.deleted
+                self._total_length -= int(segment.lengths[dead].sum())
+
+        parts: Dict[str, Tuple[List[Any], List[Any]]] = {}
+        for segment, mapping in zip(segments, mappings):
+            for term, (ids, frequencies) in segment.postings.items():
+                merged_ids = mapping[ids]
+                keep = merged_ids >= 0
+                if not keep.any():
+                    continue
+                id_parts, frequency_parts = parts.setdefault(term, ([], []))
+                id_parts.append(merged_ids[keep])
+                frequency_parts.append(frequencies[keep])
+        postings = {
+            term: (np.concatenate(id_parts), np.concatenate(frequency_parts))
+            for term, (id_parts, frequency_parts) in parts.items()
+        }
+        for term in [term for term, frequency in self._document_frequencies.items() if frequency <= 0]:
+            del self._document_frequencies[term]
+
+        position = self._segments.index(segments[0])
+        if not keys:
+            del self._segments[position:position + len(segments)]
+            return
+        merged = _Segment(keys, np.concatenate(lengths), postings, level, *self._normalization())
+        self._segments[position:position + len(segments)] = [merged]
+        for number, key in enumerate(keys):
+            self._locations[key] = (merged, number)
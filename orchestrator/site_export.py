@@ -0,0 +1,429 @@
+"""Static HTML export of generated pages, rendered incrementally across a process pool."""
+
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup
+
+from templates.localization import DEFAULT_LOCALE
+from .deadline import is_pending
+from .instrumentation import Instrumentation
+
+
+SITE_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "site"
+
+# Page type -> (HTML file in the product's directory, navigation label), in link order
+SITE_PAGES = {
+    "faq": ("faq.html", "FAQ"),
+    "product_page": ("product.html", "Product"),
+    "comparison_page": ("comparison.html", "Comparison")
+}
+
+MANIFEST_FILENAME = "manifest.json"
+SITEMAP_FILENAME = "sitemap.xml"
+INDEX_FILENAME = "index.html"
+
+# Bump when the manifest format changes; older manifests trigger a full rebuild
+MANIFEST_VERSION = 1
+
+# Pages sent to a worker per task. An export with fewer changed pages than
+# this is rendered in-process, since starting the pool would cost more
+RENDER_BATCH_SIZE = 32
+
+_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+MAX_SLUG_LENGTH = 80
+
+# A (file path, template name, page source) to render
+RenderTask = Tuple[str, str, str]
+
+
+def slugify(name: str) -> str:
+    """
+    Turn a product name into a directory name, e.g. "glowboost-vitamin-c-serum".
+
+    Long names are cut to MAX_SLUG_LENGTH and end in a hash of the full
+    name, so different long names still get different directories.
+    """
+    slug = _SLUG_PATTERN.sub("-", name.lower()).strip("-") or "product"
+    if len(slug) > MAX_SLUG_LENGTH:
+        suffix = hashlib.sha256(name.encode("utf-8")).hexdigest()[:8]
+        slug = f"{slug[:MAX_SLUG_LENGTH - 9].rstrip('-')}-{suffix}"
+    return slug
+
+
+def page_source(page: Dict[str, Any], links: List[Tuple[str, str]]) -> str:
+    """
+    Serialize what a page's HTML is rendered from.
+
+    The generation timestamp is left out, so a page regenerated with the
+    same content has the same source and content hash.
+
+    Args:
+        page: Assembled page
+        links: (label, href) navigation links to the product's other pages
+
+    Returns:
+        JSON text, the input of render tasks and of content_hash()
+    """
+    metadata = page.get("metadata")
+    if isinstance(metadata, dict) and "generated_at" in metadata:
+        page = dict(page, metadata={key: value for key, value in metadata.items() if key != "generated_at"})
+    return json.dumps({"page": page, "links": links}, ensure_ascii=False, separators=(",", ":"))
+
+
+def content_hash(source: str) -> str:
+    """SHA-256 of a page_source()."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def templates_hash(templates_dir: Path = SITE_TEMPLATES_DIR) -> str:
+    """SHA-256 over every site template; a change re-renders all pages."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(templates_dir).glob("*.html")):
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def label(key: str) -> str:
+    """Heading for a content block key, e.g. "Primary benefits" for "primary_benefits"."""
+    return key.replace("_", " ").capitalize()
+
+
+def _value_html(data: Any) -> str:
+    if isinstance(data, str):
+        return html.escape(data)
+    if isinstance(data, dict):
+        return "<dl>" + "".join(
+            f"<dt>{html.escape(label(key))}</dt><dd>{_value_html(item)}</dd>" for key, item in data.items()
+        ) + "</dl>"
+    if isinstance(data, list):
+        if not data:
+            return "&mdash;"
+        return "<ul>" + "".join(f"<li>{_value_html(item)}</li>" for item in data) + "</ul>"
+    if data is None:
+        return "&mdash;"
+    return html.escape(str(data))
+
+
+def value_html(data: Any) -> Markup:
+    """
+    Render a content block value: dicts as definition lists, lists as
+    bullet lists and everything else as escaped text.
+
+    A filter rather than a recursive template macro, which costs several
+    times more per nested value.
+    """
+    return Markup(_value_html(data))
+
+
+def create_environment(templates_dir: Path = SITE_TEMPLATES_DIR) -> Environment:
+    """
+    Create a Jinja environment with every site template compiled.
+
+    Templates are compiled here, once per process, and kept by the
+    environment for all pages rendered with it.
+    """
+    environment = Environment(
+        loader=FileSystemLoader(str(templates_dir)),
+        autoescape=True,
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        cache_size=-1
+    )
+    environment.filters["label"] = label
+    environment.filters["value"] = value_html
+    for name in environment.list_templates(extensions=["html"]):
+        environment.get_template(name)
+    return environment
+
+
+def render_page(environment: Environment, template: str, source: str) -> str:
+    """Render one page_source() to HTML."""
+    data = json.loads(source)
+    page = data["page"]
+    metadata = page.get("metadata") or {}
+    return environment.get_template(template).render(
+        page=page,
+        links=data["links"],
+        root="../",
+        lang=metadata.get("locale", DEFAULT_LOCALE)
+    )
+
+
+def _write_text_atomic(file_path: Path, text: str) -> int:
+    """
+    Write text via a temporary file so readers never see a partial page.
+
+    Returns:
+        Number of bytes written
+    """
+    data = text.encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+        return len(data)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _render_tasks(environment: Environment, tasks: List[RenderTask]) -> int:
+    """Render and write a batch of pages, returning the bytes written."""
+    written = 0
+    directories = set()
+    for file_path, template, source in tasks:
+        file_path = Path(file_path)
+        # A product's pages are queued together, so each directory is created once
+        if file_path.parent not in directories:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            directories.add(file_path.parent)
+        written += _write_text_atomic(file_path, render_page(environment, template, source))
+    return written
+
+
+# Environment of a pool worker, created by its initializer
+_worker_environment: Optional[Environment] = None
+
+
+def _init_worker(templates_dir: str) -> None:
+    """Compile the templates once in each worker process."""
+    global _worker_environment
+    _worker_environment = create_environment(Path(templates_dir))
+
+
+def _render_in_worker(tasks: List[RenderTask]) -> int:
+    return _render_tasks(_worker_environment, tasks)
+
+
+class SiteExporter:
+    """
+    Renders FAQ, product and comparison pages to a static HTML site.
+
+    Each product gets a directory named after it with one HTML file per
+    page. Builds are incremental: manifest.json records the content hash
+    of every page, and a page is re-rendered only when its hash changed
+    since the last build, its file is missing, or the templates changed.
+    Changed pages are rendered by a pool of worker processes, each
+    compiling the templates once, while the remaining products are still
+    being read. Every build also writes index.html and sitemap.xml.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "outputs/site",
+        base_url: str = "",
+        workers: Optional[int] = None,
+        templates_dir: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            output_dir: Directory of the site
+            base_url: Absolute URL the site is served from, for the
+                sitemap; sitemap entries are relative without it
+            workers: Rendering processes; defaults to the CPU count, and
+                0 or 1 renders in-process
+            templates_dir: Site templates; defaults to templates/site
+            instrumentation: Stage observers; a new one by default
+        """
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url.rstrip("/")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.templates_dir = Path(templates_dir) if templates_dir else SITE_TEMPLATES_DIR
+        self.instrumentation = instrumentation or Instrumentation()
+        self._environment: Optional[Environment] = None
+
+    @property
+    def environment(self) -> Environment:
+        """Templates for in-process rendering, compiled on first use."""
+        if self._environment is None:
+            self._environment = create_environment(self.templates_dir)
+        return self._environment
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """
+        Read the manifest of the last build.
+
+        Returns:
+            The manifest, or an empty one when there was no build yet
+        """
+        try:
+            with open(self.output_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"version": MANIFEST_VERSION, "templates": None, "pages": {}}
+
+    def export(self, products: Iterable[Dict[str, Dict[str, Any]]], prune: bool = True) -> Dict[str, Any]:
+        """
+        Build the site from the pages of each product.
+
+        Args:
+            products: For each product, its pages keyed by page type, as
+                returned by PipelineOrchestrator.generate_pages(); read
+                lazily. Pending placeholders are skipped.
+            prune: Delete pages of products no longer in ``products``
+
+        Returns:
+            Build summary with ``pages``, ``rendered``, ``unchanged`` and
+            ``removed`` counts, ``bytes`` rendered, and the paths of the
+            manifest, sitemap and index
+        """
+        with self.instrumentation.stage("export", "html") as stage:
+            previous = self.load_manifest()
+            template_hash = templates_hash(self.templates_dir)
+            reusable = previous.get("version") == MANIFEST_VERSION and previous.get("templates") == template_hash
+            previous_pages = previous.get("pages", {})
+            built_at = datetime.now().isoformat()
+
+            manifest_pages: Dict[str, Dict[str, Any]] = {}
+            index: List[Dict[str, Any]] = []
+            slugs = set()
+            rendered = 0
+            written = 0
+            pending: List[RenderTask] = []
+            futures: Deque[Any] = deque()
+            pool: Optional[ProcessPoolExecutor] = None
+
+            try:
+                for pages in products:
+                    pages = {page_type: page for page_type, page in pages.items()
+                             if page_type in SITE_PAGES and not is_pending(page)}
+                    if not pages:
+                        continue
+                    name = _product_name(pages)
+                    slug = base_slug = slugify(name)
+                    number = 2
+                    while slug in slugs:
+                        slug = f"{base_slug}-{number}"
+                        number += 1
+                    slugs.add(slug)
+
+                    links = [(label, filename) for page_type, (filename, label) in SITE_PAGES.items() if page_type in pages]
+                    index.append({"name": name, "links": [(label, f"{slug}/{href}") for label, href in links]})
+                    for page_type, page in pages.items():
+                        filename = SITE_PAGES[page_type][0]
+                        path = f"{slug}/{filename}"
+                        source = page_source(page, links)
+                        digest = content_hash(source)
+                        entry = previous_pages.get(path)
+                        if (reusable and entry and entry.get("hash") == digest
+                                and (self.output_dir / path).exists()):
+                            manifest_pages[path] = entry
+                            continue
+                        manifest_pages[path] = {
+                            "product": name, "page_type": page_type, "hash": digest, "updated_at": built_at
+                        }
+                        pending.append((str(self.output_dir / path), filename, source))
+                        rendered += 1
+                        if len(pending) >= RENDER_BATCH_SIZE and self.workers > 1:
+                            if pool is None:
+                                pool = ProcessPoolExecutor(
+                                    max_workers=self.workers,
+                                    initializer=_init_worker,
+                                    initargs=(str(self.templates_dir),)
+                                )
+                            futures.append(pool.submit(_render_in_worker, pending))
+                            pending = []
+                            # Bound the pages held in the queue for large catalogs
+                            while len(futures) > self.workers * 2:
+                                written += futures.popleft().result()
+
+                if pending:
+                    if pool is not None:
+                        futures.append(pool.submit(_render_in_worker, pending))
+                    else:
+                        written += _render_tasks(self.environment, pending)
+                while futures:
+                    written += futures.popleft().result()
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+
+            removed = self._prune(set(previous_pages) - set(manifest_pages)) if prune else 0
+            if not prune:
+                for path, entry in previous_pages.items():
+                    manifest_pages.setdefault(path, entry)
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "templates": template_hash,
+                "built_at": built_at,
+                "pages": dict(sorted(manifest_pages.items()))
+            }
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            index_path = self.output_dir / INDEX_FILENAME
+            sitemap_path = self.output_dir / SITEMAP_FILENAME
+            manifest_path = self.output_dir / MANIFEST_FILENAME
+            _write_text_atomic(index_path, self.environment.get_template(INDEX_FILENAME).render(
+                products=index, links=[], root="", lang=DEFAULT_LOCALE
+            ))
+            _write_text_atomic(sitemap_path, self._sitemap(manifest["pages"], built_at))
+            _write_text_atomic(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+            summary = {
+                "pages": len(manifest_pages),
+                "rendered": rendered,
+                "unchanged": len(manifest_pages) - rendered,
+                "removed": removed,
+                "bytes": written,
+                "manifest": str(manifest_path),
+                "sitemap": str(sitemap_path),
+                "index": str(index_path)
+            }
+            for key in ("pages", "rendered", "unchanged", "removed"):
+                stage.set_attribute(key, summary[key])
+            return summary
+
+    def _prune(self, paths: Iterable[str]) -> int:
+        """Delete pages dropped from the site, and product directories left empty."""
+        removed = 0
+        for path in paths:
+            file_path = self.output_dir / path
+            if file_path.exists():
+                file_path.unlink()
+                removed += 1
+            try:
+                file_path.parent.rmdir()
+            except OSError:
+                pass
+        return removed
+
+    def _sitemap(self, pages: Dict[str, Dict[str, Any]], built_at: str) -> str:
+        """Build sitemap.xml for the index and every page."""
+        prefix = f"{self.base_url}/" if self.base_url else ""
+        entries = [(INDEX_FILENAME, built_at)] + [(path, entry["updated_at"]) for path, entry in pages.items()]
+        urls = "".join(
+            f"  <url><loc>{escape(prefix + path)}</loc><lastmod>{updated_at[:10]}</lastmod></url>\n"
+            for path, updated_at in entries
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            f"{urls}</urlset>\n"
+        )
+
+
+def _product_name(pages: Dict[str, Dict[str, Any]]) -> str:
+    """Name of the product a set of pages belongs to."""
+    for page in pages.values():
+        name = page.get("product_name") or (page.get("product_a") or {}).get("name")
+        if name:
+            return name
+    return "product"
@@ -0,0 +1,266 @@
+"""Span-based tracing of pipeline runs with a local JSONL exporter."""
+
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "trace", "span_id", "parent_id", "name", "attributes",
+        "start_time", "duration", "error", "_started", "_token"
+    )
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration = None
+        self.error = None
+        self._started = time.perf_counter()
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        """Id of the trace this span belongs to."""
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to a JSON-serializable dictionary."""
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration * 1000, 4) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class _Trace:
+    """Spans collected for one root operation until it finishes."""
+
+    __slots__ = ("trace_id", "sampled", "spans", "lock")
+
+    def __init__(self, sampled: bool):
+        self.trace_id = uuid.uuid4().hex
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+
+
+class JsonlTraceExporter:
+    """
+    Appends finished traces to a JSONL file, one trace per line.
+
+    Recent traces are also kept in memory so they can be looked up without
+    reading the file. The file is rotated to ``<path>.1`` when it grows
+    beyond ``max_bytes``.
+    """
+
+    def __init__(self, path: str = "outputs/traces.jsonl", max_bytes: int = 50_000_000, keep_recent: int = 1000):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: JSONL file to append traces to
+            max_bytes: Size at which the file is rotated
+            keep_recent: Number of traces kept in memory for lookup
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.keep_recent = keep_recent
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        """Write one finished trace."""
+        line = json.dumps(trace, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._recent[trace["trace_id"]] = trace
+            while len(self._recent) > self.keep_recent:
+                self._recent.popitem(last=False)
+            if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a trace by id.
+
+        Args:
+            trace_id: Trace id
+
+        Returns:
+            The exported trace, or None if it was not sampled or has rotated out
+        """
+        with self._lock:
+            trace = self._recent.get(trace_id)
+        if trace is not None:
+            return trace
+
+        needle = f'"trace_id": "{trace_id}"'
+        for path in (self.path, self.path.with_name(self.path.name + ".1")):
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if needle in line:
+                        return json.loads(line)
+        return None
+
+
+class Tracer:
+    """
+    Creates spans and exports each finished trace according to sampling rules.
+
+    A trace is exported when it is picked by ``sample_rate``, when its root
+    span takes at least ``slow_threshold`` seconds, or when any span in it
+    failed. Spans are always recorded so that slow and failed traces can be
+    kept even if they were not sampled up front.
+    """
+
+    def __init__(
+        self,
+        exporter: Any,
+        sample_rate: float = 1.0,
+        slow_threshold: Optional[float] = None,
+        random_source: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Object with an export(trace_dict) method
+            sample_rate: Fraction of traces exported regardless of latency
+            slow_threshold: Root duration in seconds at or above which a
+                trace is always exported
+            random_source: Returns floats in [0, 1) for sampling decisions
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self._random = random_source
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """
+        Start a span as a child of the current span, or as a new trace root.
+
+        The span becomes the current span until end_span() is called.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            trace = _Trace(sampled=self._random() < self.sample_rate)
+            parent_id = None
+        else:
+            trace = parent.trace
+            parent_id = parent.span_id
+        span = Span(trace, name, parent_id, dict(attributes or {}))
+        span._token = _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """Finish a span, exporting its trace if it is the root."""
+        span.duration = time.perf_counter() - span._started
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        try:
+            _current_span.reset(span._token)
+        except ValueError:
+            # Ended from a different context than it was started in
+            _current_span.set(None)
+
+        trace = span.trace
+        with trace.lock:
+            trace.spans.append(span)
+        if span.parent_id is None:
+            self._finish_trace(trace, span)
+
+    def _finish_trace(self, trace: _Trace, root: Span) -> None:
+        """Apply the sampling rules and export the trace."""
+        failed = any(s.error for s in trace.spans)
+        slow = self.slow_threshold is not None and root.duration >= self.slow_threshold
+        if not (trace.sampled or slow or failed):
+            return
+        with trace.lock:
+            spans = [s.to_dict() for s in sorted(trace.spans, key=lambda s: s.start_time)]
+        self.exporter.export({
+            "trace_id": trace.trace_id,
+            "root": root.name,
+            "start_time": root.start_time,
+            "duration_ms": round(root.duration * 1000, 4),
+            "sampled_by": "rate" if trace.sampled else ("latency" if slow else "error"),
+            "spans": spans
+        })
+
+
+def current_span() -> Optional[Span]:
+    """Return the span active in the current context, if any."""
+    return _current_span.get()
+
+
+def build_span_tree(trace: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Nest a trace's spans under their parents.
+
+    Args:
+        trace: Exported trace dictionary
+
+    Returns:
+        Root spans, each with a ``children`` list
+    """
+    nodes = {span["span_id"]: dict(span, children=[]) for span in trace["spans"]}
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        (parent["children"] if parent is not None else roots).append(node)
+    return roots
+
+
+def format_span_tree(trace: Dict[str, Any]) -> str:
+    """
+    Render a trace as an indented text waterfall.
+
+    Args:
+        trace: Exported trace dictionary
+
+    Returns:
+        One line per span with its offset from the trace start and duration
+    """
+    lines = [f"trace {trace['trace_id']}  {trace['duration_ms']:.3f} ms  ({trace['sampled_by']})"]
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        offset = (node["start_time"] - trace["start_time"]) * 1000
+        attributes = " ".join(f"{k}={v}" for k, v in node["attributes"].items())
+        error = f"  ERROR {node['error']}" if node["error"] else ""
+        lines.append(
+            f"{'  ' * depth}{node['name']}  +{offset:.3f} ms  {node['duration_ms']:.3f} ms  {attributes}{error}".rstrip()
+        )
+        for child in node["children"]:
+            walk(child, depth + 1)
+
+    for root in build_span_tree(trace):
+        walk(root, 0)
+    return "\n".join(lines) + "\n"
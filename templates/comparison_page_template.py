@@ -1,6 +1,7 @@
 """Comparison page template definition."""
 
 from typing import Dict, Any
+from .schema import compile_error_collector, compile_validator, trusted_schema
 
 
 class ComparisonPageTemplate:
@@ -16,13 +17,8 @@ class ComparisonPageTemplate:
         """
         return {
             "template_name": "comparison_page",
-            "required_fields": [
-                "product_a",
-                "product_b",
-                "comparison_points",
-                "recommendation",
-                "metadata"
-            ],
+            # Declared once, in SCHEMA below
+            "required_fields": list(ComparisonPageTemplate.SCHEMA["required_fields"]),
             "optional_fields": [
                 "introduction",
                 "summary"
@@ -66,44 +62,24 @@ class ComparisonPageTemplate:
             ]
         }
     
-    @staticmethod
-    def validate(data: Dict[str, Any]) -> bool:
-        """
-        Validate data against template structure.
-        
-        Args:
-            data: Data to validate
-            
-        Returns:
-            True if valid, raises ValueError if invalid
-        """
-        structure = ComparisonPageTemplate.get_structure()
-        
-        # Check required fields
-        for field in structure["required_fields"]:
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-        
-        # Validate product objects
-        for product_key in ["product_a", "product_b"]:
-            if product_key in data:
-                product = data[product_key]
-                required_fields = ["name", "concentration", "price", "key_ingredients", "benefits", "skin_type"]
-                for field in required_fields:
-                    if field not in product:
-                        raise ValueError(f"{product_key}.{field} is required")
-        
-        # Validate comparison_points
-        if "comparison_points" in data:
-            comparison_points = data["comparison_points"]
-            if len(comparison_points) < 3:
-                raise ValueError("comparison_points must include at least 3 comparison categories")
-        
-        # Validate recommendation
-        if "recommendation" in data:
-            if not isinstance(data["recommendation"], str) or not data["recommendation"].strip():
-                raise ValueError("recommendation must be a non-empty string")
-        
-        return True
-
-
+    # Validation schema, compiled once into ComparisonPageTemplate.validate
+    SCHEMA = {
+        "required_fields": ["product_a", "product_b", "comparison_points", "recommendation", "metadata"],
+        "checks": [
+            {"path": "product_a", "message": "product_a.{key} is required",
+             "has_keys": ["name", "concentration", "price", "key_ingredients", "benefits", "skin_type"]},
+            {"path": "product_b", "message": "product_b.{key} is required",
+             "has_keys": ["name", "concentration", "price", "key_ingredients", "benefits", "skin_type"]},
+            {"path": "comparison_points", "min_length": 3,
+             "message": "comparison_points must include at least 3 comparison categories"},
+            {"path": "recommendation", "non_empty_string": True,
+             "message": "recommendation must be a non-empty string"}
+        ]
+    }
+    
+    validate = staticmethod(compile_validator(SCHEMA, "comparison_page"))
+    collect_errors = staticmethod(compile_error_collector(SCHEMA, "comparison_page"))
+    
+    # Rules still checked for pages from trusted agent versions
+    validate_trusted = staticmethod(compile_validator(trusted_schema(SCHEMA), "comparison_page_trusted"))
+    collect_trusted_errors = staticmethod(compile_error_collector(trusted_schema(SCHEMA), "comparison_page_trusted"))
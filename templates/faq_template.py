@@ -1,6 +1,7 @@
 """FAQ page template definition."""
 
 from typing import Dict, Any, List
+from .schema import compile_error_collector, compile_validator, trusted_schema
 
 
 class FAQTemplate:
@@ -16,14 +17,12 @@ class FAQTemplate:
         """
         return {
             "template_name": "faq_page",
-            "required_fields": [
-                "product_name",
-                "questions",
-                "metadata"
-            ],
+            # Declared once, in SCHEMA below
+            "required_fields": list(FAQTemplate.SCHEMA["required_fields"]),
             "optional_fields": [
                 "introduction",
-                "categories"
+                "categories",
+                "answers"
             ],
             "field_rules": {
                 "product_name": {
@@ -39,6 +38,11 @@ class FAQTemplate:
                         "categories": "object with category names as keys"
                     }
                 },
+                "answers": {
+                    "type": "object",
+                    "required": False,
+                    "description": "Per category, an answer per question (or null) with its content block source"
+                },
                 "metadata": {
                     "type": "object",
                     "required": True,
@@ -49,6 +53,10 @@ class FAQTemplate:
                 "questions": {
                     "source": "QuestionGeneratorAgent",
                     "required": True
+                },
+                "answers": {
+                    "source": "FAQAnswerAgent",
+                    "required": False
                 }
             },
             "validation_rules": [
@@ -57,36 +65,22 @@ class FAQTemplate:
             ]
         }
     
-    @staticmethod
-    def validate(data: Dict[str, Any]) -> bool:
-        """
-        Validate data against template structure.
-        
-        Args:
-            data: Data to validate
-            
-        Returns:
-            True if valid, raises ValueError if invalid
-        """
-        structure = FAQTemplate.get_structure()
-        
-        # Check required fields
-        for field in structure["required_fields"]:
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-        
-        # Validate questions structure
-        if "questions" in data:
-            questions = data["questions"]
-            if "total_count" not in questions:
-                raise ValueError("questions must have total_count")
-            if questions["total_count"] < 15:
-                raise ValueError("questions.total_count must be >= 15")
-            if "categories" not in questions:
-                raise ValueError("questions must have categories")
-            if len(questions["categories"]) < 3:
-                raise ValueError("questions.categories must have at least 3 categories")
-        
-        return True
-
-
+    # Validation schema, compiled once into FAQTemplate.validate
+    SCHEMA = {
+        "required_fields": ["product_name", "questions", "metadata"],
+        "checks": [
+            {"path": "questions", "has_keys": ["total_count"]},
+            {"path": "questions.total_count", "min": 15,
+             "message": "questions.total_count must be >= 15"},
+            {"path": "questions", "has_keys": ["categories"]},
+            {"path": "questions.categories", "min_length": 3,
+             "message": "questions.categories must have at least 3 categories"}
+        ]
+    }
+    
+    validate = staticmethod(compile_validator(SCHEMA, "faq_page"))
+    collect_errors = staticmethod(compile_error_collector(SCHEMA, "faq_page"))
+    
+    # Rules still checked for pages from trusted agent versions
+    validate_trusted = staticmethod(compile_validator(trusted_schema(SCHEMA), "faq_page_trusted"))
+    collect_trusted_errors = staticmethod(compile_error_collector(trusted_schema(SCHEMA), "faq_page_trusted"))
@@ -0,0 +1,336 @@
+"""
+Language-neutral messages and per-locale string tables.
+
+The text in the content blocks of the benefits, usage, safety, price and
+comparison agents is Message strings. They read as the default locale's
+text, and localize() renders them in any other locale from its string table.
+"""
+
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .question_templates import QuestionTemplateSet, compile_format_template
+
+
+LOCALES_DIR = Path(__file__).resolve().parent.parent / "data" / "locales"
+
+# Locale whose strings fill in messages missing from other locales
+DEFAULT_LOCALE = "en"
+
+_LOCALE_PATTERN = re.compile(r"^[a-z]{2,3}(-[A-Za-z0-9]{2,8})*$")
+
+
+class Renderable(ABC):
+    """A value in a content block that is turned into text per locale."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def render(self, table: "StringTable") -> Any:
+        """Render the value with a locale's string table."""
+
+
+class Message(str):
+    """
+    A message code with parameters, rendered from a locale's string table.
+
+    Agents put these in their content blocks instead of finished text, so a
+    block computed once can be rendered in any locale with localize(). A
+    message is also the string of its default-locale rendering, so blocks
+    are ready to use as they are in that locale and nothing has to be
+    walked on the default path.
+    """
+
+    def __new__(cls, code: str, **params: Any) -> "Message":
+        renderer = (_default_renderers or _default_table()._renderers)[code]
+        message = str.__new__(cls, renderer if type(renderer) is str else renderer(params))
+        message.code = code
+        message.params = params
+        return message
+
+    def __getnewargs_ex__(self):
+        # Copies and pickles are rebuilt from the code, not the text
+        return (self.code,), self.params
+
+    def render(self, table: "StringTable") -> str:
+        return table.format(self.code, self.params)
+
+
+class MessageList(str):
+    """Several messages rendered as one string, joined by the locale's separator."""
+
+    def __new__(cls, messages: List[Message], separator: str = "list.separator") -> "MessageList":
+        joined = str.__new__(cls, _default_table().format(separator, {}).join(messages))
+        joined.messages = messages
+        joined.separator = separator
+        return joined
+
+    def __getnewargs_ex__(self):
+        return (self.messages, self.separator), {}
+
+    def render(self, table: "StringTable") -> str:
+        return table.format(self.separator, {}).join(message.render(table) for message in self.messages)
+
+
+class _ConstantMessages(dict):
+    """Messages without parameters by code, each created once on first use."""
+
+    def __missing__(self, code: str) -> Message:
+        message = self[code] = Message(code)
+        return message
+
+
+# Messages are immutable, so those without parameters are shared: agents
+# use MESSAGES["code"] rather than building a new Message per product
+MESSAGES = _ConstantMessages()
+
+
+class LocalizedQuestions(Renderable):
+    """A product's questions block, rendered with the locale's question templates."""
+
+    __slots__ = ("product",)
+
+    def __init__(self, product: Any):
+        self.product = product
+
+    def render(self, table: "StringTable") -> Dict[str, Any]:
+        return table.questions.render(self.product)
+
+
+# Types whose instances localize() renders
+RENDERED_TYPES = (Message, MessageList, Renderable)
+
+
+def compile_messages(messages: Dict[str, str], locale: str = "") -> Dict[str, Any]:
+    """
+    Compile message templates into renderers.
+
+    Args:
+        messages: ``str.format`` template by message code
+        locale: Locale name, for error messages and tracebacks
+
+    Returns:
+        For each code, the text itself when it has no placeholders, or a
+        function rendering it from a dict of parameters with an f-string
+
+    Raises:
+        ValueError: If a template is malformed
+    """
+    renderers: Dict[str, Any] = {}
+    functions = []
+    for code, template in messages.items():
+        source, used = compile_format_template(template, kind=f"Message {code!r} ({locale})")
+        if not used:
+            renderers[code] = template.replace("{{", "{").replace("}}", "}")
+            continue
+        reads = [f"    {name} = params[{name!r}]" for name in used]
+        functions.append((code, f"def message_{len(functions)}(params):\n" + "\n".join(reads) + f"\n    return {source}\n"))
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(source for _, source in functions), f"<messages {locale}>", "exec"), namespace)
+    for number, (code, _) in enumerate(functions):
+        renderers[code] = namespace[f"message_{number}"]
+    return renderers
+
+
+class StringTable:
+    """
+    Message templates and question templates for one locale.
+
+    Messages use ``str.format`` placeholders and are compiled into f-string
+    functions when the table is built. Codes missing from the locale fall
+    back to the default locale's table, merged once at load time so a
+    lookup is a single dictionary access.
+    """
+
+    def __init__(self, locale: str, messages: Dict[str, str], questions: QuestionTemplateSet):
+        """
+        Initialize a string table.
+
+        Args:
+            locale: Locale name, e.g. "en" or "hi"
+            messages: Message template by code, including fallbacks
+            questions: Compiled question templates for the locale
+
+        Raises:
+            ValueError: If a message template is malformed
+        """
+        self.locale = locale
+        self.messages = messages
+        self.questions = questions
+        self._renderers = compile_messages(messages, locale)
+
+    def format(self, code: str, params: Dict[str, Any]) -> str:
+        """
+        Render one message.
+
+        Raises:
+            KeyError: If no locale defines the code or a parameter is missing
+        """
+        renderer = self._renderers[code]
+        return renderer if type(renderer) is str else renderer(params)
+
+
+def load_string_table(locale: str, fallback: Optional[StringTable] = None) -> StringTable:
+    """
+    Load a locale's strings from data/locales/<locale>.json.
+
+    The file has a ``messages`` object and, optionally, ``questions`` in
+    the format of data/question_templates.json; without them the fallback
+    locale's questions are used.
+
+    Args:
+        locale: Locale name
+        fallback: Table supplying messages and questions the locale lacks
+
+    Returns:
+        The locale's string table
+
+    Raises:
+        ValueError: If the locale name is invalid or has no strings file
+    """
+    if not _LOCALE_PATTERN.match(locale):
+        raise ValueError(f"Invalid locale: {locale!r}")
+    path = LOCALES_DIR / f"{locale}.json"
+    if not path.exists():
+        raise ValueError(f"Unsupported locale: {locale}; available: {', '.join(available_locales())}")
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    messages = dict(fallback.messages) if fallback else {}
+    messages.update(data.get("messages", {}))
+    if "questions" in data:
+        questions = QuestionTemplateSet(data["questions"].get("categories", {}))
+    elif fallback is not None:
+        questions = fallback.questions
+    else:
+        questions = QuestionTemplateSet.from_file()
+    return StringTable(locale, messages, questions)
+
+
+def available_locales() -> List[str]:
+    """Locales with a strings file, sorted by name."""
+    return sorted(path.stem for path in LOCALES_DIR.glob("*.json"))
+
+
+_tables: Dict[str, StringTable] = {}
+_tables_lock = threading.Lock()
+
+# Renderers of the default locale, read by every Message construction
+_default_renderers: Dict[str, Any] = {}
+
+
+def get_string_table(locale: str = DEFAULT_LOCALE) -> StringTable:
+    """
+    Get a locale's string table, loading it once per process.
+
+    Args:
+        locale: Locale name
+
+    Returns:
+        Cached string table
+
+    Raises:
+        ValueError: If the locale is invalid or unsupported
+    """
+    table = _tables.get(locale)
+    if table is None:
+        # Loaded before taking the lock, which is not reentrant
+        fallback = None if locale == DEFAULT_LOCALE else get_string_table(DEFAULT_LOCALE)
+        with _tables_lock:
+            table = _tables.get(locale)
+            if table is None:
+                table = _tables[locale] = load_string_table(locale, fallback)
+                if locale == DEFAULT_LOCALE:
+                    _default_renderers.update(table._renderers)
+    return table
+
+
+def _default_table() -> StringTable:
+    """String table of the default locale."""
+    return _tables.get(DEFAULT_LOCALE) or get_string_table(DEFAULT_LOCALE)
+
+
+# Values that never contain messages and are skipped without a call
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def plan_localization(block: Any) -> Any:
+    """
+    Find where a content block holds messages.
+
+    Args:
+        block: Content block from an agent's generate() or analyze()
+
+    Returns:
+        None when the block holds no messages, True when the block is one
+        itself, or a dict mapping each key or list index that leads to
+        messages to the plan for that value
+    """
+    kind = type(block)
+    if kind is dict:
+        values = block.values()
+        items = block.items()
+    elif kind is list:
+        values = block
+        items = enumerate(block)
+    else:
+        return True if isinstance(block, RENDERED_TYPES) else None
+    if _PLAIN_TYPES.issuperset(map(type, values)):
+        return None
+    plan = {}
+    for key, value in items:
+        kind = type(value)
+        # Messages and lists of plain values, such as product fields, are
+        # the common cases and are handled without a call
+        if kind is Message:
+            plan[key] = True
+            continue
+        if kind in _PLAIN_TYPES or (kind is list and _PLAIN_TYPES.issuperset(map(type, value))):
+            continue
+        child = plan_localization(value)
+        if child is not None:
+            plan[key] = child
+    return plan or None
+
+
+def localize(block: Any, table: StringTable, plan: Any = None) -> Any:
+    """
+    Render every message in a content block for a locale.
+
+    Only the dictionaries and lists on the way to a message are copied, so
+    one language-neutral block can be rendered into several locales and
+    everything else, such as product fields, is shared as it is. Pass the
+    block's plan_localization() when rendering it more than once so the
+    block is searched only once.
+
+    Args:
+        block: Content block from an agent's generate() or analyze()
+        table: String table of the target locale
+        plan: The block's plan_localization(); computed when omitted
+
+    Returns:
+        The block with messages replaced by plain text
+    """
+    if plan is None:
+        plan = plan_localization(block)
+        if plan is None:
+            return block
+    if plan is True:
+        if type(block) is Message:
+            return table.format(block.code, block.params)
+        return block.render(table)
+    copy = block.copy()
+    for key, child in plan.items():
+        value = block[key]
+        if child is True and type(value) is Message:
+            # Most values are plain messages; render them without a call
+            renderer = table._renderers[value.code]
+            copy[key] = renderer if type(renderer) is str else renderer(value.params)
+        else:
+            copy[key] = localize(value, table, child)
+    return copy
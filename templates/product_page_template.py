@@ -1,6 +1,7 @@
 """Product page template definition."""
 
 from typing import Dict, Any
+from .schema import compile_error_collector, compile_validator, trusted_schema
 
 
 class ProductPageTemplate:
@@ -16,14 +17,8 @@ class ProductPageTemplate:
         """
         return {
             "template_name": "product_page",
-            "required_fields": [
-                "product_name",
-                "benefits",
-                "usage",
-                "safety",
-                "price",
-                "metadata"
-            ],
+            # Declared once, in SCHEMA below
+            "required_fields": list(ProductPageTemplate.SCHEMA["required_fields"]),
             "optional_fields": [
                 "introduction",
                 "key_ingredients"
@@ -83,36 +78,22 @@ class ProductPageTemplate:
             ]
         }
     
-    @staticmethod
-    def validate(data: Dict[str, Any]) -> bool:
-        """
-        Validate data against template structure.
-        
-        Args:
-            data: Data to validate
-            
-        Returns:
-            True if valid, raises ValueError if invalid
-        """
-        structure = ProductPageTemplate.get_structure()
-        
-        # Check required fields
-        for field in structure["required_fields"]:
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-        
-        # Validate content blocks
-        content_blocks = ["benefits", "usage", "safety", "price"]
-        for block in content_blocks:
-            if not isinstance(data.get(block), dict) or not data[block]:
-                raise ValueError(f"{block} must be a non-empty object")
-        
-        # Validate price
-        if "price" in data and "price" in data["price"]:
-            price_value = data["price"]["price"]
-            if not isinstance(price_value, (int, float)) or price_value <= 0:
-                raise ValueError("price.price must be a positive number")
-        
-        return True
-
-
+    # Validation schema, compiled once into ProductPageTemplate.validate
+    SCHEMA = {
+        "required_fields": ["product_name", "benefits", "usage", "safety", "price", "metadata"],
+        "checks": [
+            {"path": "benefits", "non_empty_object": True, "message": "benefits must be a non-empty object"},
+            {"path": "usage", "non_empty_object": True, "message": "usage must be a non-empty object"},
+            {"path": "safety", "non_empty_object": True, "message": "safety must be a non-empty object"},
+            {"path": "price", "non_empty_object": True, "message": "price must be a non-empty object"},
+            {"path": "price.price", "positive_number": True, "if_present": True, "input": True,
+             "message": "price.price must be a positive number"}
+        ]
+    }
+    
+    validate = staticmethod(compile_validator(SCHEMA, "product_page"))
+    collect_errors = staticmethod(compile_error_collector(SCHEMA, "product_page"))
+    
+    # Rules still checked for pages from trusted agent versions
+    validate_trusted = staticmethod(compile_validator(trusted_schema(SCHEMA), "product_page_trusted"))
+    collect_trusted_errors = staticmethod(compile_error_collector(trusted_schema(SCHEMA), "product_page_trusted"))
@@ -0,0 +1,179 @@
+"""Question template sets compiled into render functions."""
+
+import json
+import string
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.product_model import ProductModel
+
+
+DEFAULT_TEMPLATES_PATH = Path(__file__).resolve().parent.parent / "data" / "question_templates.json"
+
+# Product fields a question template may reference, e.g. "{product_name}";
+# private fields such as the cached feature view are not product data
+TEMPLATE_FIELDS = frozenset(f.name for f in fields(ProductModel) if not f.name.startswith("_"))
+
+
+def compile_format_template(
+    template: str,
+    allowed_fields: Optional[Iterable[str]] = None,
+    kind: str = "Question"
+) -> Tuple[str, List[str]]:
+    """
+    Turn a ``str.format``-style template into f-string source.
+
+    The f-string reads each field from a local variable of the same name,
+    which the generated function must bind before evaluating it.
+
+    Args:
+        template: Template with named placeholders
+        allowed_fields: Field names the template may use; defaults to any
+            Python identifier
+        kind: What the template is, for error messages
+
+    Returns:
+        Tuple of (f-string source, fields it reads in first-use order)
+
+    Raises:
+        ValueError: If the template is not a string, is malformed or names
+            an unknown field
+    """
+    if not isinstance(template, str):
+        raise ValueError(f"{kind} template {template!r} must be a string")
+    text = []
+    used = []
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid {kind.lower()} template {template!r}: {e}")
+    for literal, field, spec, conversion in parsed:
+        text.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if allowed_fields is not None and field not in allowed_fields:
+            raise ValueError(
+                f"{kind} template {template!r} references unknown field {field!r}; "
+                f"expected one of {', '.join(sorted(allowed_fields))}"
+            )
+        if not field.isidentifier() or field in ("data", "params", "product", "products"):
+            raise ValueError(f"{kind} template {template!r} has an invalid field {field!r}")
+        if spec and ("{" in spec or "}" in spec):
+            raise ValueError(f"{kind} template {template!r} has a nested format spec")
+        if conversion and conversion not in ("r", "s", "a"):
+            raise ValueError(f"{kind} template {template!r} has an invalid conversion !{conversion}")
+        if field not in used:
+            used.append(field)
+        text.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "f" + repr("".join(text)), used
+
+
+class QuestionTemplateSet:
+    """
+    Categorized question templates, compiled once into render functions.
+
+    Templates use ``str.format`` placeholders for ProductModel fields. The
+    whole set is compiled into a single function that builds the structured
+    questions block for a product with one f-string per question, and a
+    batch variant that loops over many products inside the compiled code.
+    Category and total counts are fixed by the set, so they are computed
+    once here rather than per product.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, List[str]],
+        answers: Optional[Dict[str, List[Optional[str]]]] = None
+    ):
+        """
+        Compile a template set.
+
+        Args:
+            categories: Question templates keyed by category, in output order
+            answers: For each category, the content block field answering
+                each question, e.g. "safety.safety_level", or None for a
+                question without one; see FAQAnswerAgent
+
+        Raises:
+            ValueError: If the set is empty, a template is invalid or the
+                answers do not line up with the questions
+        """
+        if not categories or not all(isinstance(templates, list) for templates in categories.values()):
+            raise ValueError("Question templates must map each category to a list of templates")
+        self.categories = {category: list(templates) for category, templates in categories.items()}
+        self.counts = {category: len(templates) for category, templates in self.categories.items()}
+        self.total_count = sum(self.counts.values())
+        self.answers = {category: list(sources) for category, sources in (answers or {}).items()}
+        for category, sources in self.answers.items():
+            if len(sources) != self.counts.get(category):
+                raise ValueError(f"Answers for {category!r} must list one source per question")
+        self._render, self._render_batch, self.source = self._compile()
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "QuestionTemplateSet":
+        """
+        Load and compile a template set from JSON.
+
+        Args:
+            path: JSON file with a ``categories`` object and, optionally,
+                ``answers``; defaults to data/question_templates.json
+
+        Returns:
+            Compiled template set
+        """
+        with open(path or DEFAULT_TEMPLATES_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get("categories", {}), data.get("answers"))
+
+    def _compile(self) -> Tuple[Callable, Callable, str]:
+        """Generate and compile the render and batch render functions."""
+        used: List[str] = []
+        categories = []
+        for category, templates in self.categories.items():
+            questions = []
+            for template in templates:
+                source, template_fields = compile_format_template(template, TEMPLATE_FIELDS)
+                questions.append(source)
+                used.extend(f for f in template_fields if f not in used)
+            categories.append(
+                f"{category!r}: {{'count': {self.counts[category]}, 'questions': [{', '.join(questions)}]}}"
+            )
+        block = f"{{'total_count': {self.total_count}, 'categories': {{{', '.join(categories)}}}}}"
+        reads = [f"{name} = product.{name}" for name in used]
+
+        source = "\n".join(
+            ["def render(product):"]
+            + [f"    {line}" for line in reads]
+            + [f"    return {block}", "", "def render_batch(products):", "    blocks = []", "    append = blocks.append",
+               "    for product in products:"]
+            + [f"        {line}" for line in reads]
+            + [f"        append({block})", "    return blocks", ""]
+        )
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, "<question templates>", "exec"), namespace)
+        return namespace["render"], namespace["render_batch"], source
+
+    def render(self, product: ProductModel) -> Dict[str, Any]:
+        """
+        Render the questions block for one product.
+
+        Args:
+            product: ProductModel instance
+
+        Returns:
+            Dictionary with total_count and per-category count and questions
+        """
+        return self._render(product)
+
+    def render_batch(self, products: Iterable[ProductModel]) -> List[Dict[str, Any]]:
+        """
+        Render the questions blocks for many products.
+
+        Args:
+            products: ProductModel instances
+
+        Returns:
+            One questions block per product, in order
+        """
+        return self._render_batch(products)
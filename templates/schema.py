@@ -0,0 +1,183 @@
+"""Compilation of declarative page schemas into validator functions."""
+
+from typing import Any, Callable, Dict, List
+
+
+# Check kinds understood by compile_validator, in the form {kind: argument}
+CHECK_KINDS = (
+    "has_keys", "min", "min_length", "non_empty_object", "positive_number", "non_empty_string"
+)
+
+
+def _access(path: str) -> str:
+    """Python expression reading a dotted path from ``data``."""
+    return "data" + "".join(f"[{key!r}]" for key in path.split("."))
+
+
+def _raise(code: str, path: str, message: str) -> str:
+    """Source line failing a strict validator."""
+    return f"raise ValueError({message!r})"
+
+
+def _collect(code: str, path: str, message: str) -> str:
+    """Source line recording an error in a collecting validator."""
+    return f"errors.append({{'path': {path!r}, 'code': {code!r}, 'message': {message!r}}})"
+
+
+def _path_guard(path: str, typed: bool = False) -> str:
+    """
+    Expression that is true when every key along a dotted path exists.
+
+    With ``typed``, each parent along the path must also be a dict.
+    """
+    parts = path.split(".")
+    guards = [f"{parts[0]!r} in data"]
+    for i in range(1, len(parts)):
+        parent = _access(".".join(parts[:i]))
+        if typed:
+            guards.append(f"isinstance({parent}, dict)")
+        guards.append(f"{parts[i]!r} in {parent}")
+    return " and ".join(guards)
+
+
+def _compile_check(check: Dict[str, Any], fail: Callable[[str, str, str], str] = _raise) -> List[str]:
+    """Generate the source lines for one check, failing with ``fail(code, path, message)``."""
+    path = check["path"]
+    value = _access(path)
+    message = check.get("message")
+    lines = []
+
+    if "has_keys" in check:
+        # A {key} placeholder in the message names the missing key
+        for key in check["has_keys"]:
+            text = (message or f"{path} must have {{key}}").format(key=key)
+            lines += [f"if {key!r} not in {value}:", f"    {fail('has_keys', f'{path}.{key}', text)}"]
+    elif "min" in check:
+        lines += [f"if {value} < {check['min']!r}:", f"    {fail('min', path, message)}"]
+    elif "min_length" in check:
+        lines += [f"if len({value}) < {check['min_length']!r}:", f"    {fail('min_length', path, message)}"]
+    elif check.get("non_empty_object"):
+        lines += [
+            f"if not isinstance(data.get({path!r}), dict) or not {value}:",
+            f"    {fail('non_empty_object', path, message)}"
+        ]
+    elif check.get("positive_number"):
+        lines += [
+            f"_value = {value}",
+            "if not isinstance(_value, (int, float)) or _value <= 0:",
+            f"    {fail('positive_number', path, message)}"
+        ]
+    elif check.get("non_empty_string"):
+        lines += [
+            f"if not isinstance({value}, str) or not {value}.strip():",
+            f"    {fail('non_empty_string', path, message)}"
+        ]
+    else:
+        raise ValueError(f"Unknown check for {path}; expected one of {', '.join(CHECK_KINDS)}")
+
+    if check.get("if_present"):
+        # Only check when every key along the path exists
+        lines = [f"if {_path_guard(path)}:"] + [f"    {line}" for line in lines]
+    return lines
+
+
+def _define(name: str, body: List[str], filename: str) -> Callable:
+    """Compile a one-argument function from its body lines."""
+    source = f"def {name}(data):\n" + "".join(f"    {line}\n" for line in body)
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, filename, "exec"), namespace)
+    function = namespace[name]
+    function.source = source
+    return function
+
+
+def compile_validator(schema: Dict[str, Any], name: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile a page schema into a validator function.
+
+    The schema is turned into straight-line Python once, so validating a
+    page costs only the checks themselves: no structure dictionaries are
+    built and no rules are interpreted per call.
+
+    Args:
+        schema: ``required_fields`` (checked first, in order) and an
+            ordered list of ``checks``. Each check has a dotted ``path``, a
+            ``message``, one kind from CHECK_KINDS and, optionally,
+            ``if_present`` to skip it when the path is missing and
+            ``input`` when its value comes from the product data (see
+            trusted_schema).
+        name: Schema name used for the function name
+
+    Returns:
+        Function that returns True for a valid page and raises ValueError
+        with the first problem otherwise
+    """
+    body = []
+    for field in schema["required_fields"]:
+        body += [f"if {field!r} not in data:", f"    raise ValueError({f'Missing required field: {field}'!r})"]
+    for check in schema.get("checks", ()):
+        body += _compile_check(check)
+    body.append("return True")
+
+    validator = _define(f"validate_{name}", body, f"<schema {name}>")
+    validator.__doc__ = f"Validate a page against the {name} schema; raises ValueError if invalid."
+    return validator
+
+
+def trusted_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a page schema to the rules that still apply to trusted pages.
+
+    A trusted agent version vouches for the structure of its output, not
+    for the product data passed through it, so the required fields are
+    kept along with the checks marked ``input``, whose values come from
+    that data.
+
+    Args:
+        schema: Page schema, as for compile_validator
+
+    Returns:
+        A schema of the same form with only those rules
+    """
+    return {
+        "required_fields": list(schema["required_fields"]),
+        "checks": [check for check in schema.get("checks", ()) if check.get("input")]
+    }
+
+
+def compile_error_collector(schema: Dict[str, Any], name: str) -> Callable[[Dict[str, Any]], List[Dict[str, str]]]:
+    """
+    Compile a page schema into a function that reports every problem.
+
+    Unlike compile_validator, nothing is raised: each failed check adds an
+    error and validation carries on. A check is skipped when its path is
+    missing or runs through a non-object, since that is already reported,
+    and a value of the wrong type is reported once with code ``type``.
+
+    Args:
+        schema: Page schema, as for compile_validator
+        name: Schema name used for the function name
+
+    Returns:
+        Function returning a list of ``{"path", "code", "message"}``
+        errors, empty for a valid page
+    """
+    body = ["errors = []"]
+    for field in schema["required_fields"]:
+        body += [f"if {field!r} not in data:", f"    {_collect('required', field, f'Missing required field: {field}')}"]
+    for check in schema.get("checks", ()):
+        path = check["path"]
+        lines = _compile_check(dict(check, if_present=False), _collect)
+        body += ["try:", f"    if {_path_guard(path, typed=True)}:"]
+        body += [f"        {line}" for line in lines]
+        # Several checks may read the same wrongly typed value; report it once
+        body += [
+            "except TypeError:",
+            f"    if not any(e['path'] == {path!r} and e['code'] == 'type' for e in errors):",
+            f"        {_collect('type', path, f'{path} has an invalid type')}"
+        ]
+    body.append("return errors")
+
+    collector = _define(f"collect_{name}_errors", body, f"<schema {name} errors>")
+    collector.__doc__ = f"List every problem with a page under the {name} schema."
+    return collector
@@ -52,6 +52,10 @@ def test_parser_agent():
         }
         product = parser.parse(test_data)
         assert isinstance(product, ProductModel)
+        
+        # List fields may also arrive as comma-separated strings
+        product = parser.parse(dict(test_data, skin_type="Oily, Dry ,"))
+        assert product.skin_type == ["Oily", "Dry"]
         print("[PASS] ProductParserAgent working correctly")
         return True
     except Exception as e:
@@ -202,6 +206,1431 @@ def test_agents():
         return False
 
 
+def test_shared_orchestrator():
+    """Test that one orchestrator serves concurrent requests."""
+    print("\nTesting Shared Orchestrator...")
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: orchestrator.generate_pages(product_data), range(8)
+            ))
+        
+        for pages in results:
+            assert set(pages) == {"faq", "product_page", "comparison_page"}
+            assert pages["faq"]["product_name"] == product_data["product_name"]
+        
+        print("[PASS] Shared orchestrator handled concurrent requests")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Shared orchestrator test failed: {e}")
+        return False
+
+
+def test_worker_warmup():
+    """Test that a newly forked server worker starts with every agent built."""
+    print("\nTesting Worker Warm-up...")
+    try:
+        import os
+        import tempfile
+        from agents.registry import AGENT_MODULES
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.environ['JOB_DB_PATH'] = str(Path(tmp_dir) / "jobs.db")
+            import app as web_app
+            try:
+                web_app.init_worker()
+                loaded = web_app.get_orchestrator().agents.loaded()
+                assert sorted(loaded) == sorted(AGENT_MODULES), loaded
+            finally:
+                os.environ.pop('JOB_DB_PATH', None)
+                if web_app._job_pool is not None:
+                    web_app._job_pool.stop()
+                web_app._job_queue = web_app._job_pool = None
+        
+        print("[PASS] init_worker() built every agent before serving")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Worker warm-up test failed: {e}")
+        return False
+
+
+def test_api_generate():
+    """Test the streaming JSON API with array and NDJSON request bodies."""
+    print("\nTesting JSON API...")
+    try:
+        import app as web_app
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        second = dict(product_data, product_name="Second Serum")
+        client = web_app.app.test_client()
+        
+        def records(response):
+            # Closing the response ends its request trace span
+            with response:
+                assert response.status_code == 200, response.status_code
+                assert response.mimetype == 'application/x-ndjson'
+                return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        
+        # A JSON array: one record per product, in order, then the summary
+        lines = records(client.post('/api/generate?pages=faq', json=[product_data, second]))
+        assert [(line["index"], line["success"]) for line in lines[:-1]] == [(0, True), (1, True)]
+        assert lines[1]["product_name"] == "Second Serum"
+        assert list(lines[0]["results"]) == ["faq"] and lines[0]["pending_pages"] == []
+        assert lines[-1] == {"done": True, "total": 2, "succeeded": 2, "failed": 0}
+        
+        # NDJSON: a bad product fails alone; a malformed line stops reading
+        body = "\n".join([json.dumps(product_data), json.dumps("not a product"), "{not json", json.dumps(second)])
+        lines = records(client.post('/api/generate?pages=faq', data=body, content_type='application/x-ndjson'))
+        assert [(line["index"], line["success"]) for line in lines[:-1]] == [(0, True), (1, False), (2, False)]
+        assert lines[1]["error"].startswith("Validation error")
+        assert lines[2]["error"].startswith("Invalid JSON")
+        assert lines[-1] == {"done": True, "total": 3, "succeeded": 1, "failed": 2}
+        
+        with client.post('/api/generate', data="not json", content_type='application/json') as response:
+            assert response.status_code == 400
+        
+        print("[PASS] JSON API streamed one record per product and a summary")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] JSON API test failed: {e}")
+        return False
+
+
+def test_progressive_pages():
+    """Test that pages are yielded one at a time, FAQ first."""
+    print("\nTesting Progressive Page Delivery...")
+    try:
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        pages = orchestrator.iter_pages(product_data)
+        
+        page_type, page = next(pages)
+        assert page_type == "faq" and page["questions"]["total_count"] >= 15
+        assert [page_type for page_type, _ in pages] == ["product_page", "comparison_page"]
+        
+        print("[PASS] Pages delivered progressively")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Progressive page test failed: {e}")
+        return False
+
+
+def test_request_coalescing():
+    """Test that identical concurrent generations share one pipeline run."""
+    print("\nTesting Request Coalescing...")
+    try:
+        import threading
+        import time
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        generate_questions = orchestrator.question_agent.generate
+        
+        def slow_generate(product):
+            time.sleep(0.2)
+            return generate_questions(product)
+        
+        orchestrator.question_agent.generate = slow_generate
+        
+        # Whitespace differences normalize to the same product
+        variants = [product_data, dict(product_data, product_name=f"  {product_data['product_name']} ")]
+        results = [None] * 6
+        
+        def run(i):
+            results[i] = orchestrator.generate_pages(variants[i % 2])
+        
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = orchestrator.get_coalescing_stats()
+        assert stats["requests"] == 6
+        assert stats["executions"] == 1 and stats["coalesced"] == 5
+        assert all(result is results[0] for result in results)
+        
+        print("[PASS] Identical concurrent requests were coalesced")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Request coalescing test failed: {e}")
+        return False
+
+
+def test_admission_control():
+    """Test that the admission controller queues, times out and sheds load."""
+    print("\nTesting Admission Control...")
+    try:
+        import threading
+        import time
+        from orchestrator.admission import AdmissionController
+        
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.1)
+        assert controller.acquire()
+        
+        def wait_until_queued():
+            while controller.stats()["queue_depth"] == 0:
+                time.sleep(0.001)
+        
+        # One caller may queue; it times out because the slot is never freed
+        waited = []
+        waiter = threading.Thread(target=lambda: waited.append(controller.acquire()))
+        waiter.start()
+        wait_until_queued()
+        
+        # The queue is full, so this caller is rejected immediately
+        assert not controller.acquire()
+        waiter.join()
+        assert waited == [False]
+        
+        # A queued caller is handed the slot when it is released
+        waiter = threading.Thread(target=lambda: waited.append(controller.acquire()))
+        waiter.start()
+        wait_until_queued()
+        controller.release()
+        waiter.join()
+        assert waited == [False, True]
+        controller.release()
+        
+        stats = controller.stats()
+        assert stats["active"] == 0 and stats["queue_depth"] == 0
+        assert stats["admitted"] == 2
+        assert stats["rejected_queue_full"] == 1 and stats["rejected_timeout"] == 1
+        
+        print("[PASS] Admission control bounded concurrency and shed load")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Admission control test failed: {e}")
+        return False
+
+
+def test_agent_deadlines():
+    """Test that a slow optional agent degrades its page instead of blocking."""
+    print("\nTesting Agent Deadlines...")
+    try:
+        import threading
+        import time
+        from orchestrator.deadline import DeadlineExceededError, is_pending
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        generate_comparison = orchestrator.comparison_agent.generate
+        
+        def slow_generate(product):
+            time.sleep(0.5)
+            return generate_comparison(product)
+        
+        orchestrator.comparison_agent.generate = slow_generate
+        
+        start = time.monotonic()
+        pages = orchestrator.generate_pages(product_data, timeout=2.0, agent_timeouts={"ComparisonAgent": 0.05})
+        assert time.monotonic() - start < 0.4
+        assert is_pending(pages["comparison_page"])
+        assert pages["comparison_page"]["missing_agents"] == ["ComparisonAgent"]
+        assert not is_pending(pages["faq"]) and not is_pending(pages["product_page"])
+        
+        # A run past its deadline keeps its agent's slot until it finishes, so
+        # a stuck agent holds at most max_agent_runs threads of the pool
+        bounded = PipelineOrchestrator(max_agent_runs=1)
+        unblock = threading.Event()
+        stuck_calls = []
+        
+        def stuck_generate(product):
+            stuck_calls.append(product)
+            unblock.wait(5)
+            return generate_comparison(product)
+        
+        bounded.comparison_agent.generate = stuck_generate
+        try:
+            for _ in range(3):
+                pages = bounded.generate_pages(product_data, timeout=2.0, agent_timeouts={"ComparisonAgent": 0.05})
+                assert is_pending(pages["comparison_page"]) and not is_pending(pages["product_page"])
+            assert len(stuck_calls) == 1
+        finally:
+            unblock.set()
+        bounded._get_executor().shutdown(wait=True)
+        
+        # Required agents that miss the total budget fail the run
+        orchestrator.price_agent.generate = slow_generate
+        try:
+            orchestrator.generate_pages(product_data, timeout=0.05)
+            print("[FAIL] Expected DeadlineExceededError")
+            return False
+        except DeadlineExceededError:
+            pass
+        
+        print("[PASS] Deadlines degraded optional pages and bounded latency")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Agent deadline test failed: {e}")
+        return False
+
+
+def test_artifact_cache():
+    """Test precompressed artifact caching and invalidation."""
+    print("\nTesting Artifact Cache...")
+    try:
+        import gzip
+        import tempfile
+        from orchestrator.artifact_cache import ArtifactCache
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "page.json"
+            path.write_text(json.dumps({"text": "x" * 2000}), encoding='utf-8')
+            
+            cache = ArtifactCache()
+            artifact = cache.get(path)
+            assert cache.get(path) is artifact
+            
+            body, etag = artifact.variant("gzip")
+            assert gzip.decompress(body) == artifact.body
+            assert etag != artifact.etag
+            
+            # Rewriting the file invalidates the cached entry
+            path.write_text(json.dumps({"text": "y" * 3000}), encoding='utf-8')
+            assert cache.get(path).etag != artifact.etag
+            
+            path.unlink()
+            assert cache.get(path) is None
+        
+        print("[PASS] Artifact cache served precompressed, revalidated entries")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Artifact cache test failed: {e}")
+        return False
+
+
+def test_pipeline_metrics():
+    """Test per-stage timing hooks and Prometheus exposition."""
+    print("\nTesting Pipeline Metrics...")
+    try:
+        import tempfile
+        from orchestrator.metrics import MetricsRegistry, PipelineMetrics
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        registry = MetricsRegistry()
+        pipeline_metrics = PipelineMetrics(registry)
+        orchestrator = PipelineOrchestrator()
+        orchestrator.instrumentation.add_observer(pipeline_metrics)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            orchestrator.execute(product_data, output_dir=tmp_dir)
+        
+        for stage, name in [
+            ("parse", "ProductParserAgent"),
+            ("agent", "ComparisonAgent"),
+            ("assemble", "faq"),
+            ("validate", "product_page"),
+            ("write", "comparison_page")
+        ]:
+            assert pipeline_metrics.durations.snapshot(stage, name)["count"] == 1
+        
+        text = registry.render()
+        assert "# TYPE pipeline_stage_duration_seconds histogram" in text
+        assert 'pipeline_stage_duration_seconds_bucket{stage="agent",name="PriceAgent",le="+Inf"} 1' in text
+        
+        # Worker processes label every sample with their pid, read at scrape time
+        import os
+        labelled = MetricsRegistry(process_label="pid")
+        labelled.counter("requests_total", "Requests.", ("route",)).inc("/")
+        labelled.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(0.5)
+        labelled.callback("queue", "Queue.", "gauge", lambda: [((), 2)])
+        pid = f'pid="{os.getpid()}"'
+        assert f'requests_total{{route="/",{pid}}} 1' in labelled.render()
+        assert f'latency_seconds_bucket{{le="1",{pid}}} 1' in labelled.render()
+        assert f'latency_seconds_count{{{pid}}} 1' in labelled.render()
+        assert f'queue{{{pid}}} 2' in labelled.render()
+        
+        print("[PASS] Pipeline stages timed and exported")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Pipeline metrics test failed: {e}")
+        return False
+
+
+def test_pipeline_tracing():
+    """Test span trees and sampling of pipeline traces."""
+    print("\nTesting Pipeline Tracing...")
+    try:
+        import tempfile
+        from orchestrator.tracing import JsonlTraceExporter, Tracer, build_span_tree
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            exporter = JsonlTraceExporter(str(Path(tmp_dir) / "traces.jsonl"), keep_recent=0)
+            orchestrator = PipelineOrchestrator()
+            orchestrator.instrumentation.set_tracer(Tracer(exporter, sample_rate=1.0))
+            orchestrator.execute(product_data, output_dir=tmp_dir)
+            
+            with open(exporter.path, 'r', encoding='utf-8') as f:
+                trace = json.loads(f.readline())
+            assert exporter.get(trace["trace_id"]) == trace
+            
+            (root,) = build_span_tree(trace)
+            assert root["name"] == "execute pipeline"
+            generate = root["children"][0]
+            assert generate["attributes"]["product.hash"] == orchestrator.parser_agent.parse(product_data).fingerprint()[:16]
+            child_names = [child["name"] for child in generate["children"]]
+            assert child_names[0] == "parse ProductParserAgent"
+            assert "agent ComparisonAgent" in child_names
+            assemble = next(child for child in generate["children"] if child["name"] == "assemble faq")
+            assert assemble["children"][0]["name"] == "validate faq"
+            assert [child["name"] for child in root["children"][1:]] == [
+                "write faq", "write product_page", "write comparison_page"
+            ]
+            
+            # Unsampled fast traces are dropped; slow ones are always kept
+            exported = []
+            
+            class ListExporter:
+                def export(self, trace):
+                    exported.append(trace)
+            
+            orchestrator.instrumentation.set_tracer(Tracer(ListExporter(), sample_rate=0.0, slow_threshold=60))
+            orchestrator.generate_pages(product_data)
+            assert exported == []
+            orchestrator.instrumentation.set_tracer(Tracer(ListExporter(), sample_rate=0.0, slow_threshold=0))
+            orchestrator.generate_pages(product_data)
+            assert exported[0]["sampled_by"] == "latency"
+        
+        # Exported traces are only served with the debug token
+        import app as web_app
+        client = web_app.app.test_client()
+        token = web_app.DEBUG_TOKEN
+        try:
+            web_app.DEBUG_TOKEN = None
+            with client.get('/debug/trace/unknown') as response:
+                assert response.status_code == 404 and response.get_json() == {"error": "Not found"}
+            web_app.DEBUG_TOKEN = "secret"
+            with client.get('/debug/trace/unknown') as response:
+                assert response.status_code == 401
+            with client.get('/debug/trace/unknown', headers={"Authorization": "Bearer secret"}) as response:
+                assert response.status_code == 404 and "sampled" in response.get_json()["error"]
+        finally:
+            web_app.DEBUG_TOKEN = token
+        
+        print("[PASS] Pipeline runs traced as span trees")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Pipeline tracing test failed: {e}")
+        return False
+
+
+def test_benchmark_suite():
+    """Test the synthetic catalog generator and regression gate."""
+    print("\nTesting Benchmark Suite...")
+    try:
+        from benchmarks.synthetic import generate_products
+        from benchmarks.run_benchmarks import compare, run_size
+        
+        catalog = list(generate_products(50, seed=7))
+        assert catalog == list(generate_products(50, seed=7))
+        assert catalog != list(generate_products(50, seed=8))
+        assert len({len(p["key_ingredients"]) for p in catalog}) > 3
+        
+        result = run_size(20, seed=7, with_writes=False, measure_memory=True)
+        assert result["end_to_end"]["calls"] == 20
+        assert result["stages"]["agent:ComparisonAgent"]["calls"] == 20
+        assert result["peak_memory_bytes"] > 0
+        
+        baseline = {"results": {"20": dict(result, wall_seconds=1.0)}}
+        assert compare({"results": {"20": result}}, baseline, 0.2) == []
+        slower = dict(result, end_to_end=dict(result["end_to_end"], p95_ms=result["end_to_end"]["p95_ms"] * 2))
+        assert compare({"results": {"20": slower}}, baseline, 0.2)
+        
+        print("[PASS] Benchmark suite generated catalogs and gated regressions")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Benchmark suite test failed: {e}")
+        return False
+
+
+def test_load_test_harness():
+    """Test the HTTP load-test harness against a fake sender."""
+    print("\nTesting Load Test Harness...")
+    try:
+        from benchmarks.load_test import LoadRun, parse_mix
+        
+        mix = parse_mix("generate=3,download=1")
+        assert mix == [("generate", 3), ("download", 1)]
+        try:
+            parse_mix("unknown=1")
+            assert False, "Unknown endpoint should be rejected"
+        except ValueError:
+            pass
+        
+        def fake_send(request, timeout):
+            return 503 if "/download/" in request.full_url else 200
+        
+        result = LoadRun("http://localhost", mix, concurrency=4, sender=fake_send).run(requests=200)
+        assert result["overall"]["calls"] == 200
+        assert result["endpoints"]["generate"]["error_rate"] == 0.0
+        assert result["endpoints"]["download"]["error_rate"] == 1.0
+        assert result["endpoints"]["download"]["status_counts"] == {"503": result["endpoints"]["download"]["calls"]}
+        assert result["overall"]["errors"] == result["endpoints"]["download"]["calls"]
+        
+        print("[PASS] Load test harness recorded latency and error rates per endpoint")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Load test harness test failed: {e}")
+        return False
+
+
+def test_profiling():
+    """Test per-agent profiling and the main.py profile mode."""
+    print("\nTesting Profiling...")
+    try:
+        import contextlib
+        import io
+        import tempfile
+        import main as main_module
+        from orchestrator.profiling import SamplingProfiler
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        # Take a sample from inside the pipeline so the result does not depend on timing
+        orchestrator = PipelineOrchestrator()
+        profiler = SamplingProfiler()
+        generate_safety = orchestrator.safety_agent.generate
+        
+        def sampled_generate(product):
+            profiler.sample()
+            return generate_safety(product)
+        
+        orchestrator.safety_agent.generate = sampled_generate
+        orchestrator.generate_pages(product_data)
+        assert profiler.samples == 1
+        stacks = profiler.collapsed().splitlines()
+        
+        # The server leaves the process-wide switch interval alone; the CLI lowers it
+        switch_interval = sys.getswitchinterval()
+        with SamplingProfiler(lower_switch_interval=False):
+            assert sys.getswitchinterval() == switch_interval
+        with SamplingProfiler():
+            assert sys.getswitchinterval() < switch_interval
+        assert sys.getswitchinterval() == switch_interval
+        assert any(line.startswith("pipeline;") and "generate_pages" in line for line in stacks)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                main_module.main(["--profile", tmp_dir, "--output-dir", tmp_dir, "--repeat", "2"])
+            (run_dir,) = [p for p in Path(tmp_dir).iterdir() if p.is_dir()]
+            assert sorted(p.name for p in run_dir.iterdir()) == [
+                "pipeline.collapsed", "pipeline.prof", "pipeline.txt"
+            ]
+            summary = (run_dir / "pipeline.txt").read_text(encoding='utf-8')
+            for agent in ("ComparisonAgent", "PageAssemblyAgent", "SafetyAgent", "ProductParserAgent"):
+                assert agent in summary, agent
+            assert "Cumulative time per agent" in out.getvalue()
+        
+        # The two profilers would distort each other, so they cannot be combined;
+        # and a run needs at least one repetition
+        for argv in (["--profile", "--memory-profile"], ["--repeat", "0"], ["--repeat", "-2"]):
+            try:
+                with contextlib.redirect_stderr(io.StringIO()):
+                    main_module.parse_args(argv)
+                assert False, f"{argv} should be rejected"
+            except SystemExit:
+                pass
+        
+        print("[PASS] Profiling grouped samples and cProfile time by agent")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Profiling test failed: {e}")
+        return False
+
+
+def test_memory_profiling():
+    """Test per-stage memory profiling with tracemalloc."""
+    print("\nTesting Memory Profiling...")
+    try:
+        import tracemalloc
+        from orchestrator.memory_profiling import MemoryProfiler
+        from benchmarks.run_benchmarks import run_size
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        profiler = MemoryProfiler(top_sites=3, site_calls=2)
+        orchestrator.instrumentation.set_memory_profiler(profiler)
+        with profiler:
+            for _ in range(5):
+                orchestrator.generate_pages(product_data)
+        assert not tracemalloc.is_tracing()
+        
+        report = profiler.report()
+        for key in ("parse:ProductParserAgent", "agent:QuestionGeneratorAgent", "agent:ComparisonAgent",
+                    "assemble:faq", "assemble:product_page", "validate:comparison_page"):
+            assert report[key]["calls"] == 5, key
+            assert report[key]["peak_bytes"] >= 0, key
+        
+        # Pages are returned, so assembly retains memory; sites point at the code
+        assert report["assemble:product_page"]["retained_bytes"] > 0
+        sites = report["agent:QuestionGeneratorAgent"]["top_sites"]
+        # Questions are rendered by code compiled from data/question_templates.json
+        assert sites and sites[0]["site"].startswith("<question templates>")
+        
+        # Profiling is opt-in and off by default
+        assert PipelineOrchestrator().instrumentation.memory_profiler is None
+        
+        result = run_size(5, seed=1, with_writes=False, measure_memory=False, memory_profile=True)
+        assert result["memory_stages"]["agent:PriceAgent"]["calls"] == 5
+        assert result["retained_after_run_bytes"] is not None
+        
+        print("[PASS] Memory profiling recorded retained and peak bytes per stage")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Memory profiling test failed: {e}")
+        return False
+
+
+def test_selective_pages():
+    """Test lazy agent loading and selective page generation."""
+    print("\nTesting Selective Page Generation...")
+    try:
+        import tempfile
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        orchestrator = PipelineOrchestrator()
+        assert orchestrator.agents.loaded() == []
+        
+        pages = orchestrator.generate_pages(product_data, pages={"faq"})
+        assert list(pages) == ["faq"]
+        assert sorted(orchestrator.agents.loaded()) == [
+            "FAQAnswerAgent", "PageAssemblyAgent", "ProductParserAgent", "QuestionGeneratorAgent"
+        ]
+        
+        # Order follows the pipeline, not the request
+        pages = orchestrator.generate_pages(product_data, pages=["comparison_page", "faq"])
+        assert list(pages) == ["faq", "comparison_page"]
+        assert "BenefitsAgent" not in orchestrator.agents.loaded()
+        
+        # Selected pages match the same pages from a full run, apart from timestamps
+        def content(page):
+            return {key: value for key, value in page.items() if key != "metadata"}
+        
+        full = PipelineOrchestrator().generate_pages(product_data)
+        assert content(pages["comparison_page"]) == content(full["comparison_page"])
+        
+        deadline_pages = orchestrator.generate_pages(product_data, timeout=5.0, pages={"product_page"})
+        assert list(deadline_pages) == ["product_page"]
+        assert content(deadline_pages["product_page"]) == content(full["product_page"])
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_files = orchestrator.execute(product_data, output_dir=tmp_dir, pages={"faq"})
+            assert list(output_files) == ["faq"]
+            assert [p.name for p in Path(tmp_dir).iterdir()] == ["faq.json"]
+        
+        try:
+            orchestrator.generate_pages(product_data, pages={"unknown"})
+            assert False, "Unknown page type should be rejected"
+        except ValueError:
+            pass
+        
+        print("[PASS] Selected pages ran only the agents they depend on")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Selective page generation test failed: {e}")
+        return False
+
+
+def test_compiled_validators():
+    """Test compiled template validators against the legacy ones, and trusted mode."""
+    print("\nTesting Compiled Validators...")
+    try:
+        import copy
+        from benchmarks.validation_benchmark import COMPILED_VALIDATORS, LEGACY_VALIDATORS
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        pages = PipelineOrchestrator().generate_pages(product_data)
+        
+        def outcome(validator, page):
+            try:
+                return validator(page)
+            except (ValueError, KeyError, TypeError) as e:
+                return f"{type(e).__name__}: {e}"
+        
+        # Each mutation breaks one rule; both validators must report it identically
+        mutations = {
+            "faq": [
+                lambda p: p.pop("questions"),
+                lambda p: p["questions"].pop("total_count"),
+                lambda p: p["questions"].update(total_count=3),
+                lambda p: p["questions"].update(categories={"a": [], "b": []})
+            ],
+            "product_page": [
+                lambda p: p.pop("usage"),
+                lambda p: p.update(safety={}),
+                lambda p: p["price"].update(price=0),
+                lambda p: p["price"].update(price="free")
+            ],
+            "comparison_page": [
+                lambda p: p["product_b"].pop("skin_type"),
+                lambda p: p.update(comparison_points=dict(list(p["comparison_points"].items())[:2])),
+                lambda p: p.update(recommendation="  ")
+            ]
+        }
+        for page_type, page in pages.items():
+            assert COMPILED_VALIDATORS[page_type](page) is True
+            for mutate in mutations[page_type]:
+                broken = copy.deepcopy(page)
+                mutate(broken)
+                expected = outcome(LEGACY_VALIDATORS[page_type], broken)
+                assert expected is not True, f"{page_type} mutation should be invalid"
+                assert outcome(COMPILED_VALIDATORS[page_type], broken) == expected
+        
+        # Trusted orchestrators skip the validate stage for known agent versions
+        validated = []
+        orchestrator = PipelineOrchestrator(trusted=True)
+        orchestrator.instrumentation.add_observer(
+            lambda stage, name, seconds, error: stage == "validate" and validated.append(name)
+        )
+        trusted_pages = orchestrator.generate_pages(product_data)
+        assert validated == []
+        assert list(trusted_pages) == list(pages)
+
+        # Trusted agents pass product data through, so a zero price still fails
+        free_product = dict(product_data, price=0)
+        orchestrator = PipelineOrchestrator(trusted=True)
+        try:
+            orchestrator.generate_pages(free_product, pages={"product_page"})
+            assert False, "trusted mode accepted a zero price"
+        except ValueError as e:
+            assert "price.price must be a positive number" in str(e)
+        from orchestrator.quarantine import MemoryQuarantine
+        quarantine = MemoryQuarantine()
+        results = list(orchestrator.generate_batch([free_product], quarantine))
+        assert [list(pages) for index, pages in results] == [["faq", "comparison_page"]]
+        assert [e["code"] for e in quarantine.records[0]["errors"]] == ["positive_number"]
+
+        # Only the requested pages' agents are checked, so no others are imported
+        from orchestrator import pipeline_orchestrator
+        checked = []
+        load = pipeline_orchestrator.load_agent_class
+        pipeline_orchestrator.load_agent_class = lambda name: checked.append(name) or load(name)
+        try:
+            PipelineOrchestrator(trusted=True).generate_pages(product_data, pages={"faq"})
+        finally:
+            pipeline_orchestrator.load_agent_class = load
+        assert "QuestionGeneratorAgent" in checked and "ComparisonAgent" not in checked
+        
+        orchestrator = PipelineOrchestrator()
+        orchestrator.instrumentation.add_observer(
+            lambda stage, name, seconds, error: stage == "validate" and validated.append(name)
+        )
+        orchestrator.generate_pages(product_data)
+        assert validated == ["faq", "product_page", "comparison_page"]
+        
+        print("[PASS] Compiled validators matched the legacy ones and trusted mode skipped validation")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Compiled validators test failed: {e}")
+        return False
+
+
+def test_batch_validation():
+    """Test batch generation that quarantines invalid pages and products."""
+    print("\nTesting Batch Validation...")
+    try:
+        import tempfile
+        from orchestrator.quarantine import JsonlQuarantine, MemoryQuarantine
+        from templates.faq_template import FAQTemplate
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        # Every problem is reported, not just the first
+        errors = FAQTemplate.collect_errors({"product_name": "X", "questions": {"total_count": 2, "categories": {}}})
+        assert [(e["path"], e["code"]) for e in errors] == [
+            ("metadata", "required"),
+            ("questions.total_count", "min"),
+            ("questions.categories", "min_length")
+        ]
+        assert FAQTemplate.collect_errors({"product_name": "X", "questions": 5, "metadata": {}})[0]["code"] == "type"
+        
+        products = [product_data, dict(product_data, price=0), "not a product", product_data]
+        quarantine = MemoryQuarantine()
+        orchestrator = PipelineOrchestrator()
+        results = list(orchestrator.generate_batch(products, quarantine, batch_size=3))
+        
+        # The zero price only invalidates the product page; the other pages continue
+        assert [(index, list(pages)) for index, pages in results] == [
+            (0, ["faq", "product_page", "comparison_page"]),
+            (1, ["faq", "comparison_page"]),
+            (3, ["faq", "product_page", "comparison_page"])
+        ]
+        records = sorted(quarantine.records, key=lambda r: r["index"])
+        assert [(r["index"], r["page_type"]) for r in records] == [(1, "product_page"), (2, None)]
+        assert records[0]["errors"] == [{
+            "path": "price.price",
+            "code": "positive_number",
+            "message": "price.price must be a positive number"
+        }]
+        assert records[1]["errors"][0]["code"] == "parse"
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sink = JsonlQuarantine(str(Path(tmp_dir) / "quarantine.jsonl"))
+            list(orchestrator.generate_batch(products, sink, pages={"product_page"}))
+            with open(sink.path, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            assert sorted((r["index"], r["page_type"] or "") for r in records) == [(1, "product_page"), (2, "")]
+        
+        print("[PASS] Invalid pages were quarantined with structured errors")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Batch validation test failed: {e}")
+        return False
+
+
+def test_question_templates():
+    """Test compiled question templates and batch question generation."""
+    print("\nTesting Question Templates...")
+    try:
+        from agents import ProductParserAgent, QuestionGeneratorAgent
+        from orchestrator.quarantine import MemoryQuarantine
+        from templates.question_templates import QuestionTemplateSet
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        product = ProductParserAgent().parse(product_data)
+        
+        agent = QuestionGeneratorAgent()
+        questions = agent.generate(product)
+        assert questions["total_count"] == 22
+        assert questions["categories"]["informational"]["questions"][0] == f"What is {product.product_name}?"
+        
+        templates = QuestionTemplateSet({
+            "pricing": ["Is {product_name} under {price:.0f}?", "Why {{braces}} in {product_name!r}?"],
+            "usage": ["How do I use {product_name}?"]
+        })
+        assert templates.counts == {"pricing": 2, "usage": 1} and templates.total_count == 3
+        block = QuestionGeneratorAgent(templates).generate(product)
+        assert block["categories"]["pricing"]["questions"] == [
+            f"Is {product.product_name} under 699?",
+            f"Why {{braces}} in {product.product_name!r}?"
+        ]
+        
+        for bad in (
+            {"x": ["{unknown}"]}, {"x": ["{_features}"]}, {"x": ["{product_name"]},
+            {"x": ["{product_name!x}"]}, {"x": [42]}, {}
+        ):
+            try:
+                QuestionTemplateSet(bad)
+                assert False, f"{bad} should be rejected"
+            except ValueError:
+                pass
+        
+        # The batch path renders the same blocks as one call per product
+        products = [ProductParserAgent().parse(dict(product_data, product_name=f"Serum {i}")) for i in range(5)]
+        assert agent.generate_batch(products) == [agent.generate(p) for p in products]
+        
+        # Batch pipeline runs call the agent once per chunk
+        calls = []
+        orchestrator = PipelineOrchestrator()
+        orchestrator.instrumentation.add_observer(
+            lambda stage, name, seconds, error: name == "QuestionGeneratorAgent" and calls.append(name)
+        )
+        results = list(orchestrator.generate_batch([product_data] * 10, MemoryQuarantine(), pages={"faq"}))
+        assert len(results) == 10 and calls == ["QuestionGeneratorAgent"]
+        
+        print("[PASS] Question templates compiled and rendered in batches")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Question templates test failed: {e}")
+        return False
+
+
+def test_localization():
+    """Test rendering one pipeline run into several locales."""
+    print("\nTesting Localization...")
+    try:
+        import copy
+        import pickle
+        import tempfile
+        from templates.localization import Message, get_string_table, localize
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        # Messages are their English text and keep their code through copies
+        message = Message("benefit.generic", benefit="hydration")
+        assert message == "Provides hydration benefits for the skin"
+        for clone in (copy.deepcopy(message), pickle.loads(pickle.dumps(message))):
+            assert clone == message and clone.code == "benefit.generic" and clone.params == {"benefit": "hydration"}
+        assert localize({"text": message}, get_string_table("es"))["text"] != message
+        
+        orchestrator = PipelineOrchestrator()
+        localized = orchestrator.generate_locales(product_data, ["en", "hi", "es"])
+        assert list(localized) == ["en", "hi", "es"]
+        
+        # English matches the regular pipeline; other locales keep the structure
+        english = orchestrator.generate_pages(product_data)
+        strip = lambda page: {key: value for key, value in page.items() if key != "metadata"}
+        for page_type, page in english.items():
+            assert strip(localized["en"][page_type]) == strip(page), page_type
+        for locale in ("hi", "es"):
+            pages = localized[locale]
+            assert pages["product_page"]["metadata"]["locale"] == locale
+            assert pages["product_page"]["safety"]["safety_level"] != english["product_page"]["safety"]["safety_level"]
+            assert pages["faq"]["questions"]["total_count"] == english["faq"]["questions"]["total_count"]
+            assert pages["faq"]["questions"]["categories"].keys() == english["faq"]["questions"]["categories"].keys()
+            assert pages["comparison_page"]["product_a"] == english["comparison_page"]["product_a"]
+        
+        # Content agents run once however many locales are rendered
+        calls = []
+        orchestrator.instrumentation.add_observer(
+            lambda stage, name, seconds, error: stage == "agent" and calls.append(name)
+        )
+        orchestrator.generate_locales(product_data, ["en", "hi", "es"], pages={"product_page"})
+        assert sorted(calls) == ["BenefitsAgent", "PriceAgent", "SafetyAgent", "UsageAgent"]
+        
+        for bad in ("xx", "../en"):
+            try:
+                orchestrator.generate_locales(product_data, [bad])
+                assert False, f"{bad} should be rejected"
+            except ValueError:
+                pass
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            files = orchestrator.save_locales(localized, tmp)
+            assert Path(files["hi"]["faq"]).parent.name == "hi"
+        
+        print("[PASS] Pipeline runs rendered in several locales")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Localization test failed: {e}")
+        return False
+
+
+def test_faq_answers():
+    """Test FAQ answers built from the content blocks of the same run."""
+    print("\nTesting FAQ Answers...")
+    try:
+        from agents import FAQAnswerAgent
+        from orchestrator.quarantine import MemoryQuarantine
+        from templates.question_templates import QuestionTemplateSet
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        calls = []
+        orchestrator = PipelineOrchestrator()
+        orchestrator.instrumentation.add_observer(
+            lambda stage, name, seconds, error: stage == "agent" and calls.append(name)
+        )
+        pages = orchestrator.generate_pages(product_data)
+        
+        # Every agent ran once, though the FAQ and product page share four of them
+        assert sorted(calls) == sorted(set(calls)) and "FAQAnswerAgent" in calls
+        
+        faq = pages["faq"]
+        for category, questions in faq["questions"]["categories"].items():
+            assert len(faq["answers"][category]) == questions["count"], category
+        safety = faq["answers"]["safety"][1]
+        assert safety["source"] == "safety.safety_level"
+        assert safety["answer"] is pages["product_page"]["safety"]["safety_level"]
+        assert faq["answers"]["purchase"][0]["answer"] == product_data["price"]
+        assert faq["answers"]["purchase"][2] is None
+        
+        # Answers follow the locale of the blocks they come from
+        hindi = orchestrator.generate_locales(product_data, ["hi"])["hi"]
+        assert hindi["faq"]["answers"]["safety"][1]["answer"] == hindi["product_page"]["safety"]["safety_level"]
+        assert hindi["faq"]["answers"]["safety"][1]["answer"] != safety["answer"]
+        
+        results = list(orchestrator.generate_batch(
+            [product_data] * 3, MemoryQuarantine(), pages={"faq", "product_page"}
+        ))
+        assert [pages["faq"]["answers"] for _, pages in results] == [faq["answers"]] * 3
+        
+        # A stream still starts with the FAQ, answered as in a batch run
+        streamed = orchestrator.iter_pages(product_data)
+        page_type, streamed_faq = next(streamed)
+        assert page_type == "faq" and streamed_faq["answers"] == faq["answers"]
+        streamed.close()
+        
+        # The FAQ does not depend on the product agents: without their blocks
+        # it keeps the same entries but leaves their answers null
+        for faq_only in (
+            orchestrator.generate_pages(product_data, pages={"faq"})["faq"],
+            next(orchestrator.iter_pages(product_data, pages={"faq"}))[1]
+        ):
+            assert faq_only["questions"] == faq["questions"]
+            assert faq_only["answers"]["safety"][1] == {"source": "safety.safety_level", "answer": None}
+            for category, entries in faq["answers"].items():
+                for entry, partial in zip(entries, faq_only["answers"][category]):
+                    if entry is None or not entry["source"].startswith("product."):
+                        assert partial is None or partial["answer"] is None, entry
+                    else:
+                        assert partial == entry
+        
+        for answers in ({"x": ["shipping.carrier"]}, {"x": ["product.colour"]}, {"x": [None, None]}):
+            try:
+                FAQAnswerAgent(QuestionTemplateSet({"x": ["What is {product_name}?"]}, answers))
+                assert False, f"{answers} should be rejected"
+            except ValueError:
+                pass
+        
+        print("[PASS] FAQ answers reused the computed content blocks")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] FAQ answers test failed: {e}")
+        return False
+
+
+def test_product_features():
+    """Test the normalized feature view shared by the agents."""
+    print("\nTesting Product Features...")
+    try:
+        from agents import SafetyAgent
+        from models.product_features import ProductFeatures
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        product = ProductModel(**dict(product_data, side_effects="Mild tingling for Sensitive skin"))
+        features = product.features
+        assert product.features is features
+        assert features.concentration_percent == 10.0
+        assert features.side_effects == "mild tingling for sensitive skin"
+        assert features.mild_side_effects and features.sensitive_side_effects
+        assert features.ingredient_set == {i.lower() for i in product.key_ingredients}
+        assert features.skin_types == tuple(s.lower() for s in product.skin_type)
+        try:
+            features.side_effects = ""
+            assert False, "features should be read-only"
+        except AttributeError:
+            pass
+        assert ProductModel(**dict(product_data, concentration="Vitamin C")).features.concentration_percent is None
+        
+        # Agents read the view rather than the raw text
+        agent = SafetyAgent()
+        assert agent.generate(product)["safety_level"] == "Generally safe, may cause mild reactions in sensitive skin"
+        product._features = features._replace(mild_side_effects=False, sensitive_side_effects=False)
+        assert agent.generate(product)["safety_level"] == "Safe with possible mild tingling sensation"
+        
+        # Extracted once per product, before the agents run
+        stages = []
+        orchestrator = PipelineOrchestrator()
+        orchestrator.instrumentation.add_observer(lambda stage, name, seconds, error: stages.append((stage, name)))
+        orchestrator.generate_pages(product_data)
+        assert stages.count(("features", "ProductFeatures")) == 1
+        assert stages.index(("features", "ProductFeatures")) < stages.index(("agent", "QuestionGeneratorAgent"))
+        
+        print("[PASS] Product features extracted once and shared by the agents")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Product features test failed: {e}")
+        return False
+
+
+def test_price_analysis():
+    """Test batch price analysis, relative categories and currency conversion."""
+    print("\nTesting Price Analysis...")
+    try:
+        from agents import PriceAgent
+        from models.currency import CurrencyTable
+        from benchmarks.synthetic import generate_products
+        
+        raw = list(generate_products(200, seed=7))
+        products = [ProductModel(**data) for data in raw]
+        catalog = [product.price for product in products]
+        
+        # The batch path gives the same blocks as one product at a time
+        for agent in (PriceAgent(), PriceAgent(currency="USD", catalog_prices=catalog)):
+            assert agent.generate_batch(products) == [agent.generate(product) for product in products]
+        
+        # Absolute and relative categories side by side
+        agent = PriceAgent(catalog_prices=[100, 300, 600, 900, 1500, 2500, 4000, 8000])
+        block = agent.generate(ProductModel(**dict(raw[0], price=699)))
+        assert block["price_category"] == "Mid-range" and block["currency"] == "INR" and block["price"] == 699
+        assert block["price_percentile"] == 37.5
+        assert block["relative_category"].code == "price.relative.typical"
+        assert "price_percentile" not in PriceAgent().generate(products[0])
+        
+        # Conversion uses the local rate table; thresholds stay in the base currency
+        rates = CurrencyTable("INR", {"INR": 1, "USD": 0.0125})
+        block = PriceAgent(currency="USD", rates=rates).generate(ProductModel(**dict(raw[0], price=1000)))
+        assert block["price"] == 12.5 and block["currency"] == "USD"
+        assert block["price_category"].code == "price.category.premium"
+        try:
+            PriceAgent(currency="XYZ")
+            assert False, "unknown currency should be rejected"
+        except ValueError:
+            pass
+        
+        # Columnar analysis ranks within the whole column or each segment
+        analysis = PriceAgent().analyze_prices([100, 200, 300, 1000], segments=["a", "a", "b", "b"])
+        assert analysis["percentile"].tolist() == [50.0, 100.0, 50.0, 100.0]
+        assert analysis["category"].tolist() == [0, 0, 0, 2]
+        assert PriceAgent().analyze_prices([100, 200, 300, 1000])["percentile"].tolist() == [25.0, 50.0, 75.0, 100.0]
+        
+        print("[PASS] Price analysis vectorized with relative categories and currencies")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Price analysis test failed: {e}")
+        return False
+
+
+def test_site_export():
+    """Test the incremental static HTML export."""
+    print("\nTesting Static Site Export...")
+    try:
+        import tempfile
+        from orchestrator.site_export import SiteExporter, slugify
+        from benchmarks.synthetic import generate_products
+        
+        orchestrator = PipelineOrchestrator()
+        raw = list(generate_products(12, seed=11))
+        products = [orchestrator.generate_pages(data) for data in raw]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            site = Path(tmp_dir) / "site"
+            # 36 changed pages: more than one batch, so rendered by a worker pool
+            summary = SiteExporter(str(site), base_url="https://example.com/", workers=2).export(products)
+            assert summary["pages"] == summary["rendered"] == 36 and summary["unchanged"] == 0
+            slug = slugify(raw[0]["product_name"])
+            html = (site / slug / "faq.html").read_text(encoding="utf-8")
+            assert "<!DOCTYPE html>" in html and 'href="product.html"' in html
+            assert products[0]["faq"]["questions"]["categories"]["usage"]["questions"][0] in html
+            manifest = json.loads((site / "manifest.json").read_text(encoding="utf-8"))
+            assert manifest["pages"][f"{slug}/product.html"]["page_type"] == "product_page"
+            sitemap = (site / "sitemap.xml").read_text(encoding="utf-8")
+            assert f"<loc>https://example.com/{slug}/comparison.html</loc>" in sitemap
+            assert (site / "index.html").exists()
+            
+            # Regenerated pages differ only in their timestamp: nothing is re-rendered
+            regenerated = [orchestrator.generate_pages(data) for data in raw]
+            summary = SiteExporter(str(site), workers=0).export(regenerated)
+            assert summary["rendered"] == 0 and summary["unchanged"] == 36
+            
+            # One changed product and one dropped product
+            changed = [orchestrator.generate_pages(dict(raw[0], price=raw[0]["price"] + 1))] + regenerated[1:-1]
+            summary = SiteExporter(str(site), workers=2).export(changed)
+            assert summary["rendered"] == 3 and summary["removed"] == 3 and summary["pages"] == 33
+            assert not (site / slugify(raw[-1]["product_name"])).exists()
+            
+            # Deleted files are rendered again
+            (site / slug / "faq.html").unlink()
+            assert SiteExporter(str(site), workers=0).export(changed)["rendered"] == 1
+        
+        print("[PASS] Static site exported incrementally with sitemap and manifest")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Static site export test failed: {e}")
+        return False
+
+
+def test_search_index():
+    """Test BM25 search, incremental updates and pruned segment scoring."""
+    print("\nTesting Search Index...")
+    try:
+        import orchestrator.search_index as search_index
+        from orchestrator.search_index import SearchIndex
+        from benchmarks.synthetic import generate_products
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        # Pages are indexed as the orchestrator delivers them
+        orchestrator = PipelineOrchestrator()
+        index = SearchIndex(segment_size=16)
+        orchestrator.add_page_observer(index.add_page)
+        for data in generate_products(120, seed=5):
+            orchestrator.generate_pages(data)
+        pages = dict(orchestrator.iter_pages(product_data))
+        assert len(index) == 242
+        stats = index.stats()
+        assert stats["buffered"] == 2 and len(stats["segments"]) < 15
+        
+        name = product_data["product_name"]
+        results = index.search("glowboost vitamin c", limit=5)
+        assert results[0]["product_name"] == name and len(results) == 5
+        assert [r["page_type"] for r in index.search("glowboost", page_type="faq")] == ["faq"]
+        assert index.search("the of and") == [] and index.search("zzzunknown") == []
+        
+        # Block-pruned scoring returns the same ranking as scoring every match
+        queries = ["sensitive skin tingling", "apply drops morning sunscreen", "hydration"]
+        expected = [index.search(query, limit=7) for query in queries]
+        minimum = search_index.MIN_PRUNED_POSTINGS
+        search_index.MIN_PRUNED_POSTINGS = 0
+        try:
+            assert [index.search(query, limit=7) for query in queries] == expected
+        finally:
+            search_index.MIN_PRUNED_POSTINGS = minimum
+        
+        # A regenerated page replaces the earlier version
+        changed = dict(pages["product_page"], usage={"how_to_use": "Zzzunique ritual"})
+        index.add_page("product_page", changed)
+        assert len(index) == 242
+        assert index.search("zzzunique")[0]["product_name"] == name
+        index.add_page("product_page", pages["product_page"])
+        assert index.search("zzzunique") == []
+        
+        # A full index evicts the least recently indexed pages
+        bounded = SearchIndex(segment_size=16, max_documents=40)
+        unobserved = PipelineOrchestrator()
+        for data in generate_products(30, seed=9):
+            bounded.add_pages(unobserved.generate_pages(data))
+        assert len(bounded) == 40 and bounded.stats()["evicted"] == 20
+        last = data["product_name"]
+        assert {r["product_name"] for r in bounded.search(last, limit=2)} == {last}
+        
+        # A failing observer is logged, without failing the run or later observers
+        import logging
+        failing = PipelineOrchestrator()
+        delivered = []
+        failing.add_page_observer(lambda page_type, page: 1 / 0)
+        failing.add_page_observer(lambda page_type, page: delivered.append(page_type))
+        logging.disable(logging.ERROR)
+        try:
+            assert set(failing.generate_pages(product_data)) == set(delivered) == {"faq", "product_page", "comparison_page"}
+        finally:
+            logging.disable(logging.NOTSET)
+        
+        assert index.remove(name) == 2 and len(index) == 240
+        assert all(r["product_name"] != name for r in index.search("glowboost vitamin c"))
+        
+        try:
+            index.search("skin", page_type="comparison_page")
+            assert False, "Unsearchable page type accepted"
+        except ValueError:
+            pass
+        
+        print("[PASS] Pages indexed, ranked and updated incrementally")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Search index test failed: {e}")
+        return False
+
+
+def test_reference_store():
+    """Test the memory-mapped reference catalog."""
+    print("\nTesting Reference Store...")
+    try:
+        import os
+        import tempfile
+        from agents import PriceAgent
+        from models.reference_data import REFERENCE_PRODUCT_DATA, get_reference_product, get_reference_store
+        from models.reference_store import (
+            ReferenceStore, attach_reference_store, encode_reference_store, write_reference_store
+        )
+        from benchmarks.synthetic import generate_products
+        
+        raw = list(generate_products(50, seed=3))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "catalog.bin"
+            write_reference_store(path, raw)
+            with ReferenceStore(path) as store:
+                assert len(store) == 50
+                assert store.product(7) == ProductModel(**raw[7])
+                assert store.find(raw[31]["product_name"]) == ProductModel(**raw[31])
+                assert store.find("Unknown Serum") is None and raw[0]["product_name"] in store
+                assert list(store.prices) == sorted(data["price"] for data in raw)
+                try:
+                    store.prices[0] = 0.0
+                    assert False, "Mapped prices are writable"
+                except TypeError:
+                    pass
+                # The mapped price column serves as a price reference as is
+                prices = [data["price"] for data in raw]
+                expected = PriceAgent().analyze_prices(prices, reference=sorted(prices))
+                mapped = PriceAgent().analyze_prices(prices, reference=store.prices)
+                assert mapped["percentile"].tolist() == expected["percentile"].tolist()
+            
+            # The same catalog reuses the file; a changed one rewrites it
+            inode = path.stat().st_ino
+            attach_reference_store(path, raw).close()
+            assert path.stat().st_ino == inode
+            with attach_reference_store(path, raw[:10]) as store:
+                assert len(store) == 10 and path.stat().st_ino != inode
+            
+            # Attaching checks only the header; verify also compares the contents
+            contents = bytearray(path.read_bytes())
+            contents[-1] ^= 0xFF
+            path.write_bytes(bytes(contents))
+            attach_reference_store(path, raw[:10]).close()
+            assert path.read_bytes() == bytes(contents)
+            attach_reference_store(path, raw[:10], verify=True).close()
+            assert path.read_bytes() == encode_reference_store(raw[:10])
+            
+            # A truncated file does not match the size in its header
+            path.write_bytes(encode_reference_store(raw[:10])[:-8])
+            with attach_reference_store(path, raw[:10]) as store:
+                assert len(store) == 10 and path.read_bytes() == encode_reference_store(raw[:10])
+            
+            path.write_bytes(b"not a reference store")
+            try:
+                ReferenceStore(path)
+                assert False, "Corrupt store attached"
+            except ValueError:
+                pass
+            
+            # A corrupt configured store falls back to the built-in product
+            os.environ['REFERENCE_STORE_PATH'] = str(path)
+            try:
+                get_reference_store.cache_clear()
+                get_reference_product.cache_clear()
+                assert get_reference_product() == ProductModel(**REFERENCE_PRODUCT_DATA)
+            finally:
+                del os.environ['REFERENCE_STORE_PATH']
+                get_reference_store.cache_clear()
+                get_reference_product.cache_clear()
+        
+        assert get_reference_product() == ProductModel(**REFERENCE_PRODUCT_DATA)
+        # The default store lives in a directory only its user can access
+        assert get_reference_store().path.parent.stat().st_mode & 0o777 == 0o700
+        
+        print("[PASS] Reference catalog attached read-only from its mapped file")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Reference store test failed: {e}")
+        return False
+
+
+def test_job_queue():
+    """Test job priorities, cancellation and resume after a lost worker."""
+    print("\nTesting Job Queue...")
+    try:
+        import logging
+        import sqlite3
+        import tempfile
+        import time
+        from orchestrator.job_queue import JobQueue, JobWorkerPool
+        
+        data_path = Path("data/product_data.json")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            product_data = json.load(f)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            queue = JobQueue(str(Path(tmp_dir) / "jobs.db"), lease_seconds=0.2)
+            low = queue.submit([product_data] * 3, priority=0)
+            high = queue.submit([product_data], priority=5)
+            cancelled = queue.submit([product_data], priority=9)
+            assert queue.cancel(cancelled)
+            
+            # Highest-priority runnable job is claimed first
+            assert queue.claim("crashed-worker") == high
+            assert queue.claim("crashed-worker") == low
+            queue.record_item(low, 0, result={"ok": True})
+            
+            # Both claims expire, as after a restart, and a pool resumes them
+            time.sleep(0.3)
+            pool = JobWorkerPool(queue, PipelineOrchestrator, workers=1, poll_interval=0.05)
+            pool.start()
+            results = list(queue.iter_results(low, poll_interval=0.05))
+            pool.stop()
+            
+            assert [r["index"] for r in results] == [0, 1, 2]
+            assert all(r["success"] for r in results)
+            assert queue.get(low)["status"] == "completed"
+            assert queue.get(high)["status"] == "completed"
+            assert queue.get(cancelled)["status"] == "cancelled"
+            
+            # A database error while processing does not kill the worker thread;
+            # the job is resumed once its lease expires
+            class FlakyQueue(JobQueue):
+                failures = 1
+                
+                def complete(self, *args, **kwargs):
+                    if self.failures:
+                        self.failures -= 1
+                        raise sqlite3.OperationalError("database is locked")
+                    return super().complete(*args, **kwargs)
+            
+            flaky = FlakyQueue(str(Path(tmp_dir) / "flaky.db"), lease_seconds=0.2)
+            job = flaky.submit([product_data])
+            pool = JobWorkerPool(flaky, PipelineOrchestrator, workers=1, poll_interval=0.05)
+            logging.disable(logging.ERROR)
+            try:
+                pool.start()
+                give_up = time.monotonic() + 10
+                while flaky.get(job)["status"] != "completed" and time.monotonic() < give_up:
+                    time.sleep(0.05)
+                assert all(thread.is_alive() for thread in pool._threads)
+            finally:
+                pool.stop()
+                logging.disable(logging.NOTSET)
+            results = list(flaky.iter_results(job, follow=False))
+            assert [r["success"] for r in results] == [True] and flaky.failures == 0
+        
+        # A boolean is not a priority, although bool is a subclass of int
+        import app as web_app
+        with web_app.app.test_client().post('/jobs', json={"products": [product_data], "priority": True}) as response:
+            assert response.status_code == 400
+        
+        print("[PASS] Job queue prioritized, cancelled and resumed jobs")
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Job queue test failed: {e}")
+        return False
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -213,7 +1642,33 @@ def main():
         ("ProductParserAgent", test_parser_agent),
         ("Individual Agents", test_agents),
         ("Full Pipeline", test_full_pipeline),
-        ("Output Files", test_output_files)
+        ("Output Files", test_output_files),
+        ("Shared Orchestrator", test_shared_orchestrator),
+        ("Worker Warm-up", test_worker_warmup),
+        ("JSON API", test_api_generate),
+        ("Progressive Pages", test_progressive_pages),
+        ("Job Queue", test_job_queue),
+        ("Request Coalescing", test_request_coalescing),
+        ("Admission Control", test_admission_control),
+        ("Agent Deadlines", test_agent_deadlines),
+        ("Artifact Cache", test_artifact_cache),
+        ("Pipeline Metrics", test_pipeline_metrics),
+        ("Pipeline Tracing", test_pipeline_tracing),
+        ("Benchmark Suite", test_benchmark_suite),
+        ("Load Test Harness", test_load_test_harness),
+        ("Profiling", test_profiling),
+        ("Memory Profiling", test_memory_profiling),
+        ("Selective Page Generation", test_selective_pages),
+        ("Compiled Validators", test_compiled_validators),
+        ("Batch Validation", test_batch_validation),
+        ("Question Templates", test_question_templates),
+        ("Localization", test_localization),
+        ("FAQ Answers", test_faq_answers),
+        ("Product Features", test_product_features),
+        ("Price Analysis", test_price_analysis),
+        ("Static Site Export", test_site_export),
+        ("Search Index", test_search_index),
+        ("Reference Store", test_reference_store)
     ]
     
     results = []
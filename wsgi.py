@@ -0,0 +1,15 @@
+"""WSGI entry point for production serving under gunicorn."""
+
+from pathlib import Path
+
+from agents.registry import import_agent_modules
+from models.reference_data import preload_reference_data
+from app import app, init_worker
+
+# Build shared reference data and import the agents in the master so
+# forked workers inherit them
+preload_reference_data()
+import_agent_modules()
+Path("outputs").mkdir(exist_ok=True)
+
+__all__ = ['app', 'init_worker']